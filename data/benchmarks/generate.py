@@ -0,0 +1,214 @@
+"""Seeded synthetic inputs shaped like the real GDELT, OWID and World Bank data.
+
+Everything is generated from a seed, so two runs at the same scale read
+byte-identical inputs and their timings can be compared. Codes are drawn
+from the reference tables (CAMEO, FIPS, ISO3) with a skewed popularity so
+joins and group-bys see realistic cardinalities rather than uniform noise.
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import zipfile
+
+import numpy as np
+import polars as pl
+
+from pausemap.dates import days as date_range
+from pausemap.references.actors import ACTOR_TYPES
+from pausemap.references.countries import CAMEO_COUNTRIES, COUNTRIES, OWID_ALIASES
+from pausemap.references.locations import FIPS_COUNTRIES
+from pausemap.sources.gdelt import EVENT_FIELDS
+from pausemap.sources.owid import METADATA_FIELDS, METRIC_FIELDS
+
+# Indicators requested by WorldBankSource
+WORLDBANK_INDICATORS = ["NY.GDP.MKTP.KD.ZG", "SL.UEM.TOTL.ZS", "NE.TRD.GNFS.ZS"]
+
+# Share of OWID metric values left out of a day, as in the real file
+OWID_MISSING = 0.3
+
+# Share of a GDELT day re-reporting events from the day before
+GDELT_REPEATS = 0.15
+
+# Columns a re-reported event gets afresh; everything else is repeated
+_REPORT_FIELDS = ["GLOBALEVENTID", "SQLDATE", "MonthYear", "Year", "FractionDate", "DATEADDED"]
+
+
+def _skewed(rng: np.random.Generator, values: np.ndarray, size: int) -> np.ndarray:
+    """Sample values with a Zipf-like popularity, like news coverage by country."""
+    weights = 1 / np.arange(1, len(values) + 1) ** 0.9
+    return rng.choice(values, size=size, p=weights / weights.sum())
+
+
+def _with_nulls(rng: np.random.Generator, values: np.ndarray, share: float) -> pl.Series:
+    """values with a random share replaced by nulls (empty fields in the export)."""
+    return pl.Series(values).scatter(np.flatnonzero(rng.random(len(values)) < share), None)
+
+
+def gdelt_day(day: date, rows: int, seed: int = 0, previous: Optional[pl.DataFrame] = None) -> pl.DataFrame:
+    """One day's events in the 58-column export layout, as raw field values.
+
+    With the previous day's events, GDELT_REPEATS of the rows re-report
+    some of them, as the real exports do.
+    """
+    rng = np.random.default_rng([seed, day.toordinal()])
+    stamp = f"{day:%Y%m%d}"
+
+    cameo = np.array(sorted(code for code in CAMEO_COUNTRIES if len(code) == 3))
+    fips = np.array(sorted(FIPS_COUNTRIES))
+    types = np.array(sorted(ACTOR_TYPES))
+    # Fixed centroid per FIPS country so tiles cluster like real places
+    centroids = np.random.default_rng(seed).uniform([-55, -170], [70, 170], (len(fips), 2))
+
+    def actor(prefix: str) -> Dict[str, pl.Series]:
+        country = _skewed(rng, cameo, rows)
+        kind = rng.choice(types, rows)
+        names = np.array([CAMEO_COUNTRIES[c].upper() for c in cameo])
+        return {
+            f"{prefix}Code": pl.Series(np.char.add(country, kind)),
+            f"{prefix}Name": pl.Series(names[np.searchsorted(cameo, country)]),
+            f"{prefix}CountryCode": _with_nulls(rng, country, 0.2),
+            f"{prefix}KnownGroupCode": _with_nulls(rng, np.full(rows, "UNO"), 0.98),
+            f"{prefix}EthnicCode": pl.Series([None] * rows, dtype=pl.Utf8),
+            f"{prefix}Religion1Code": _with_nulls(rng, np.full(rows, "CHR"), 0.95),
+            f"{prefix}Religion2Code": pl.Series([None] * rows, dtype=pl.Utf8),
+            f"{prefix}Type1Code": _with_nulls(rng, kind, 0.4),
+            f"{prefix}Type2Code": pl.Series([None] * rows, dtype=pl.Utf8),
+            f"{prefix}Type3Code": pl.Series([None] * rows, dtype=pl.Utf8),
+        }
+
+    def geo(prefix: str) -> Dict[str, pl.Series]:
+        index = _skewed(rng, np.arange(len(fips)), rows)
+        country = fips[index]
+        points = centroids[index] + rng.normal(0, 2, (rows, 2))
+        return {
+            f"{prefix}_Type": pl.Series(rng.integers(1, 5, rows), dtype=pl.Int8),
+            f"{prefix}_FullName": pl.Series([FIPS_COUNTRIES[c] for c in country]),
+            f"{prefix}_CountryCode": pl.Series(country),
+            f"{prefix}_ADM1Code": pl.Series(np.char.add(country, rng.integers(10, 40, rows).astype(str))),
+            f"{prefix}_Lat": pl.Series(points[:, 0].clip(-85, 85).round(4)),
+            f"{prefix}_Long": pl.Series(points[:, 1].clip(-180, 180).round(4)),
+            f"{prefix}_FeatureID": pl.Series(rng.integers(-5_000_000, 5_000_000, rows).astype(str)),
+        }
+
+    roots = _skewed(rng, np.array([f"{r:02d}" for r in range(1, 21)]), rows)
+    bases = np.char.add(roots, rng.integers(0, 10, rows).astype(str))
+    codes = np.where(rng.random(rows) < 0.5, bases, np.char.add(bases, rng.integers(1, 10, rows).astype(str)))
+    ids = np.arange(rows, dtype=np.int64) + day.toordinal() * 1_000_000
+
+    columns = {
+        "GLOBALEVENTID": pl.Series(ids),
+        "SQLDATE": pl.Series([stamp] * rows),
+        "MonthYear": pl.Series([int(stamp[:6])] * rows),
+        "Year": pl.Series([day.year] * rows),
+        "FractionDate": pl.Series([round(day.year + day.timetuple().tm_yday / 365, 4)] * rows),
+        **actor("Actor1"),
+        **actor("Actor2"),
+        "IsRootEvent": pl.Series((rng.random(rows) < 0.6).astype(np.int8)),
+        "EventCode": pl.Series(codes),
+        "EventBaseCode": pl.Series(bases),
+        "EventRootCode": pl.Series(roots),
+        "QuadClass": pl.Series(rng.integers(1, 5, rows), dtype=pl.Int8),
+        "GoldsteinScale": pl.Series(rng.uniform(-10, 10, rows).round(1)),
+        "NumMentions": pl.Series(rng.geometric(0.3, rows)),
+        "NumSources": pl.Series(rng.geometric(0.6, rows)),
+        "NumArticles": pl.Series(rng.geometric(0.3, rows)),
+        "AvgTone": pl.Series(rng.normal(-2, 3, rows).round(6)),
+        **geo("Actor1Geo"),
+        **geo("Actor2Geo"),
+        **geo("ActionGeo"),
+        "DATEADDED": pl.Series([stamp] * rows),
+        "SOURCEURL": pl.Series([f"https://news.example.com/{stamp}/{i}" for i in ids]),
+    }
+    events = pl.DataFrame({name: columns[name] for name in EVENT_FIELDS})
+    if previous is None:
+        return events
+
+    repeats = min(int(rows * GDELT_REPEATS), previous.height)
+    again = previous.sample(repeats, seed=seed).drop(_REPORT_FIELDS)
+    return pl.concat([
+        events.head(rows - repeats),
+        events.tail(repeats).select(_REPORT_FIELDS).hstack(again).select(list(EVENT_FIELDS)),
+    ])
+
+
+def write_gdelt(target_dir: Path, start: date, end: date, rows: int, seed: int = 0) -> List[Path]:
+    """Zipped daily exports (`YYYYMMDD.export.CSV.zip`) for start..end."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    paths, events = [], None
+    for day in date_range(start, end):
+        name = f"{day:%Y%m%d}.export.CSV"
+        csv = target_dir / name
+        events = gdelt_day(day, rows, seed, previous=events)
+        events.write_csv(
+            csv, separator="\t", include_header=False, quote_style="never"
+        )
+        path = target_dir / f"{name}.zip"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(csv, name)
+        csv.unlink()
+        paths.append(path)
+    return paths
+
+
+def owid_countries(count: Optional[int] = None) -> List[str]:
+    """OWID country keys: ISO3 codes, OWID's own aliases and a few aggregates."""
+    codes = [iso3 for iso3, _, _, _ in COUNTRIES] + list(OWID_ALIASES) + ["OWID_WRL", "OWID_EUR"]
+    return codes[:count] if count else codes
+
+
+def write_owid(path: Path, end: date, days: int, countries: Optional[int] = None, seed: int = 0) -> Path:
+    """An owid-covid-data.json with `days` days of history up to end per country.
+
+    Countries are written one at a time, so the file can be much larger
+    than the memory used to generate it.
+    """
+    rng = np.random.default_rng(seed)
+    first = end - timedelta(days=days - 1)
+    dates = [(first + timedelta(days=i)).isoformat() for i in range(days)]
+    metrics = [m for m, dtype in METRIC_FIELDS.items() if m != "date" and dtype != pl.Utf8]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        f.write("{")
+        for i, code in enumerate(owid_countries(countries)):
+            details = {
+                field: (code if dtype == pl.Utf8 else round(float(rng.uniform(1, 1000)), 3))
+                for field, dtype in METADATA_FIELDS.items()
+            }
+            values = rng.lognormal(3, 2, (days, len(metrics))).round(3)
+            present = rng.random((days, len(metrics))) >= OWID_MISSING
+            details["data"] = [
+                {
+                    "date": day,
+                    **{m: v for m, v, keep in zip(metrics, row.tolist(), mask.tolist()) if keep},
+                    "tests_units": "tests performed",
+                }
+                for day, row, mask in zip(dates, values, present)
+            ]
+            f.write(("," if i else "") + json.dumps(code) + ":" + json.dumps(details))
+        f.write("}")
+    return path
+
+
+def worldbank_rows(first_year: int, last_year: int, seed: int = 0) -> Dict[str, List[Dict]]:
+    """Indicator API rows (newest year first, as served) for every country."""
+    rng = np.random.default_rng(seed)
+    rows = {}
+    for code in WORLDBANK_INDICATORS:
+        rows[code] = [
+            {
+                "indicator": {"id": code, "value": code},
+                "country": {"id": iso2, "value": name},
+                "countryiso3code": iso3,
+                "date": str(year),
+                "value": round(float(rng.normal(2, 5)), 3) if rng.random() > 0.1 else None,
+                "unit": "",
+                "obs_status": "",
+                "decimal": 1,
+            }
+            for year in range(last_year, first_year - 1, -1)
+            for iso3, iso2, _, name in COUNTRIES
+        ]
+    return rows
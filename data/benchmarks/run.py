@@ -0,0 +1,220 @@
+"""Offline benchmarks of the fetch, parse, aggregate and merge stages.
+
+    python -m benchmarks.run --preset smoke
+    python -m benchmarks.run --preset full --save-baseline
+
+Synthetic inputs are generated once per scale into the work directory and
+served by a local stand-in, then each stage runs in its own spawned
+process. Timings, throughput and peak memory are printed, written as JSON
+and compared against the stored baseline; the command exits non-zero when
+a stage got slower or bigger than the baseline allows.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+import click
+
+from pausemap.config import GDELT_PROCESSES, GDELT_WORKERS
+
+from .stages import STAGES, run_stage
+
+logger = logging.getLogger(__name__)
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# First day of the synthetic data; a Monday, so every day's week is in
+# the merge window
+START = date(2020, 3, 30)
+
+# Input sizes. "full" is close to production: 150k-event GDELT days and a
+# several-hundred-MB OWID file.
+PRESETS = {
+    "smoke": {
+        "days": 3, "gdelt_rows": 5_000, "owid_days": 120, "owid_countries": 30,
+        "wb_years": 5, "page_size": 50,
+    },
+    "full": {
+        "days": 14, "gdelt_rows": 150_000, "owid_days": 1_000, "owid_countries": None,
+        "wb_years": 60, "page_size": 1_000,
+    },
+}
+
+# Changes smaller than these are noise whatever the tolerance says
+MIN_DELTA = {"seconds": 0.25, "peak_rss_mb": 32}
+
+
+def generate_inputs(inputs_dir: Path, scale: Dict, seed: int) -> Dict:
+    """Write the stand-in's files for scale, reusing them if already there.
+
+    Returns the World Bank rows, which the stand-in serves from memory.
+    """
+    from .generate import worldbank_rows, write_gdelt, write_owid
+
+    end = START + timedelta(days=scale["days"] - 1)
+    manifest = inputs_dir / "manifest.json"
+    wanted = {**scale, "seed": seed}
+    if not manifest.exists() or json.loads(manifest.read_text()) != wanted:
+        shutil.rmtree(inputs_dir, ignore_errors=True)
+        logger.info(f"Generating synthetic inputs in {inputs_dir}")
+        write_gdelt(inputs_dir, START, end, scale["gdelt_rows"], seed)
+        write_owid(inputs_dir / "owid.json", end, scale["owid_days"], scale["owid_countries"], seed)
+        manifest.write_text(json.dumps(wanted))
+    return worldbank_rows(START.year - scale["wb_years"] + 1, START.year, seed)
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> Dict[str, List[str]]:
+    """Stages whose time or peak memory exceeds the baseline by more than
+    tolerance (a fraction), with a description of each regression."""
+    regressions = {}
+    for name, now in results["stages"].items():
+        before = baseline["stages"].get(name)
+        if not before:
+            continue
+        for metric, slack in MIN_DELTA.items():
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > slack:
+                regressions.setdefault(name, []).append(
+                    f"{metric} {old} -> {new} (+{(new - old) / old:.0%})" if old else f"{metric} {old} -> {new}"
+                )
+    return regressions
+
+
+def machine(workers: int, processes: int) -> Dict:
+    """What timings depend on besides the scale: interpreter, OS, CPU and
+    the stage settings."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "workers": workers,
+        "processes": processes,
+    }
+
+
+def differences(results: Dict, baseline: Dict) -> List[str]:
+    """Why results can't be compared with baseline: the scale or machine
+    fields that differ, empty if they match."""
+    fields = [("scale", key) for key in sorted({**results["scale"], **baseline.get("scale", {})})]
+    fields += [("machine", key) for key in results["machine"]]
+    return [
+        f"{group}.{key}" for group, key in fields
+        if results[group].get(key) != baseline.get(group, {}).get(key)
+    ]
+
+
+def print_table(results: Dict, baseline: Optional[Dict]) -> None:
+    header = f"{'stage':<18}{'seconds':>9}{'rows/s':>12}{'MB/s':>9}{'peak MB':>9}{'baseline s':>12}"
+    click.echo(header)
+    click.echo("-" * len(header))
+    for name, stage in results["stages"].items():
+        before = (baseline or {}).get("stages", {}).get(name, {}).get("seconds")
+        mb_per_sec = (stage["bytes_per_sec"] or 0) / 1e6
+        click.echo(
+            f"{name:<18}{stage['seconds']:>9.2f}{stage['rows_per_sec'] or 0:>12,.0f}"
+            f"{mb_per_sec:>9.1f}{stage['peak_rss_mb'] or 0:>9.0f}"
+            f"{before if before is not None else '-':>12}"
+        )
+
+
+@click.command()
+@click.option("--preset", type=click.Choice(list(PRESETS)), default="smoke", show_default=True)
+@click.option("--days", type=int, help="GDELT days (from 2020-03-30)")
+@click.option("--gdelt-rows", type=int, help="Events per GDELT day")
+@click.option("--owid-days", type=int, help="Days of OWID history per country")
+@click.option("--owid-countries", type=int, help="OWID countries (default all)")
+@click.option("--stage", "stages", multiple=True, type=click.Choice(list(STAGES)),
+              help="Only run these stages (earlier stages' outputs must be in --workdir)")
+@click.option("--workdir", type=click.Path(file_okay=False, path_type=Path),
+              help="Keep inputs and outputs here instead of a temporary directory")
+@click.option("--workers", type=int, default=GDELT_WORKERS, show_default=True)
+@click.option("--processes", type=int, default=GDELT_PROCESSES, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--baseline", "baseline_path", type=click.Path(dir_okay=False, path_type=Path),
+              default=BASELINE, show_default=True)
+@click.option("--tolerance", type=float, default=0.25, show_default=True,
+              help="Allowed slowdown or memory growth over the baseline, as a fraction")
+@click.option("--save-baseline", is_flag=True, help="Store this run as the baseline")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path),
+              help="Also write the results as JSON here")
+def main(preset, days, gdelt_rows, owid_days, owid_countries, stages, workdir, workers,
+         processes, seed, baseline_path, tolerance, save_baseline, output):
+    """Benchmark the pipeline stages on synthetic data."""
+    logging.basicConfig(level=logging.WARNING)
+    overrides = {"days": days, "gdelt_rows": gdelt_rows, "owid_days": owid_days}
+    scale = {**PRESETS[preset], **{k: v for k, v in overrides.items() if v is not None}}
+    if owid_countries is not None:
+        scale["owid_countries"] = owid_countries
+
+    temporary = workdir is None
+    workdir = Path(tempfile.mkdtemp(prefix="pausemap-bench-")) if temporary else workdir
+    try:
+        from .standin import StandIn
+
+        worldbank = generate_inputs(workdir / "inputs", scale, seed)
+        results = {
+            "preset": preset,
+            "scale": scale,
+            "machine": machine(workers, processes),
+            "stages": {},
+        }
+        settings = {
+            "start": START,
+            "end": START + timedelta(days=scale["days"] - 1),
+            "workers": workers,
+            "processes": processes,
+        }
+
+        with StandIn(workdir / "inputs", worldbank, scale["page_size"]) as standin:
+            settings["url"] = standin.url
+            for name in stages or STAGES:
+                click.echo(f"Running {name}...", err=True)
+                with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                    results["stages"][name] = pool.submit(run_stage, name, workdir, settings).result()
+    finally:
+        if temporary:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+    differ = differences(results, baseline) if baseline else []
+    if differ:
+        # Timings from another machine or setting say nothing about this run
+        click.echo(
+            f"Baseline in {baseline_path} differs in {', '.join(differ)}, not comparing", err=True
+        )
+        baseline = None
+    print_table(results, baseline)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+    if save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        click.echo(f"Saved baseline to {baseline_path}")
+        return
+
+    failed = [name for name, stage in results["stages"].items() if stage["errors"]]
+    if failed:
+        raise click.ClickException(f"Stages reported errors: {', '.join(failed)}")
+    if baseline:
+        regressions = compare(results, baseline, tolerance)
+        for name, problems in regressions.items():
+            click.echo(f"REGRESSION {name}: {'; '.join(problems)}", err=True)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
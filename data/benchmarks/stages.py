@@ -0,0 +1,186 @@
+"""Benchmarked stages, each run in a fresh process by `run_stage`.
+
+A stage's child process points the pipeline's storage at the benchmark's
+work directory and the sources' URLs at the stand-in, then calls the same
+methods the pipeline does. Starting each stage in its own process keeps
+its peak memory separate from the stages before it.
+"""
+
+from pathlib import Path
+from typing import Dict
+import gzip
+import json
+import time
+
+
+def _redirect_storage(workdir: Path) -> None:
+    """Point pausemap's storage at workdir.
+
+    Must run before the sources are imported, since they bind the
+    directories from config at import time.
+    """
+    from pausemap import config
+
+    config.DATA_DIR = workdir / "storage"
+    config.RAW_DIR = config.DATA_DIR / "raw"
+    config.PROCESSED_DIR = config.DATA_DIR / "processed"
+    config.OUTPUTS_DIR = config.DATA_DIR / "outputs"
+    config.METRICS_DIR = config.DATA_DIR / "metrics"
+
+
+def _gdelt(settings: Dict):
+    from pausemap.sources import gdelt
+
+    gdelt.GDELT_URL = settings["url"] + "/gdelt/{date}.export.CSV.zip"
+    return gdelt.GDELTSource(
+        workers=settings["workers"],
+        processes=settings["processes"],
+        start=settings["start"],
+        end=settings["end"]
+    )
+
+
+def gdelt_fetch(settings: Dict) -> None:
+    _gdelt(settings).fetch_range()
+
+
+def gdelt_parse(settings: Dict) -> None:
+    source = _gdelt(settings)
+    source.process_range(sorted(source.raw_dir.glob("*.export.CSV")))
+
+
+def gdelt_backfill(settings: Dict) -> None:
+    # Overlapped fetch and parse into directories of its own, so it starts
+    # from nothing like the separate stages did
+    source = _gdelt(settings)
+    source.raw_dir = source.raw_dir.with_name("gdelt_backfill")
+    source.processed_dir = source.processed_dir.with_name("gdelt_backfill")
+    source.fetch_and_process()
+
+
+def _dedup(settings: Dict):
+    from pausemap.dedup import Deduplicator
+
+    return Deduplicator(_gdelt(settings))
+
+
+def gdelt_dedup(settings: Dict) -> None:
+    _dedup(settings).update(settings["start"], settings["end"])
+
+
+def gdelt_aggregate(settings: Dict) -> None:
+    from pausemap.rollup import WeeklyRollup
+
+    WeeklyRollup(_dedup(settings).view()).update(settings["start"], settings["end"])
+
+
+def gdelt_tiles(settings: Dict) -> None:
+    from pausemap.tiles import TilePyramid
+
+    TilePyramid(_dedup(settings).view()).update(settings["start"], settings["end"])
+
+
+def _owid(settings: Dict):
+    from pausemap.sources import owid
+
+    owid.OWID_URL = settings["url"] + "/owid.json"
+    return owid.OWIDSource(start=settings["start"], end=settings["end"])
+
+
+def owid_fetch(settings: Dict) -> None:
+    _owid(settings).fetch_data()
+
+
+def owid_parse(settings: Dict) -> None:
+    source = _owid(settings)
+    source.process_data(source.raw_dir / "owid_covid.json")
+
+
+def worldbank_fetch(settings: Dict) -> None:
+    from pausemap.sources.worldbank import WorldBankSource
+
+    source = WorldBankSource(
+        workers=settings["workers"], start=settings["start"], end=settings["end"]
+    )
+    source.indicators_url = settings["url"] + "/wb"
+    source.fetch_indicators()
+
+
+def merge(settings: Dict) -> None:
+    from pausemap.processor import DataProcessor
+    from pausemap.rollup import WeeklyRollup
+
+    rollups = WeeklyRollup(_dedup(settings).view()).scan(settings["start"], settings["end"])
+    DataProcessor().merge(rollups, settings["start"], settings["end"])
+
+
+def serve(settings: Dict) -> None:
+    # Scrub the whole timeline twice over one keep-alive connection: cold
+    # (encoding each slice) and then from the response cache
+    from http.client import HTTPConnection
+    import threading
+    from pausemap.server import QueryService, make_server
+    from pausemap.store import build_store
+
+    server = make_server(QueryService(build_store(settings["start"], settings["end"])), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = HTTPConnection(*server.server_address[:2])
+        for _ in range(2):
+            connection.request("GET", "/weekly/index.json", headers={"Accept-Encoding": "gzip"})
+            index = json.loads(gzip.decompress(connection.getresponse().read()))
+            for week in index["weeks"]:
+                connection.request("GET", f"/weekly/{week['file']}", headers={"Accept-Encoding": "gzip"})
+                connection.getresponse().read()
+            for iso3, _ in index["countries"]:
+                connection.request("GET", f"/countries/{iso3}.json", headers={"Accept-Encoding": "gzip"})
+                connection.getresponse().read()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# Benchmark name -> (function, tracked stage whose rows and bytes it reports).
+# Order matters: each stage reads what the ones before it wrote.
+STAGES: Dict[str, tuple] = {
+    "gdelt.fetch": (gdelt_fetch, "gdelt.fetch"),
+    "gdelt.parse": (gdelt_parse, "gdelt.parse"),
+    "gdelt.backfill": (gdelt_backfill, "gdelt.parse"),
+    "gdelt.dedup": (gdelt_dedup, "gdelt.dedup"),
+    "gdelt.aggregate": (gdelt_aggregate, "gdelt.aggregate"),
+    "gdelt.tiles": (gdelt_tiles, "gdelt.tiles"),
+    "owid.fetch": (owid_fetch, "owid.fetch"),
+    "owid.parse": (owid_parse, "owid.parse"),
+    "worldbank.fetch": (worldbank_fetch, "worldbank.fetch"),
+    "merge": (merge, "merge"),
+    "serve": (serve, "serve.query"),
+}
+
+
+def run_stage(name: str, workdir: Path, settings: Dict) -> Dict:
+    """Run one stage in this (fresh) process and summarise it.
+
+    Rows and bytes are those reported by the stage's tracked metric, peak
+    memory the larger of this process and any worker processes it ran.
+    """
+    _redirect_storage(workdir)
+    from pausemap.metrics import METRICS, peak_rss_mb
+
+    run, tracked = STAGES[name]
+    METRICS.reset()
+    started = time.perf_counter()
+    run(settings)
+    seconds = time.perf_counter() - started
+
+    report = METRICS.report(name)
+    stage = report["stages"].get(tracked, {})
+    rss = [mb for mb in (peak_rss_mb(), peak_rss_mb(children=True)) if mb is not None]
+    return {
+        "seconds": round(seconds, 3),
+        "rows": stage.get("rows", 0),
+        "bytes": stage.get("bytes", 0),
+        "rows_per_sec": round(stage.get("rows", 0) / seconds, 1) if seconds else None,
+        "bytes_per_sec": round(stage.get("bytes", 0) / seconds, 1) if seconds else None,
+        "errors": sum(s["errors"] for s in report["stages"].values()),
+        "peak_rss_mb": max(rss) if rss else None,
+    }
@@ -0,0 +1,99 @@
+"""A local HTTP stand-in for the GDELT, OWID and World Bank endpoints.
+
+Serves generated files over loopback so the fetch stages exercise their
+real code paths (sessions, streaming, unzipping, paging, caching) without
+the network's variance:
+
+    /gdelt/YYYYMMDD.export.CSV.zip      daily GDELT exports
+    /owid.json                          the OWID dataset
+    /wb/{indicator}?page=n&per_page=m   paged World Bank indicator rows
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+import json
+import shutil
+import threading
+
+from pausemap.config import CHUNK_SIZE
+
+
+class StandIn:
+    """Serves `files_dir` and World Bank pages on a free loopback port.
+
+    Pages hold at most `page_size` rows whatever the client asks for, so
+    the World Bank fetch goes through several pages per indicator.
+    """
+
+    def __init__(self, files_dir: Path, worldbank: Dict[str, List[Dict]], page_size: int = 100):
+        self.files_dir = files_dir
+        self.worldbank = worldbank
+        self.page_size = page_size
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandIn":
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, as the real endpoints allow
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                request = urlparse(self.path)
+                if request.path.startswith("/wb/"):
+                    standin.send_page(self, request.path[4:], parse_qs(request.query))
+                else:
+                    standin.send_file(self, request.path.lstrip("/").replace("gdelt/", "", 1))
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            # Room for every fetch thread's connection at once
+            request_queue_size = 64
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def send_file(self, handler: BaseHTTPRequestHandler, name: str) -> None:
+        path = self.files_dir / name
+        if "/" in name or not path.is_file():
+            handler.send_error(404)
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Length", str(path.stat().st_size))
+        handler.end_headers()
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, handler.wfile, CHUNK_SIZE)
+
+    def send_page(self, handler: BaseHTTPRequestHandler, indicator: str, query: Dict) -> None:
+        if indicator not in self.worldbank:
+            handler.send_error(404)
+            return
+        rows = self.worldbank[indicator]
+        page = int(query.get("page", ["1"])[0])
+        per_page = min(int(query.get("per_page", [self.page_size])[0]), self.page_size)
+        pages = max(1, -(-len(rows) // per_page))
+        body = json.dumps([
+            {"page": page, "pages": pages, "per_page": per_page, "total": len(rows)},
+            rows[(page - 1) * per_page:page * per_page],
+        ]).encode()
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
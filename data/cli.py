@@ -2,45 +2,36 @@
 """Command line interface for pause.map data pipeline."""
 
 import click
-from pathlib import Path
-from pausemap.sources.gdelt import GDELTSource
-from pausemap.sources.owid import OWIDSource
-from pausemap.sources.worldbank import WorldBankSource
+
+# GDELT days are parsed as they arrive, so its fetch stage parses too
+FETCH_STAGES = ['gdelt.ingest', 'owid.fetch', 'worldbank.fetch']
 
 @click.group()
 def cli():
     """Manage pause.map data pipeline."""
     pass
 
+def build_pipeline():
+    # Deferred so --help doesn't import polars and the sources
+    from pausemap.pipeline import build_pipeline
+    return build_pipeline()
+
+def _run(pipeline, stages):
+    results = pipeline.run(only=stages)
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        raise click.ClickException(f"Stages failed: {', '.join(failed)}")
+
 @cli.command()
-@click.option('--storage', type=click.Path(), default='storage',
-              help='Storage directory for data files')
-def fetch_all(storage):
+def fetch_all():
     """Fetch data from all sources."""
-    storage_path = Path(storage)
-    
-    # GDELT
-    gdelt = GDELTSource(storage_path)
-    gdelt.fetch_data()
-    
-    # OWID
-    owid = OWIDSource(storage_path)
-    owid.fetch_data()
-    
-    # World Bank
-    wb = WorldBankSource(storage_path)
-    wb.fetch_reports('2020-01-01', '2024-12-31')
+    _run(build_pipeline(), FETCH_STAGES)
 
 @cli.command()
-@click.option('--storage', type=click.Path(), default='storage',
-              help='Storage directory for data files')
-def process_all(storage):
+def process_all():
     """Process raw data from all sources."""
-    storage_path = Path(storage)
-    
-    # Process each source
-    # TODO: Implement processing logic for each source
-    pass
+    pipeline = build_pipeline()
+    _run(pipeline, [name for name in pipeline.stages if name not in FETCH_STAGES])
 
 if __name__ == '__main__':
-    cli()
\ No newline at end of file
+    cli()
@@ -1,20 +1,73 @@
-"""Command line interface for pause.map data pipeline."""
+"""Command line interface for pause.map data pipeline.
 
+Commands import the sources and polars themselves, so startup only pays
+for what the invoked command uses.
+"""
+
+from pathlib import Path
 import click
 import logging
+import sys
 
-from pausemap.sources.gdelt import GDELTSource
-from pausemap.sources.owid import OWIDSource
-from pausemap.sources.worldbank import WorldBankSource 
-from pausemap.config import DATA_DIR, START_DATE
+from pausemap.dates import parse_shard, shard_range
+from pausemap.metrics import METRICS
+from pausemap.config import (
+    PROCESSED_DIR, METRICS_DIR, GDELT_WORKERS, GDELT_PROCESSES, GDELT_QUEUE_SIZE, WORLDBANK_WORKERS,
+    SERVER_HOST, SERVER_PORT, SERVER_CACHE_SIZE, START_DATE, END_DATE, SOURCES
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @click.group()
-def cli():
+@click.option("--metrics-file", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="JSON metrics report for this run (default storage/metrics/<time>-<command>.json)")
+@click.pass_context
+def cli(ctx, metrics_file):
     """Data pipeline for pause.map"""
-    pass
+    command = ctx.invoked_subcommand
+    target = metrics_file or METRICS_DIR / f"{METRICS.started_at:%Y%m%dT%H%M%S}-{command}.json"
+    
+    # Written on success and failure alike, but not for --help
+    if command and not set(ctx.help_option_names) & set(sys.argv[1:]):
+        ctx.call_on_close(lambda: METRICS.write_report(target, command))
+
+def window_options(shard: bool = False):
+    """--start/--end options (and --shard) overriding the config window."""
+    def decorate(command):
+        if shard:
+            command = click.option(
+                "--shard", default=None, metavar="INDEX/COUNT",
+                help="Only handle this shard of the window, e.g. 0/4 (whole weeks per shard)"
+            )(command)
+        command = click.option(
+            "--end", type=click.DateTime(["%Y-%m-%d"]), default=None,
+            help=f"Last day, inclusive (default {END_DATE})"
+        )(command)
+        return click.option(
+            "--start", type=click.DateTime(["%Y-%m-%d"]), default=None,
+            help=f"First day (default {START_DATE})"
+        )(command)
+    return decorate
+
+def resolve_window(start, end, shard=None):
+    """The (start, end) dates to work on, exiting if the shard is empty."""
+    start = start.date() if start else START_DATE
+    end = end.date() if end else END_DATE
+    if start > end:
+        raise click.BadParameter(f"--start {start} is after --end {end}")
+    if shard:
+        try:
+            index, count = parse_shard(shard)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--shard")
+        window = shard_range(start, end, index, count)
+        if window is None:
+            logger.info(f"Shard {shard} has no weeks in {start}..{end}, nothing to do")
+            raise SystemExit(0)
+        start, end = window
+        logger.info(f"Shard {shard} covers {start}..{end}")
+    return start, end
 
 @cli.command()
 @click.option("--source", type=click.Choice(["gdelt", "owid", "worldbank"]), default="gdelt", 
@@ -22,34 +75,195 @@ def cli():
 def sample(source: str):
     """Get sample data from a source."""
     if source == "gdelt":
+        from pausemap.sources.gdelt import GDELTSource
         gdelt = GDELTSource()
         gdelt.get_sample()
     elif source == "owid":
+        from pausemap.sources.owid import OWIDSource
         owid = OWIDSource()
         owid.get_sample()
     elif source == "worldbank":
+        from pausemap.sources.worldbank import WorldBankSource
         wb = WorldBankSource()
         wb.get_sample()
 
 @cli.command()
 @click.option("--source", type=click.Choice(["gdelt", "owid", "worldbank"]), default="gdelt",
               help="Data source to fetch")
-def fetch(source: str):
-    """Fetch full dataset for date range in config."""
+@click.option("--workers", type=int, default=None,
+              help="Concurrent downloads (GDELT and World Bank, defaults in config)")
+@click.option("--country", "countries", multiple=True,
+              help="Only keep these country codes (OWID only, repeatable)")
+@click.option("--processes", type=int, default=None,
+              help="Worker processes parsing GDELT days (default GDELT_PROCESSES)")
+@click.option("--queue-size", type=int, default=None,
+              help="Most GDELT days downloaded but not yet parsed (default GDELT_QUEUE_SIZE)")
+@click.option("--keep-raw/--discard-raw", default=True,
+              help="Keep GDELT CSVs after parsing, or delete each once converted")
+@window_options(shard=True)
+def fetch(source: str, workers: int, countries: tuple, processes: int, queue_size: int,
+          keep_raw: bool, start, end, shard):
+    """Fetch a source's data for the date window (config range by default)."""
+    if shard and source != "gdelt":
+        raise click.BadParameter("only GDELT is split into date shards", param_hint="--shard")
+    start, end = resolve_window(start, end, shard)
     if source == "gdelt":
-        gdelt = GDELTSource()
-        csvs = gdelt.fetch_range()
-        logger.info(f"Downloaded {len(csvs)} GDELT files")
+        from pausemap.sources.gdelt import GDELTSource
+        gdelt = GDELTSource(
+            workers=workers or GDELT_WORKERS,
+            processes=processes or GDELT_PROCESSES,
+            start=start,
+            end=end
+        )
+        partitions = gdelt.fetch_and_process(
+            queue_size=queue_size or GDELT_QUEUE_SIZE, keep_raw=keep_raw
+        )
+        logger.info(f"Fetched and converted {len(partitions)} GDELT days to Parquet")
     elif source == "owid":
-        owid = OWIDSource()
+        from pausemap.sources.owid import OWIDSource
+        owid = OWIDSource(start=start, end=end)
         data_file = owid.fetch_data()
-        owid.process_data(data_file)
+        owid.process_data(data_file, countries=list(countries) or None)
         logger.info("Processed OWID data")
     elif source == "worldbank":
-        wb = WorldBankSource()
-        docs = wb.fetch_documents(START_DATE.isoformat())
+        from pausemap.sources.worldbank import WorldBankSource
+        wb = WorldBankSource(workers=workers or WORLDBANK_WORKERS, start=start, end=end)
+        wb.fetch_documents(start.isoformat())
         wb.fetch_indicators()
         logger.info("Downloaded World Bank data")
         
+@cli.command()
+@window_options()
+def merge(start, end):
+    """Merge weekly GDELT, OWID and World Bank data by country and week."""
+    from pausemap.sources.gdelt import GDELTSource
+    from pausemap.dedup import Deduplicator
+    from pausemap.processor import DataProcessor
+    from pausemap.rollup import WeeklyRollup
+    
+    start, end = resolve_window(start, end)
+    dedup = Deduplicator(GDELTSource(start=start, end=end))
+    dedup.update(start, end)
+    rollup = WeeklyRollup(dedup.view())
+    rollup.update(start, end)
+    target = DataProcessor().merge(rollup.scan(start, end), start, end)
+    logger.info(f"Merged weekly data written to {target}")
+
+@cli.command()
+@window_options()
+def export(start, end):
+    """Write per-week frontend payloads from the merged weekly data."""
+    from pausemap.sources.gdelt import GDELTSource
+    from pausemap.dedup import Deduplicator
+    from pausemap.export import WeeklyExport
+    from pausemap.processor import DataProcessor
+    from pausemap.rollup import WeeklyRollup
+    from pausemap.store import build_store
+    
+    start, end = resolve_window(start, end)
+    if not (PROCESSED_DIR / "merged_weekly.parquet").exists():
+        dedup = Deduplicator(GDELTSource(start=start, end=end))
+        dedup.update(start, end)
+        rollup = WeeklyRollup(dedup.view())
+        rollup.update(start, end)
+        DataProcessor().merge(rollup.scan(start, end), start, end)
+    store = build_store(start, end)
+    index = WeeklyExport().export(
+        store.load("merged_weekly").lazy(), store.load("gdelt_weekly").lazy()
+    )
+    logger.info(f"Frontend export index written to {index}")
+
+@cli.command()
+@click.option("--force", is_flag=True, help="Rewrite tables even if up to date")
+@window_options()
+def cache(force, start, end):
+    """Write memory-mapped Arrow copies of the merged and per-source tables."""
+    from pausemap.store import build_store
+    
+    start, end = resolve_window(start, end)
+    written = build_store(start, end).refresh_all(force)
+    logger.info(f"Arrow tables up to date: {', '.join(p.name for p in written)}")
+
+@cli.command()
+@click.option("--host", default=SERVER_HOST, show_default=True, help="Address to listen on")
+@click.option("--port", type=int, default=SERVER_PORT, show_default=True, help="Port to listen on")
+@click.option("--cache-size", type=int, default=SERVER_CACHE_SIZE, show_default=True,
+              help="Encoded responses kept in memory")
+@window_options()
+def serve(host, port, cache_size, start, end):
+    """Answer week and country slices for the frontend over HTTP."""
+    from pausemap.server import QueryService, serve as serve_forever
+    from pausemap.store import build_store
+    
+    start, end = resolve_window(start, end)
+    if not (PROCESSED_DIR / "merged_weekly.parquet").exists():
+        raise click.ClickException("No merged data yet, run `merge` or `run` first")
+    serve_forever(QueryService(build_store(start, end), cache_size), host, port)
+
+@cli.command()
+@window_options(shard=True)
+def tiles(start, end, shard):
+    """Bin GDELT event locations into weekly map tiles and export them."""
+    from pausemap.sources.gdelt import GDELTSource
+    from pausemap.dedup import Deduplicator
+    from pausemap.tiles import TilePyramid
+    
+    start, end = resolve_window(start, end, shard)
+    dedup = Deduplicator(GDELTSource(start=start, end=end))
+    dedup.update(start, end)
+    pyramid = TilePyramid(dedup.view())
+    written = pyramid.export(start, end)
+    logger.info(f"Wrote {len(written)} tile files")
+
+@cli.command()
+@click.option("--stage", "stages", multiple=True,
+              help="Only run these stages (repeatable), e.g. gdelt.dedup")
+@click.option("--force", is_flag=True, help="Rerun partitions even if up to date")
+@click.option("--workers", type=int, default=None,
+              help="Concurrent downloads (GDELT and World Bank, defaults in config)")
+@click.option("--processes", type=int, default=None,
+              help="Worker processes parsing GDELT days (default GDELT_PROCESSES)")
+@click.option("--source", "sources", type=click.Choice(SOURCES), multiple=True,
+              help="Only run these sources' stages (repeatable, default all)")
+@click.option("--keep-raw/--discard-raw", default=True,
+              help="Keep GDELT CSVs after parsing, or delete each once converted")
+@window_options(shard=True)
+def run(stages: tuple, force: bool, workers: int, processes: int, sources: tuple, keep_raw: bool,
+        start, end, shard):
+    """Run the full pipeline: fetch, parse, aggregate, merge and export.
+
+    Completed partitions are checkpointed, so rerunning after a failure
+    resumes where it stopped and only redoes work whose inputs changed.
+    With --shard only the GDELT stages run, for the shard's weeks; run
+    once more without --shard to add OWID and World Bank and to merge and
+    export the shards' output.
+    """
+    from pausemap.pipeline import build_pipeline
+    
+    if shard:
+        # OWID and World Bank are single tables, they run in the combining run
+        if set(sources) - {"gdelt"}:
+            raise click.BadParameter("only GDELT is split into date shards", param_hint="--shard")
+        sources = ("gdelt",)
+    start, end = resolve_window(start, end, shard)
+    pipeline = build_pipeline(
+        start,
+        end,
+        sources=sources or SOURCES,
+        combine=shard is None,
+        gdelt_workers=workers or GDELT_WORKERS,
+        worldbank_workers=workers or WORLDBANK_WORKERS,
+        gdelt_processes=processes or GDELT_PROCESSES,
+        keep_raw=keep_raw
+    )
+    results = pipeline.run(only=list(stages) or None, force=force)
+    for name, ok in results.items():
+        if ok:
+            logger.info(f"{name}: ok")
+        else:
+            logger.info(f"{name}: FAILED ({', '.join(pipeline.failed[name])})")
+    if not all(results.values()):
+        raise SystemExit(1)
+        
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -1,7 +1,8 @@
 """Core configuration for pause.map data pipeline."""
 
-from datetime import datetime, date
+from datetime import date, timedelta
 from pathlib import Path
+import os
 
 # Test month - April 2020 (first full month of UK lockdown)
 START_DATE = date(2020, 4, 1)
@@ -15,12 +16,68 @@ DATA_DIR = PROJECT_ROOT / "storage"
 RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 OUTPUTS_DIR = DATA_DIR / "outputs"
+METRICS_DIR = DATA_DIR / "metrics"
 
 # External data sources
 GDELT_URL = "http://data.gdeltproject.org/events/{date}.export.CSV.zip"
 OWID_URL = "https://covid.ourworldindata.org/data/owid-covid-data.json"
 WORLDBANK_URL = "https://search.worldbank.org/api/v3/wds"
 
-# Create directories if they don't exist
-for dir in [RAW_DIR, PROCESSED_DIR, OUTPUTS_DIR]:
-    dir.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+# Concurrent downloads for GDELT daily exports and World Bank indicator pages
+GDELT_WORKERS = 8
+WORLDBANK_WORKERS = 4
+
+# Worker processes used to parse GDELT days (1 parses in-process)
+GDELT_PROCESSES = os.cpu_count() or 1
+
+# Most GDELT days downloaded but not yet parsed when fetching and parsing
+# overlap; downloads wait for the parsers once this many are queued
+GDELT_QUEUE_SIZE = 16
+
+# Columns identifying a re-reported GDELT event (same actors, event code,
+# location and article), and how many previous days a day's events are
+# checked against before they count as new
+DEDUP_KEYS = (
+    "Actor1Code", "Actor2Code", "EventCode", "ActionGeo_Lat", "ActionGeo_Long", "SOURCEURL"
+)
+DEDUP_WINDOW = 7
+
+# Retries for transient HTTP failures (connection errors, 429 and 5xx),
+# sleeping HTTP_BACKOFF * 2^n seconds between attempts
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.5
+
+# Buffer size for streamed downloads and decompression (bytes)
+CHUNK_SIZE = 1024 * 1024
+
+# How long cached OWID/World Bank downloads are trusted before being
+# revalidated with the server. None trusts the cache forever.
+CACHE_MAX_AGE = timedelta(days=1)
+
+# Pre-compressed copies written next to each frontend export file
+# ("gzip", and "br" when the brotli package is installed)
+EXPORT_ENCODINGS = ("gzip", "br")
+
+# Address of the local query service (`pausemap.cli serve`)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8050
+
+# Encoded responses kept by the query service. Every week and country of
+# a multi-year window fits, so a full timeline scrub is served from memory.
+SERVER_CACHE_SIZE = 1024
+
+# Slippy map zoom levels of the precomputed GDELT event density tiles
+TILE_ZOOMS = (2, 4, 6)
+
+# Sources selectable on the command line and in the pipeline
+SOURCES = ("gdelt", "owid", "worldbank")
+
+
+def ensure_dir(path: Path) -> Path:
+    """Create a storage directory on first write.
+
+    Nothing is created at import time or when a source is constructed,
+    so commands that only read (or fail early) leave storage untouched.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    return path
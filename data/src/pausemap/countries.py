@@ -0,0 +1,97 @@
+"""Country crosswalk shared by all sources.
+
+Every country gets a small integer `country_id`, fixed in COUNTRY_IDS so
+stored partitions keep meaning the same country. Each source maps its own
+codes (GDELT FIPS and CAMEO, OWID ISO3, World Bank ISO2/ISO3) onto it with a
+single join at ingest, so downstream merges join on integers.
+"""
+
+from functools import lru_cache
+import logging
+import polars as pl
+
+from .references.countries import COUNTRIES, COUNTRY_IDS, CAMEO_ALIASES, OWID_ALIASES
+from .references.locations import FIPS_ALIASES
+
+logger = logging.getLogger(__name__)
+
+COUNTRY_INDEX_FIELDS = {
+    "country_id": pl.UInt16,
+    "iso3": pl.Utf8,
+    "iso2": pl.Utf8,
+    "fips": pl.Utf8,
+    "name": pl.Utf8,
+}
+
+# Code schemes: the index column they match and extra aliases (code -> ISO3)
+SCHEMES = {
+    "iso3": ("iso3", {}),
+    "iso2": ("iso2", {}),
+    "fips": ("fips", FIPS_ALIASES),
+    "cameo": ("iso3", CAMEO_ALIASES),
+    "owid": ("iso3", OWID_ALIASES),
+}
+
+
+def build_index() -> pl.DataFrame:
+    """Crosswalk table in country_id order."""
+    missing = sorted({iso3 for iso3, _, _, _ in COUNTRIES} - set(COUNTRY_IDS))
+    if missing:
+        raise ValueError(f"Countries without a country_id: {', '.join(missing)}")
+    rows = sorted(COUNTRIES, key=lambda row: COUNTRY_IDS[row[0]])
+    return pl.DataFrame(
+        {
+            "country_id": [COUNTRY_IDS[r[0]] for r in rows],
+            "iso3": [r[0] for r in rows],
+            "iso2": [r[1] for r in rows],
+            "fips": [r[2] for r in rows],
+            "name": [r[3] for r in rows],
+        },
+        schema=COUNTRY_INDEX_FIELDS
+    )
+
+
+@lru_cache(maxsize=None)
+def country_index() -> pl.DataFrame:
+    """The crosswalk, built once per process."""
+    return build_index()
+
+
+@lru_cache(maxsize=None)
+def code_table(scheme: str) -> pl.DataFrame:
+    """(code, country_id) pairs for one code scheme, aliases included."""
+    column, aliases = SCHEMES[scheme]
+    index = country_index()
+    ids = dict(zip(index[column], index["country_id"]))
+    # Aliases always name the ISO3 they stand for
+    by_iso3 = dict(zip(index["iso3"], index["country_id"]))
+    ids.update({alias: by_iso3[iso3] for alias, iso3 in aliases.items()})
+    return pl.DataFrame(
+        {"code": list(ids), "country_id": list(ids.values())},
+        schema={"code": pl.Utf8, "country_id": pl.UInt16}
+    )
+
+
+def attach_country_id(
+    lf: pl.LazyFrame,
+    column: str,
+    scheme: str,
+    alias: str = "country_id"
+) -> pl.LazyFrame:
+    """Add the country_id for `column` (coded in `scheme`) as `alias`.
+
+    Unknown codes and regional aggregates get a null id.
+    """
+    lookup = code_table(scheme).lazy().rename({"code": column, "country_id": alias})
+    return lf.join(
+        lookup, on=column, how="left", maintain_order="left"
+    )
+
+
+def country_codes(lf: pl.LazyFrame, column: str = "country_id", code: str = "iso3") -> pl.LazyFrame:
+    """Turn a country_id column back into readable codes."""
+    lookup = country_index().lazy().select(
+        pl.col("country_id").alias(column),
+        pl.col(code).alias("country")
+    )
+    return lf.join(lookup, on=column, how="left", maintain_order="left")
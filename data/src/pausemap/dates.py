@@ -0,0 +1,56 @@
+"""Date windows and backfill shards.
+
+The config's START_DATE/END_DATE are only defaults: sources, rollups and
+the pipeline all take the window as arguments, so a long backfill can be
+cut into disjoint shards that run on separate processes or machines.
+"""
+
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+
+def week_start(day: date) -> date:
+    """Monday of the ISO week containing day."""
+    return day - timedelta(days=day.weekday())
+
+
+def days(start: date, end: date) -> List[date]:
+    """Every day from start to end inclusive."""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def weeks(start: date, end: date) -> List[date]:
+    """Monday of every week touching start..end."""
+    mondays = []
+    monday = week_start(start)
+    while monday <= end:
+        mondays.append(monday)
+        monday += timedelta(weeks=1)
+    return mondays
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Parse an `index/count` shard spec, e.g. `0/4` for the first of four."""
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like index/count, got {shard!r}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..{count - 1}, got {index}")
+    return index, count
+
+
+def shard_range(start: date, end: date, index: int, count: int) -> Optional[Tuple[date, date]]:
+    """The part of start..end handled by shard `index` of `count`.
+
+    Shards are contiguous runs of whole ISO weeks, as even as possible, so
+    every day and every weekly rollup belongs to exactly one shard and the
+    shards' outputs can be combined without overlap. Returns None when
+    there are more shards than weeks and this one gets nothing.
+    """
+    mondays = weeks(start, end)
+    lo = index * len(mondays) // count
+    hi = (index + 1) * len(mondays) // count
+    if lo == hi:
+        return None
+    return max(start, mondays[lo]), min(end, mondays[hi - 1] + timedelta(days=6))
@@ -0,0 +1,121 @@
+"""Removal of GDELT events re-reported across days.
+
+The daily exports repeat an event whenever another article or a later day
+mentions it again, which inflates event counts. Each row is reduced to a
+64-bit hash of DEDUP_KEYS, and a day keeps only the first row per hash
+that none of the previous DEDUP_WINDOW days reported. Previous days are
+looked up in small per-day sidecars of sorted unique hashes with a binary
+search, so memory holds one day of events plus the window's hashes (a few
+MB) however long the history.
+"""
+
+from copy import copy
+from datetime import date, timedelta
+from hashlib import sha1
+from pathlib import Path
+from typing import List, Optional, Sequence
+import logging
+
+import numpy as np
+import polars as pl
+
+from .config import DEDUP_KEYS, DEDUP_WINDOW, PROCESSED_DIR, START_DATE, END_DATE, ensure_dir
+from .dates import days
+from .metrics import track
+
+logger = logging.getLogger(__name__)
+
+
+def row_hash(keys: Sequence[str]) -> pl.Expr:
+    """64-bit hash of the key columns of each row."""
+    return pl.struct(list(keys)).hash(seed=0).alias("hash")
+
+
+def contains(sorted_hashes: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    """Which of hashes occur in sorted_hashes, by binary search."""
+    if not len(sorted_hashes):
+        return np.zeros(len(hashes), dtype=bool)
+    index = np.searchsorted(sorted_hashes, hashes).clip(max=len(sorted_hashes) - 1)
+    return sorted_hashes[index] == hashes
+
+
+class Deduplicator:
+    """Writes deduplicated copies of a GDELT source's day partitions.
+
+    Copies go to `processed/gdelt_unique/<settings>/` and hash sidecars to
+    `processed/gdelt_hashes/<settings>/`, one directory per key set,
+    window and polars version (whose hash function may change), so
+    changing any of them starts afresh. A day is rebuilt when its
+    partition, or one in its window, is newer than its copy. Days are
+    independent of each other's output and can run in parallel; a day
+    whose window partitions don't exist (e.g. the first day of a shard on
+    another machine) is only checked against those that do.
+    """
+
+    def __init__(self, source, keys: Sequence[str] = DEDUP_KEYS, window: int = DEDUP_WINDOW):
+        self.source = source
+        self.keys = list(keys)
+        self.window = window
+        signature = sha1(repr((self.keys, window, pl.__version__)).encode()).hexdigest()[:12]
+        self.hashes_dir = PROCESSED_DIR / "gdelt_hashes" / signature
+        self.unique_dir = PROCESSED_DIR / "gdelt_unique" / signature
+
+    def view(self):
+        """The source reading deduplicated partitions, for rollups and tiles."""
+        unique = copy(self.source)
+        unique.processed_dir = self.unique_dir
+        return unique
+
+    def _partition(self, day: date) -> Path:
+        return self.source.processed_dir / f"{day:%Y%m%d}.parquet"
+
+    def hashes(self, day: date) -> Optional[np.ndarray]:
+        """Sorted unique hashes of a day's events, None if it isn't processed."""
+        partition = self._partition(day)
+        if not partition.exists():
+            return None
+        target = self.hashes_dir / partition.name
+        if not target.exists() or target.stat().st_mtime < partition.stat().st_mtime:
+            hashes = pl.scan_parquet(partition).select(row_hash(self.keys)).unique().sort("hash")
+            part = ensure_dir(self.hashes_dir) / (target.name + ".part")
+            hashes.sink_parquet(part)
+            part.replace(target)
+        return pl.read_parquet(target)["hash"].to_numpy()
+
+    def dedup_day(self, day: date) -> Optional[Path]:
+        """Write a day's events minus repeats, if the day or its window changed."""
+        partition = self._partition(day)
+        if not partition.exists():
+            return None
+        target = self.unique_dir / partition.name
+        window = [day - timedelta(days=i) for i in range(1, self.window + 1)]
+        inputs = [p for p in [partition, *map(self._partition, window)] if p.exists()]
+        if target.exists() and target.stat().st_mtime >= max(p.stat().st_mtime for p in inputs):
+            return target
+
+        with track("gdelt.dedup") as m:
+            seen = [h for h in map(self.hashes, window) if h is not None]
+            seen = np.unique(np.concatenate(seen)) if seen else np.empty(0, dtype=np.uint64)
+
+            events = pl.read_parquet(partition)
+            hashes = events.select(row_hash(self.keys))["hash"]
+            keep = hashes.is_first_distinct().to_numpy() & ~contains(seen, hashes.to_numpy())
+
+            part = ensure_dir(self.unique_dir) / (target.name + ".part")
+            events.filter(pl.Series(keep)).write_parquet(part, compression="zstd")
+            part.replace(target)
+            kept = int(keep.sum())
+            m.add(rows=kept, bytes=partition.stat().st_size)
+
+        removed = events.height - kept
+        with track("gdelt.duplicates") as m:
+            m.add(rows=removed)
+        logger.info(f"Removed {removed} of {events.height} events on {day} as repeats")
+        return target
+
+    def update(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Path]:
+        """Deduplicate every processed day in start..end."""
+        return [
+            path for path in map(self.dedup_day, days(start or START_DATE, end or END_DATE))
+            if path
+        ]
@@ -0,0 +1,221 @@
+"""Compact per-week payloads for the pause.map frontend.
+
+The map loads `index.json` once (weeks, dictionaries and metric scales) and
+then fetches one small file per week as the user scrubs through time.
+Payloads are columnar: countries are positions in the index's country
+dictionary (their country_id), event roots are positions in its event root
+dictionary, and metrics are integers to be divided by their scale.
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import gzip
+import json
+import logging
+import polars as pl
+
+from .config import EXPORT_ENCODINGS, OUTPUTS_DIR, ensure_dir
+from .countries import country_index
+from .http import write_if_changed
+from .metrics import track
+from .references.events import EVENT_ROOTS
+
+try:
+    import brotli
+except ImportError:  # optional, see the `export` extra
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Exported metrics and the decimal places kept for each
+EXPORT_METRICS = {
+    "event_count": 0,
+    "impact": 2,
+    "tone": 2,
+    "cases": 0,
+    "deaths": 0,
+    "stringency_index": 1,
+    "people_fully_vaccinated_per_hundred": 1,
+}
+
+# File suffix of each pre-compressed copy
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+_EVENT_ROOT_CODES = sorted(EVENT_ROOTS)
+
+
+def quantise(column: str, places: int) -> pl.Expr:
+    """Round a metric to `places` decimals, stored as an integer."""
+    return (pl.col(column) * 10 ** places).round().cast(pl.Int64)
+
+
+def _roots(events: pl.DataFrame, key: str) -> pl.DataFrame:
+    """(key, root, count) rows of a rollup, roots as dictionary positions."""
+    return events.filter(pl.col("event_root").is_in(_EVENT_ROOT_CODES)).select(
+        key,
+        root=pl.col("event_root").replace_strict(
+            _EVENT_ROOT_CODES, range(len(_EVENT_ROOT_CODES)), return_dtype=pl.UInt8
+        ),
+        count="event_count"
+    )
+
+
+def encode(payload: Dict) -> bytes:
+    """Minified UTF-8 JSON."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    """Pre-compress content for static hosting.
+
+    gzip output is written with a fixed mtime so unchanged weeks produce
+    identical files.
+    """
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    if encoding == "br":
+        return brotli.compress(content, quality=11)
+    raise ValueError(f"Unknown encoding: {encoding}")
+
+
+class WeeklyExport:
+    """Writes the merged country x week table as one JSON file per week.
+
+    Week files are named like the rollups (`2020-W14.json`) and each is
+    optionally accompanied by `.gz` / `.br` copies so a static host can
+    serve them pre-compressed. Files are only rewritten when their content
+    changes, keeping mtimes (and CDN caches) stable across reruns.
+    """
+
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        metrics: Optional[Dict[str, int]] = None,
+        encodings: Sequence[str] = EXPORT_ENCODINGS
+    ):
+        self.output_dir = output_dir or OUTPUTS_DIR / "weekly"
+        self.metrics = metrics or EXPORT_METRICS
+        self.encodings = list(encodings)
+        if "br" in self.encodings and brotli is None:
+            logger.warning("brotli is not installed, skipping .br files")
+            self.encodings.remove("br")
+
+    def week_payload(self, week: date, merged: pl.DataFrame, events: pl.DataFrame) -> Dict:
+        """Columnar payload for one week.
+
+        merged holds the week's rows of the merged table, events its
+        (country_id, event_root, event_count) rollup rows.
+        """
+        metrics = [m for m in self.metrics if m in merged.columns]
+        merged = merged.sort("country_id").select(
+            "country_id", *(quantise(m, self.metrics[m]) for m in metrics)
+        )
+        events = _roots(events, "country_id").sort("country_id", "root")
+
+        return {
+            "week": week.isoformat(),
+            "countries": merged["country_id"].to_list(),
+            "metrics": {m: merged[m].to_list() for m in metrics},
+            "events": {
+                "country": events["country_id"].to_list(),
+                "root": events["root"].to_list(),
+                "count": events["count"].to_list(),
+            },
+        }
+
+    def country_payload(self, iso3: str, merged: pl.DataFrame, events: pl.DataFrame) -> Dict:
+        """Columnar payload of one country over time.
+
+        merged holds the country's rows of the merged table, events its
+        (week, event_root, event_count) rollup rows. Event weeks are
+        positions in the payload's week list.
+        """
+        metrics = [m for m in self.metrics if m in merged.columns]
+        merged = merged.sort("week").select(
+            "week", *(quantise(m, self.metrics[m]) for m in metrics)
+        )
+        weeks = merged["week"].to_list()
+        events = (
+            _roots(events.filter(pl.col("week").is_in(weeks)), "week")
+            .with_columns(pl.col("week").replace_strict(weeks, range(len(weeks)), return_dtype=pl.UInt16))
+            .sort("week", "root")
+        )
+
+        return {
+            "country": iso3,
+            "weeks": [week.isoformat() for week in weeks],
+            "metrics": {m: merged[m].to_list() for m in metrics},
+            "events": {
+                "week": events["week"].to_list(),
+                "root": events["root"].to_list(),
+                "count": events["count"].to_list(),
+            },
+        }
+
+    def write(self, name: str, content: bytes) -> int:
+        """Write content and its compressed copies if it changed.
+
+        Returns the size of the smallest copy, which is what a client
+        accepting every encoding would download.
+        """
+        target = ensure_dir(self.output_dir) / name
+        # No sidecars, the directory is published as is
+        changed = write_if_changed(target, content, sidecar=False)
+
+        sizes = [len(content)]
+        for encoding in self.encodings:
+            copy = target.with_name(name + SUFFIXES[encoding])
+            if changed or not copy.exists():
+                write_if_changed(copy, compress(content, encoding), sidecar=False)
+            sizes.append(copy.stat().st_size)
+        return min(sizes)
+
+    def index_payload(self, weeks: List[Dict]) -> Dict:
+        """Dictionaries, scales and the list of week files.
+
+        The country dictionary is indexed by country_id, with null for ids
+        that aren't assigned, so it stays valid however the ids are spread.
+        """
+        index = country_index()
+        countries = [None] * (index["country_id"].max() + 1)
+        for country_id, iso3, name in index.select("country_id", "iso3", "name").rows():
+            countries[country_id] = [iso3, name]
+        return {
+            "weeks": weeks,
+            "countries": countries,
+            "event_roots": [[code, EVENT_ROOTS[code]] for code in _EVENT_ROOT_CODES],
+            "metrics": {m: {"scale": 10 ** p} for m, p in self.metrics.items()},
+            "encodings": self.encodings,
+        }
+
+    def export(self, merged: pl.LazyFrame, events: pl.LazyFrame) -> Path:
+        """Write every week of merged, plus index.json.
+
+        merged is the table from DataProcessor.merge, events the GDELT
+        rollup scan (see WeeklyRollup.scan).
+        """
+        merged = merged.filter(pl.col("country_id").is_not_null()).collect()
+        events = (
+            events
+            .filter(pl.col("country_id").is_not_null())
+            .select("week", "country_id", "event_root", "event_count")
+            .collect()
+        )
+        by_week = events.partition_by("week", as_dict=True, include_key=False)
+        empty = events.clear().drop("week")
+
+        with track("export") as m:
+            weeks = []
+            for (week,), rows in sorted(merged.partition_by("week", as_dict=True).items()):
+                payload = self.week_payload(week, rows, by_week.get((week,), empty))
+                name = f"{week:%G-W%V}.json"
+                size = self.write(name, encode(payload))
+                weeks.append({"week": week.isoformat(), "file": name, "bytes": size})
+
+            self.write("index.json", encode(self.index_payload(weeks)))
+            m.add(rows=merged.height, bytes=sum(week["bytes"] for week in weeks))
+        logger.info(f"Exported {len(weeks)} weeks to {self.output_dir}")
+
+        return self.output_dir / "index.json"
+
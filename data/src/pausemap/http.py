@@ -0,0 +1,198 @@
+"""HTTP session and download cache shared by the data sources."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import track
+from .config import CACHE_MAX_AGE, CHUNK_SIZE, HTTP_RETRIES, HTTP_BACKOFF
+
+logger = logging.getLogger(__name__)
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """Session whose connection pool can serve pool_size threads at once.
+
+    Transient failures are retried with exponential backoff, honouring any
+    Retry-After header.
+    """
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD")
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _meta_path(target: Path) -> Path:
+    return target.with_name(target.name + ".meta.json")
+
+
+def read_meta(target: Path) -> Dict:
+    """Cache metadata stored next to target, empty if there is none."""
+    path = _meta_path(target)
+    if not target.exists() or not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_meta(target: Path, **meta) -> None:
+    """Record cache metadata for target, stamped with the current time."""
+    meta["fetched_at"] = datetime.now(timezone.utc).isoformat()
+    with open(_meta_path(target), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def is_fresh(target: Path, max_age: Optional[timedelta] = CACHE_MAX_AGE) -> bool:
+    """Whether a cached file can be used without asking the server.
+
+    A max_age of None trusts any cached file forever.
+    """
+    if not target.exists():
+        return False
+    if max_age is None:
+        return True
+    meta = read_meta(target)
+    if "fetched_at" not in meta:
+        return False
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(meta["fetched_at"])
+    return age < max_age
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_if_changed(target: Path, content: bytes, sidecar: bool = True, **meta) -> bool:
+    """Write content unless target already holds the same bytes.
+
+    Unchanged files keep their mtime, so downstream stages that compare
+    mtimes don't rebuild, and changed ones are replaced in one rename, so
+    readers never see a partial file. The content hash and meta are kept
+    in a sidecar unless `sidecar` is False (for published files), in which
+    case the existing file is hashed instead. Returns whether the file was
+    rewritten.
+    """
+    sha256 = hashlib.sha256(content).hexdigest()
+    previous = read_meta(target).get("sha256") if sidecar else None
+    if previous is None and target.exists():
+        previous = file_sha256(target)
+
+    changed = sha256 != previous
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if changed:
+        part = target.with_name(target.name + ".part")
+        part.write_bytes(content)
+        part.replace(target)
+    if sidecar:
+        write_meta(target, sha256=sha256, **meta)
+
+    return changed
+
+
+def _is_outage(error: BaseException) -> bool:
+    """Whether a request failed on the network or the server's side."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is None or error.response.status_code >= 500
+    return isinstance(error, requests.RequestException)
+
+
+def fetch_cached(
+    session: requests.Session,
+    url: str,
+    target: Path,
+    params: Optional[Dict] = None,
+    max_age: Optional[timedelta] = CACHE_MAX_AGE,
+    stage: str = "http.fetch"
+) -> Path:
+    """Download url to target, revalidating an existing copy.
+
+    Fresh copies are served without a request. Stale ones are revalidated
+    with If-None-Match / If-Modified-Since, so an unchanged resource costs a
+    304 rather than a full download. The body is streamed to disk and only
+    replaces target if its content hash differs. If a stale copy can't be
+    revalidated because of a network error or a 5xx, it is used as is.
+    Bytes and cache hits are recorded under the metrics `stage`.
+    """
+    with track(stage) as m:
+        if is_fresh(target, max_age):
+            logger.info(f"Using cached {target.name}")
+            m.add(cache_hit=True)
+            return target
+
+        meta = read_meta(target)
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        part = target.with_name(target.name + ".part")
+        try:
+            with session.get(url, params=params, headers=headers, stream=True) as response:
+                if response.status_code == 304:
+                    logger.info(f"{target.name} not modified, keeping cached copy")
+                    meta.pop("fetched_at", None)
+                    write_meta(target, **meta)
+                    m.add(cache_hit=True)
+                    return target
+
+                response.raise_for_status()
+                logger.info(f"Downloading {target.name}")
+                m.add(cache_hit=False)
+
+                digest = hashlib.sha256()
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with open(part, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        digest.update(chunk)
+                        f.write(chunk)
+                        m.add(bytes=len(chunk))
+
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except BaseException as e:
+            part.unlink(missing_ok=True)
+            if target.exists() and _is_outage(e):
+                # Stale data beats none; the next run tries again
+                logger.warning(f"Couldn't revalidate {target.name} ({e}), using cached copy")
+                m.errors += 1
+                m.add(cache_hit=True)
+                return target
+            raise
+
+        sha256 = digest.hexdigest()
+        previous = meta.get("sha256")
+        if previous is None and target.exists():
+            previous = file_sha256(target)
+
+        if sha256 == previous:
+            part.unlink()
+        else:
+            part.replace(target)
+
+        write_meta(
+            target,
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            sha256=sha256
+        )
+        return target
@@ -0,0 +1,154 @@
+"""Per-stage timing, throughput and memory metrics.
+
+Stages wrap their work in `track(name)` and report what they moved:
+
+    with track("gdelt.fetch") as m:
+        ...
+        m.add(bytes=len(chunk))
+
+Calls to the same stage are summed (from any thread), and the CLI writes
+the totals as a JSON report at the end of each run (see `report`).
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+import json
+import logging
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """High-water mark of resident memory in MB, None where unsupported.
+
+    With `children`, the largest of this process' finished children (e.g.
+    the GDELT parse pool) instead, since those don't count towards it.
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(who).ru_maxrss / scale, 1)
+
+
+class StageMetrics:
+    """Running totals for one stage."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.peak_rss_mb = None
+
+    def add(self, rows: int = 0, bytes: int = 0, cache_hit: Optional[bool] = None) -> None:
+        """Count rows and bytes moved, and whether a cache was used."""
+        self.rows += rows
+        self.bytes += bytes
+        if cache_hit is True:
+            self.cache_hits += 1
+        elif cache_hit is False:
+            self.cache_misses += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "rows_per_sec": round(self.rows / self.seconds, 1) if self.seconds else None,
+            "bytes_per_sec": round(self.bytes / self.seconds, 1) if self.seconds else None,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+class Metrics:
+    """Thread-safe registry of stage metrics for one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, StageMetrics] = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def track(self, stage: str) -> Iterator["_Call"]:
+        """Time one call of a stage and collect what it reports."""
+        call = _Call()
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield call
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            rss = peak_rss_mb()
+            with self._lock:
+                totals = self.stages.setdefault(stage, StageMetrics())
+                totals.calls += 1
+                totals.errors += call.errors + failed
+                totals.seconds += elapsed
+                totals.add(call.rows, call.bytes)
+                totals.cache_hits += call.cache_hits
+                totals.cache_misses += call.cache_misses
+                if rss is not None:
+                    totals.peak_rss_mb = max(rss, totals.peak_rss_mb or 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.started_at = datetime.now(timezone.utc)
+            self._started = time.perf_counter()
+
+    def report(self, command: Optional[str] = None) -> Dict:
+        """Machine-readable summary of the run so far.
+
+        Stage peak RSS is the process high-water mark when the stage last
+        finished, so it only grows across stages; the largest jump shows
+        which stage drove it.
+        """
+        with self._lock:
+            stages = {name: m.as_dict() for name, m in sorted(self.stages.items())}
+        return {
+            "command": command,
+            "started_at": self.started_at.isoformat(),
+            "seconds": round(time.perf_counter() - self._started, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_child_rss_mb": peak_rss_mb(children=True),
+            "stages": stages,
+        }
+
+    def write_report(self, path: Path, command: Optional[str] = None) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(command), f, indent=2)
+        logger.info(f"Wrote run metrics to {path}")
+        return path
+
+
+class _Call(StageMetrics):
+    """What a single tracked call reports; folded into its stage on exit."""
+
+
+# Process-wide registry used by the sources and the CLI
+METRICS = Metrics()
+track = METRICS.track
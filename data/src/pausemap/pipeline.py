@@ -0,0 +1,367 @@
+"""Checkpointed pipeline runner over a graph of stages.
+
+Each stage is split into partitions (a GDELT day, a week, or a single
+partition for whole-table stages). When a partition finishes, a marker
+recording a fingerprint of its inputs and the outputs it wrote is stored
+under `processed/pipeline/<stage>/`. On the next run a partition is skipped
+if its marker matches the current inputs and its outputs still exist, so a
+crashed run resumes from the last completed partition and a rerun only
+redoes work whose inputs changed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, Iterable, List, Optional, Sequence, Union
+import json
+import logging
+
+from .config import (
+    PROCESSED_DIR, START_DATE, END_DATE, GDELT_WORKERS, GDELT_PROCESSES, WORLDBANK_WORKERS,
+    SOURCES
+)
+from .dedup import Deduplicator
+from .export import WeeklyExport
+from .metrics import track
+from .processor import DataProcessor
+from .dates import days, weeks
+from .rollup import WeeklyRollup
+from .sources.gdelt import GDELTSource
+from .sources.owid import OWIDSource
+from .sources.worldbank import WorldBankSource
+from .store import build_store, fingerprint
+from .tiles import TilePyramid
+
+logger = logging.getLogger(__name__)
+
+Outputs = Union[Path, Sequence[Path], None]
+
+# Stages reading every source over the whole window
+COMBINE_STAGES = ("merge", "store", "export", "tiles.export")
+
+
+class Stage:
+    """One step of the pipeline.
+
+    run(partition) does the work for a partition and returns the path(s)
+    it wrote; a falsy result means the partition failed. inputs(partition)
+    lists the files it reads, whose fingerprint decides whether a completed
+    partition is still up to date. Stages without checkpoints always run,
+    which suits fetches that do their own cache revalidation. context, if
+    given, returns a context manager held open while the stage runs (e.g.
+    a process pool its partitions share).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[str], Outputs],
+        deps: Sequence[str] = (),
+        partitions: Optional[Callable[[], List[str]]] = None,
+        inputs: Optional[Callable[[str], Iterable[Path]]] = None,
+        workers: int = 1,
+        checkpoint: bool = True,
+        context: Optional[Callable[[], ContextManager]] = None
+    ):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.partitions = partitions or (lambda: ["all"])
+        self.inputs = inputs or (lambda partition: [])
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.context = context or nullcontext
+
+
+class Pipeline:
+    """Runs stages in dependency order, independent stages in parallel."""
+
+    def __init__(self, stages: List[Stage], state_dir: Optional[Path] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_dir = state_dir or PROCESSED_DIR / "pipeline"
+
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+
+    def _marker(self, stage: Stage, partition: str) -> Path:
+        return self.state_dir / stage.name / f"{partition}.json"
+
+    def is_complete(self, stage: Stage, partition: str) -> bool:
+        """Whether a partition's marker matches its current inputs."""
+        if not stage.checkpoint:
+            return False
+        marker = self._marker(stage, partition)
+        if not marker.exists():
+            return False
+        with open(marker) as f:
+            state = json.load(f)
+        return (
+            state["fingerprint"] == fingerprint(stage.inputs(partition))
+            and all(Path(p).exists() for p in state["outputs"])
+        )
+
+    def run_partition(self, stage: Stage, partition: str, force: bool = False) -> bool:
+        """Run one partition unless it is up to date. Returns success.
+
+        Each partition is tracked as `pipeline.<stage>` in the run metrics,
+        with up-to-date partitions counted as cache hits.
+        """
+        with track(f"pipeline.{stage.name}") as m:
+            if not force and self.is_complete(stage, partition):
+                m.add(cache_hit=True)
+                return True
+            m.add(cache_hit=False)
+
+            try:
+                outputs = stage.run(partition)
+            except Exception as e:
+                logger.error(f"{stage.name} failed on {partition}: {e}")
+                m.errors += 1
+                return False
+        if not outputs:
+            logger.error(f"{stage.name} produced nothing for {partition}")
+            return False
+
+        if stage.checkpoint:
+            outputs = [outputs] if isinstance(outputs, Path) else list(outputs)
+            marker = self._marker(stage, partition)
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            part = marker.with_name(marker.name + ".part")
+            with open(part, "w") as f:
+                json.dump({
+                    "fingerprint": fingerprint(stage.inputs(partition)),
+                    "outputs": [str(p) for p in outputs],
+                    "completed_at": datetime.now(timezone.utc).isoformat()
+                }, f, indent=2)
+            part.replace(marker)
+        return True
+
+    def run_stage(self, stage: Stage, force: bool = False, skip: Iterable[str] = ()) -> List[str]:
+        """Run every partition of a stage, `stage.workers` at a time.
+
+        All partitions are attempted even if some fail, so the next run
+        only has the failed ones left. Partitions in `skip` (those whose
+        upstream partition failed) are not run and count as failed.
+        Returns the failed partitions.
+        """
+        partitions = stage.partitions()
+        skip = set(skip)
+        skipped = [p for p in partitions if p in skip]
+        todo = [p for p in partitions if p not in skip]
+        if skipped:
+            logger.warning(f"{stage.name}: skipping {', '.join(skipped)}, upstream partitions failed")
+        logger.info(f"Running {stage.name} ({len(todo)} partitions)")
+        with stage.context(), ThreadPoolExecutor(max_workers=stage.workers) as pool:
+            results = list(pool.map(lambda p: self.run_partition(stage, p, force), todo))
+
+        failed = skipped + [p for p, ok in zip(todo, results) if not ok]
+        if failed:
+            logger.error(f"{stage.name}: {len(failed)} of {len(partitions)} partitions failed")
+        return failed
+
+    def run(self, only: Optional[Sequence[str]] = None, force: bool = False) -> Dict[str, bool]:
+        """Run the pipeline and return whether each stage fully succeeded.
+
+        With `only`, just those stages run and their other dependencies
+        are assumed done. A partition failing doesn't hold back the rest:
+        downstream stages run on whatever their dependencies produced,
+        skipping partitions with the same key as a failed upstream one
+        (a day whose fetch failed isn't parsed), and rerun later once the
+        missing inputs change their fingerprints. Only a stage none of
+        whose partitions succeeded skips its dependents. The failed
+        partitions of each stage are left in `self.failed`.
+        """
+        selected = [name for name in self.stages if not only or name in only]
+        unknown = set(only or []) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}")
+
+        self.failed: Dict[str, List[str]] = {}
+        blocked = set()
+        pending = set(selected)
+        with ThreadPoolExecutor(max_workers=len(selected) or 1) as pool:
+            running = {}
+            while pending or running:
+                for name in sorted(pending):
+                    deps = [d for d in self.stages[name].deps if d in selected]
+                    if any(d in blocked for d in deps):
+                        logger.warning(f"Skipping {name}, a dependency failed entirely")
+                        self.failed[name] = self.stages[name].partitions()
+                        blocked.add(name)
+                        pending.discard(name)
+                    elif all(d in self.failed for d in deps):
+                        skip = set().union(*(self.failed[d] for d in deps))
+                        future = pool.submit(self.run_stage, self.stages[name], force, skip)
+                        running[future] = name
+                        pending.discard(name)
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    failed = future.result()
+                    self.failed[name] = failed
+                    if failed and len(failed) == len(self.stages[name].partitions()):
+                        blocked.add(name)
+
+        return {name: not self.failed.get(name, True) for name in selected}
+
+
+def build_pipeline(
+    start: date = START_DATE,
+    end: date = END_DATE,
+    sources: Sequence[str] = SOURCES,
+    combine: bool = True,
+    gdelt_workers: int = GDELT_WORKERS,
+    worldbank_workers: int = WORLDBANK_WORKERS,
+    gdelt_processes: int = GDELT_PROCESSES,
+    keep_raw: bool = True
+) -> Pipeline:
+    """The fetch -> parse -> aggregate -> merge -> export graph for a window.
+
+    Only the stages of `sources` are included. The whole-range stages that
+    combine every source (merge and the exports) are left out when
+    `combine` is False, which is how date shards of a backfill run: each
+    shard builds its own days and weeks, and one final combining run
+    merges whatever partitions the shards produced. Without `keep_raw`
+    each GDELT day's CSV is deleted once parsed.
+    """
+    gdelt = GDELTSource(workers=gdelt_workers, processes=gdelt_processes, start=start, end=end)
+    owid = OWIDSource(start=start, end=end)
+    worldbank = WorldBankSource(workers=worldbank_workers, start=start, end=end)
+    dedup = Deduplicator(gdelt)
+    # Rollups and tiles count each event once, however often it was re-reported
+    unique = dedup.view()
+    rollup = WeeklyRollup(unique)
+    pyramid = TilePyramid(unique)
+
+    # Single-partition stages are keyed on the window, so changing it reruns them
+    window = f"{start:%Y%m%d}-{end:%Y%m%d}"
+
+    def day_keys() -> List[str]:
+        return [f"{day:%Y%m%d}" for day in days(start, end)]
+
+    def week_keys() -> List[str]:
+        return [monday.isoformat() for monday in weeks(start, end)]
+
+    def day(partition: str) -> date:
+        return datetime.strptime(partition, "%Y%m%d").date()
+
+    def raw_csv(partition: str) -> Path:
+        return gdelt.raw_dir / f"{partition}.export.CSV"
+
+    def dedup_window(partition: str) -> List[Path]:
+        return [
+            gdelt.processed_dir / f"{day(partition) - timedelta(days=i):%Y%m%d}.parquet"
+            for i in range(dedup.window + 1)
+        ]
+
+    def day_partitions(week: str) -> List[Path]:
+        monday = date.fromisoformat(week)
+        return [
+            unique.processed_dir / f"{monday + timedelta(days=i):%Y%m%d}.parquet"
+            for i in range(7)
+        ]
+
+    def rollup_week(week: str) -> Outputs:
+        monday = date.fromisoformat(week)
+        for i in range(7):
+            rollup.aggregate_day(monday + timedelta(days=i))
+        return rollup.rollup_week(monday)
+
+    def weekly_rollups() -> List[Path]:
+        return sorted(rollup.weekly_dir.glob("*.parquet"))
+
+    owid_json = owid.raw_dir / "owid_covid.json"
+    owid_metrics = owid.raw_dir / "metrics.parquet"
+    wb_indicators = worldbank.processed_dir / "indicators.parquet"
+    merged = PROCESSED_DIR / "merged_weekly.parquet"
+
+    def fetch_worldbank(partition: str) -> Outputs:
+        worldbank.fetch_documents(start.isoformat())
+        worldbank.fetch_indicators()
+        return wb_indicators
+
+    def parse_owid(partition: str) -> Outputs:
+        owid.process_data(owid_json)
+        return [owid_metrics, owid.raw_dir / "metadata.parquet"]
+
+    # Memory-mapped Arrow copies of the merged and per-source tables
+    store = build_store(start, end)
+
+    def export(partition: str) -> Outputs:
+        return WeeklyExport().export(
+            store.load("merged_weekly").lazy(), store.load("gdelt_weekly").lazy()
+        )
+
+    stages = [
+        Stage(
+            # Fetch and parse in one stage, so downloads overlap with parsing
+            # rather than the whole window being fetched first
+            "gdelt.ingest", lambda p: gdelt.ingest_day(day(p), keep_raw),
+            partitions=day_keys,
+            inputs=lambda p: [raw_csv(p)],
+            workers=gdelt_workers,
+            context=gdelt.process_pool
+        ),
+        Stage(
+            "gdelt.dedup", lambda p: dedup.dedup_day(day(p)),
+            deps=["gdelt.ingest"],
+            partitions=day_keys,
+            inputs=dedup_window
+        ),
+        Stage(
+            "gdelt.rollup", rollup_week,
+            deps=["gdelt.dedup"],
+            partitions=week_keys,
+            inputs=day_partitions
+        ),
+        Stage(
+            "gdelt.tiles", lambda p: pyramid.build_week(date.fromisoformat(p)),
+            deps=["gdelt.dedup"],
+            partitions=week_keys,
+            inputs=day_partitions
+        ),
+        Stage("owid.fetch", lambda p: owid.fetch_data(), checkpoint=False),
+        Stage(
+            "owid.parse", parse_owid,
+            deps=["owid.fetch"],
+            partitions=lambda: [window],
+            inputs=lambda p: [owid_json]
+        ),
+        Stage("worldbank.fetch", fetch_worldbank, checkpoint=False),
+        Stage(
+            "merge", lambda p: DataProcessor().merge(rollup.scan(start, end), start, end),
+            deps=["gdelt.rollup", "owid.parse", "worldbank.fetch"],
+            partitions=lambda: [window],
+            inputs=lambda p: weekly_rollups() + [owid_metrics, wb_indicators]
+        ),
+        Stage("store", lambda p: store.refresh_all(), deps=["merge"], checkpoint=False),
+        Stage(
+            "export", export,
+            deps=["store"],
+            partitions=lambda: [window],
+            inputs=lambda p: weekly_rollups() + [merged]
+        ),
+        Stage(
+            "tiles.export", lambda p: pyramid.export(start, end),
+            deps=["gdelt.tiles"],
+            partitions=lambda: [window],
+            inputs=lambda p: sorted(pyramid.tiles_dir.glob("*.parquet"))
+        ),
+    ]
+
+    stages = [
+        stage for stage in stages
+        if stage.name.split(".")[0] in sources
+        or (combine and stage.name in COMBINE_STAGES)
+    ]
+    # Dependencies on left out stages are assumed to be satisfied on disk
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        stage.deps = [dep for dep in stage.deps if dep in names]
+    return Pipeline(stages)
@@ -0,0 +1,219 @@
+"""Merge engine joining GDELT, OWID and World Bank data by country and week."""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+import logging
+import polars as pl
+
+from .config import PROCESSED_DIR, RAW_DIR, START_DATE, END_DATE
+from .countries import attach_country_id, country_codes
+from .dates import week_start
+from .metrics import track
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+# OWID daily metrics rolled up to weeks: output column -> expression
+OWID_WEEKLY = {
+    "cases": pl.col("new_cases").sum(),
+    "deaths": pl.col("new_deaths").sum(),
+    "stringency_index": pl.col("stringency_index").mean(),
+    "people_fully_vaccinated_per_hundred": pl.col("people_fully_vaccinated_per_hundred").max(),
+}
+
+
+def _to_week(column: str = "week") -> pl.Expr:
+    """Monday of the ISO week, as a Date."""
+    return pl.col(column).cast(pl.Date).dt.truncate("1w").alias("week")
+
+
+def _country_key(*frames: pl.LazyFrame) -> Optional[str]:
+    """The best country column shared by all frames, if any."""
+    for key in ("country_id", "country"):
+        if all(key in lf.collect_schema().names() for lf in frames):
+            return key
+    return None
+
+
+class DataProcessor:
+    """Aligns the three sources on a (country, week) grid.
+
+    Countries are keyed by the integer country_id from pausemap.countries
+    (or a plain `country` column when frames don't carry ids). GDELT weekly
+    aggregates come from the
+    rollups, OWID daily metrics are rolled up to ISO weeks and annual World
+    Bank indicators are carried forward to every week of their year. All
+    steps are lazy so the full two year grid is built in one streaming pass.
+    """
+
+    def gdelt_weekly(self, rollups: pl.LazyFrame) -> pl.LazyFrame:
+        """Country-level weekly GDELT metrics from the materialised rollups."""
+        return (
+            rollups
+            .filter(pl.col("country_id").is_not_null())
+            .group_by("week", "country_id")
+            .agg(pl.col("event_count", "goldstein_sum", "tone_sum").sum())
+            .select(
+                "week",
+                "country_id",
+                "event_count",
+                impact=pl.col("goldstein_sum") / pl.col("event_count"),
+                tone=pl.col("tone_sum") / pl.col("event_count")
+            )
+        )
+
+    def owid_weekly(self, metrics: pl.LazyFrame) -> pl.LazyFrame:
+        """Roll OWID daily metrics up to ISO weeks, skipping OWID_* aggregates."""
+        available = metrics.collect_schema().names()
+        if "country_id" not in available:
+            metrics = attach_country_id(metrics, "country_code", "owid")
+        return (
+            metrics
+            .filter(pl.col("country_id").is_not_null())
+            .group_by("country_id", _to_week("date"))
+            .agg(**{
+                name: expr for name, expr in OWID_WEEKLY.items()
+                if all(column in available for column in expr.meta.root_names())
+            })
+        )
+
+    def merge_weekly_data(self, gdelt: Frame, owid: Frame) -> Frame:
+        """Left join weekly OWID metrics onto weekly GDELT metrics.
+
+        Joins on (country, week) when both sides carry a country key,
+        otherwise on week alone. Weeks are normalised to their Monday first.
+        """
+        lazy = isinstance(gdelt, pl.LazyFrame)
+        gdelt, owid = gdelt.lazy(), owid.lazy()
+
+        key = _country_key(gdelt, owid)
+        keys = [key, "week"] if key else ["week"]
+
+        merged = (
+            gdelt.with_columns(_to_week())
+            .join(owid.with_columns(_to_week()), on=keys, how="left")
+            .sort(keys)
+        )
+        return merged if lazy else merged.collect()
+
+    def add_economic_data(self, worldbank: Frame, weekly: Optional[Frame] = None) -> Frame:
+        """Carry annual World Bank values forward onto weeks.
+
+        worldbank is long format with a year (or `date` year string),
+        country key and value, plus an optional indicator column that gets
+        pivoted into one column per indicator. With `weekly`, values are
+        as-of joined onto its (country, week) rows, so each week takes the
+        latest year at or before it. Without it, every year is expanded
+        to the weeks whose Monday falls in it. Raises ValueError when the
+        frames share no country column.
+        """
+        lazy = isinstance(weekly if weekly is not None else worldbank, pl.LazyFrame)
+        wb = worldbank.lazy()
+        key = _country_key(wb, *([weekly.lazy()] if weekly is not None else []))
+        if key is None:
+            raise ValueError(
+                "World Bank data needs a country_id or country column"
+                + (" shared with the weekly frame" if weekly is not None else "")
+            )
+        if "year" not in wb.collect_schema().names():
+            wb = wb.with_columns(year=pl.col("date").cast(pl.Int32))
+        wb = wb.with_columns(year_start=pl.date(pl.col("year"), 1, 1))
+        if key == "country":
+            # World Bank tables keep ISO3 as a categorical
+            wb = wb.with_columns(pl.col("country").cast(pl.Utf8))
+        wb = wb.filter(pl.col(key).is_not_null())
+
+        values = ["value"]
+        if "indicator" in wb.collect_schema().names():
+            # Indicator tables are tiny (countries x years), pivot eagerly
+            wide = wb.collect().pivot(
+                "indicator", index=[key, "year_start"], values="value"
+            )
+            values = [c for c in wide.columns if c not in (key, "year_start")]
+            wb = wide.lazy()
+        wb = wb.select(key, "year_start", *values)
+
+        if weekly is None:
+            # Weeks whose Monday falls in the year, as in the as-of join
+            # below, so each week belongs to exactly one year
+            monday = pl.col("year_start").dt.truncate("1w")
+            first = pl.when(monday < pl.col("year_start")).then(monday.dt.offset_by("1w")).otherwise(monday)
+            expanded = (
+                wb.with_columns(
+                    week=pl.date_ranges(
+                        first, pl.col("year_start").dt.offset_by("1y").dt.offset_by("-1d"), "1w"
+                    )
+                )
+                .explode("week")
+                .select("week", key, *values)
+                .sort(key, "week")
+            )
+            return expanded if lazy else expanded.collect()
+
+        merged = (
+            weekly.lazy()
+            .with_columns(_to_week())
+            .sort("week")
+            .join_asof(
+                wb.sort("year_start"),
+                left_on="week",
+                right_on="year_start",
+                by=key,
+                strategy="backward",
+                # Both sides are sorted above; polars can't verify it per group
+                check_sortedness=False
+            )
+            .drop("year_start")
+            .sort(key, "week")
+        )
+        return merged if lazy else merged.collect()
+
+    def merge(
+        self,
+        gdelt_weekly: pl.LazyFrame,
+        start: date = START_DATE,
+        end: date = END_DATE,
+        owid_metrics: Optional[Path] = None,
+        worldbank_indicators: Optional[Path] = None,
+        target: Optional[Path] = None
+    ) -> Path:
+        """Build the merged country x week table and write it to Parquet.
+
+        gdelt_weekly is the rollup scan (see WeeklyRollup.scan); the OWID
+        and World Bank tables default to where their sources write them.
+        """
+        owid_metrics = owid_metrics or RAW_DIR / "owid" / "metrics.parquet"
+        worldbank_indicators = worldbank_indicators or PROCESSED_DIR / "worldbank" / "indicators.parquet"
+
+        # Weeks are keyed by their Monday, so a mid-week start keeps its week
+        merged = self.gdelt_weekly(gdelt_weekly).filter(
+            pl.col("week").is_between(week_start(start), end)
+        )
+        if owid_metrics.exists():
+            merged = self.merge_weekly_data(
+                merged, self.owid_weekly(pl.scan_parquet(owid_metrics))
+            )
+        if worldbank_indicators.exists():
+            merged = self.add_economic_data(pl.scan_parquet(worldbank_indicators), merged)
+
+        # Readable ISO3 codes alongside the integer keys
+        merged = country_codes(merged).select(
+            "week", "country_id", "country", pl.exclude("week", "country_id", "country")
+        )
+
+        target = target or PROCESSED_DIR / "merged_weekly.parquet"
+        with track("merge") as m:
+            merged.sort("country_id", "week").sink_parquet(target)
+            m.add(rows=pl.scan_parquet(target).select(pl.len()).collect().item())
+        logger.info(f"Wrote merged weekly data to {target}")
+
+        return target
+
+    def generate_weekly_summary(self, date: datetime, metrics: Dict) -> Dict:
+        """Summary record for a single week."""
+        return {
+            'date': date.strftime('%Y-%m-%d'),
+            'metrics': metrics
+        }
@@ -0,0 +1,61 @@
+"""Reference lookups for GDELT codes, applied as vectorised joins."""
+
+from functools import lru_cache
+from typing import Dict
+import polars as pl
+
+from .actors import ACTOR_TYPES
+from .countries import CAMEO_COUNTRIES
+from .events import describe_event
+from .locations import FIPS_COUNTRIES
+
+# (code column, added name column, lookup kind) for each translated column
+TRANSLATIONS = [
+    ("EventCode", "EventName", "events"),
+    ("EventBaseCode", "EventBaseName", "events"),
+    ("EventRootCode", "EventRootName", "events"),
+    ("Actor1CountryCode", "Actor1CountryName", "cameo_countries"),
+    ("Actor2CountryCode", "Actor2CountryName", "cameo_countries"),
+    ("Actor1Type1Code", "Actor1TypeName", "actor_types"),
+    ("Actor2Type1Code", "Actor2TypeName", "actor_types"),
+    ("ActionGeo_CountryCode", "ActionGeo_CountryName", "fips_countries"),
+]
+
+
+def _event_names() -> Dict[str, str]:
+    """Every 2-4 digit CAMEO code resolved through its fallback chain."""
+    roots = [f"{root:02d}" for root in range(1, 21)]
+    bases = [f"{root}{digit}" for root in roots for digit in range(10)]
+    codes = roots + bases + [f"{base}{digit}" for base in bases for digit in range(10)]
+    return {code: describe_event(code) for code in codes}
+
+
+@lru_cache(maxsize=None)
+def lookup_table(kind: str) -> pl.DataFrame:
+    """(code, name) table for one kind of code, names as categoricals."""
+    mapping = {
+        "events": _event_names,
+        "cameo_countries": lambda: CAMEO_COUNTRIES,
+        "actor_types": lambda: ACTOR_TYPES,
+        "fips_countries": lambda: FIPS_COUNTRIES,
+    }[kind]()
+
+    return pl.DataFrame(
+        {"code": list(mapping), "name": list(mapping.values())},
+        schema={"code": pl.Utf8, "name": pl.Categorical}
+    ).drop_nulls("name")
+
+
+def translate_codes(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Add a readable name column next to each known GDELT code column.
+
+    Each translation is a left join against a small precomputed lookup, so
+    there is no per-row Python. Unknown codes get a null name.
+    """
+    columns = lf.collect_schema().names()
+    for code_column, name_column, kind in TRANSLATIONS:
+        if code_column not in columns:
+            continue
+        lookup = lookup_table(kind).lazy().rename({"code": code_column, "name": name_column})
+        lf = lf.join(lookup, on=code_column, how="left", maintain_order="left")
+    return lf
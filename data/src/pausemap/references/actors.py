@@ -0,0 +1,47 @@
+"""CAMEO actor type codes."""
+
+ACTOR_TYPES = {
+    # State actors
+    "COP": "Police forces",
+    "GOV": "Government",
+    "INS": "Insurgents",
+    "JUD": "Judiciary",
+    "MIL": "Military",
+    "OPP": "Political opposition",
+    "REB": "Rebels",
+    "SEP": "Separatist rebels",
+    "SPY": "State intelligence",
+    "UAF": "Unaligned armed forces",
+    # Sectors
+    "AGR": "Agriculture",
+    "BUS": "Business",
+    "CRM": "Criminal",
+    "CVL": "Civilian",
+    "DEV": "Development",
+    "EDU": "Education",
+    "ELI": "Elites",
+    "ENV": "Environmental",
+    "HLH": "Health",
+    "HRI": "Human rights",
+    "LAB": "Labor",
+    "LEG": "Legislature",
+    "MED": "Media",
+    "MOD": "Moderate",
+    "RAD": "Radical",
+    "REF": "Refugees",
+    "SET": "Settlers",
+    # Named organisations
+    "AMN": "Amnesty International",
+    "GRP": "Greenpeace",
+    "IRC": "Red Cross",
+    "PKO": "Peacekeepers",
+    "UIS": "Unidentified state actor",
+    "UNO": "United Nations",
+    # International actors
+    "IGO": "Inter-governmental organization",
+    "IMG": "International militarized group",
+    "INT": "International or transnational",
+    "MNC": "Multinational corporation",
+    "NGM": "Non-governmental movement",
+    "NGO": "Non-governmental organization",
+}
@@ -0,0 +1,492 @@
+"""Country codes across the three sources.
+
+GDELT actors use CAMEO country codes (ISO3 with a few legacy exceptions),
+GDELT locations use FIPS 10-4, OWID uses ISO3 plus OWID_* aggregates and
+the World Bank reports both ISO2 and ISO3.
+"""
+
+# (iso3, iso2, fips, name)
+COUNTRIES = [
+    ("AFG", "AF", "AF", "Afghanistan"),
+    ("ALB", "AL", "AL", "Albania"),
+    ("DZA", "DZ", "AG", "Algeria"),
+    ("AND", "AD", "AN", "Andorra"),
+    ("AGO", "AO", "AO", "Angola"),
+    ("ATG", "AG", "AC", "Antigua and Barbuda"),
+    ("ARG", "AR", "AR", "Argentina"),
+    ("ARM", "AM", "AM", "Armenia"),
+    ("ABW", "AW", "AA", "Aruba"),
+    ("AUS", "AU", "AS", "Australia"),
+    ("AUT", "AT", "AU", "Austria"),
+    ("AZE", "AZ", "AJ", "Azerbaijan"),
+    ("BHS", "BS", "BF", "Bahamas"),
+    ("BHR", "BH", "BA", "Bahrain"),
+    ("BGD", "BD", "BG", "Bangladesh"),
+    ("BRB", "BB", "BB", "Barbados"),
+    ("BLR", "BY", "BO", "Belarus"),
+    ("BEL", "BE", "BE", "Belgium"),
+    ("BLZ", "BZ", "BH", "Belize"),
+    ("BEN", "BJ", "BN", "Benin"),
+    ("BMU", "BM", "BD", "Bermuda"),
+    ("BTN", "BT", "BT", "Bhutan"),
+    ("BOL", "BO", "BL", "Bolivia"),
+    ("BIH", "BA", "BK", "Bosnia and Herzegovina"),
+    ("BWA", "BW", "BC", "Botswana"),
+    ("BRA", "BR", "BR", "Brazil"),
+    ("BRN", "BN", "BX", "Brunei"),
+    ("BGR", "BG", "BU", "Bulgaria"),
+    ("BFA", "BF", "UV", "Burkina Faso"),
+    ("BDI", "BI", "BY", "Burundi"),
+    ("KHM", "KH", "CB", "Cambodia"),
+    ("CMR", "CM", "CM", "Cameroon"),
+    ("CAN", "CA", "CA", "Canada"),
+    ("CPV", "CV", "CV", "Cape Verde"),
+    ("CYM", "KY", "CJ", "Cayman Islands"),
+    ("CAF", "CF", "CT", "Central African Republic"),
+    ("TCD", "TD", "CD", "Chad"),
+    ("CHL", "CL", "CI", "Chile"),
+    ("CHN", "CN", "CH", "China"),
+    ("COL", "CO", "CO", "Colombia"),
+    ("COM", "KM", "CN", "Comoros"),
+    ("COG", "CG", "CF", "Congo"),
+    ("CRI", "CR", "CS", "Costa Rica"),
+    ("CIV", "CI", "IV", "Cote d'Ivoire"),
+    ("HRV", "HR", "HR", "Croatia"),
+    ("CUB", "CU", "CU", "Cuba"),
+    ("CUW", "CW", "UC", "Curacao"),
+    ("CYP", "CY", "CY", "Cyprus"),
+    ("CZE", "CZ", "EZ", "Czechia"),
+    ("COD", "CD", "CG", "Democratic Republic of Congo"),
+    ("DNK", "DK", "DA", "Denmark"),
+    ("DJI", "DJ", "DJ", "Djibouti"),
+    ("DMA", "DM", "DO", "Dominica"),
+    ("DOM", "DO", "DR", "Dominican Republic"),
+    ("ECU", "EC", "EC", "Ecuador"),
+    ("EGY", "EG", "EG", "Egypt"),
+    ("SLV", "SV", "ES", "El Salvador"),
+    ("GNQ", "GQ", "EK", "Equatorial Guinea"),
+    ("ERI", "ER", "ER", "Eritrea"),
+    ("EST", "EE", "EN", "Estonia"),
+    ("SWZ", "SZ", "WZ", "Eswatini"),
+    ("ETH", "ET", "ET", "Ethiopia"),
+    ("FRO", "FO", "FO", "Faroe Islands"),
+    ("FJI", "FJ", "FJ", "Fiji"),
+    ("FIN", "FI", "FI", "Finland"),
+    ("FRA", "FR", "FR", "France"),
+    ("PYF", "PF", "FP", "French Polynesia"),
+    ("GAB", "GA", "GB", "Gabon"),
+    ("GMB", "GM", "GA", "Gambia"),
+    ("GEO", "GE", "GG", "Georgia"),
+    ("DEU", "DE", "GM", "Germany"),
+    ("GHA", "GH", "GH", "Ghana"),
+    ("GIB", "GI", "GI", "Gibraltar"),
+    ("GRC", "GR", "GR", "Greece"),
+    ("GRL", "GL", "GL", "Greenland"),
+    ("GRD", "GD", "GJ", "Grenada"),
+    ("GUM", "GU", "GQ", "Guam"),
+    ("GTM", "GT", "GT", "Guatemala"),
+    ("GGY", "GG", "GK", "Guernsey"),
+    ("GIN", "GN", "GV", "Guinea"),
+    ("GNB", "GW", "PU", "Guinea-Bissau"),
+    ("GUY", "GY", "GY", "Guyana"),
+    ("HTI", "HT", "HA", "Haiti"),
+    ("HND", "HN", "HO", "Honduras"),
+    ("HKG", "HK", "HK", "Hong Kong"),
+    ("HUN", "HU", "HU", "Hungary"),
+    ("ISL", "IS", "IC", "Iceland"),
+    ("IND", "IN", "IN", "India"),
+    ("IDN", "ID", "ID", "Indonesia"),
+    ("IRN", "IR", "IR", "Iran"),
+    ("IRQ", "IQ", "IZ", "Iraq"),
+    ("IRL", "IE", "EI", "Ireland"),
+    ("IMN", "IM", "IM", "Isle of Man"),
+    ("ISR", "IL", "IS", "Israel"),
+    ("ITA", "IT", "IT", "Italy"),
+    ("JAM", "JM", "JM", "Jamaica"),
+    ("JPN", "JP", "JA", "Japan"),
+    ("JEY", "JE", "JE", "Jersey"),
+    ("JOR", "JO", "JO", "Jordan"),
+    ("KAZ", "KZ", "KZ", "Kazakhstan"),
+    ("KEN", "KE", "KE", "Kenya"),
+    ("KIR", "KI", "KR", "Kiribati"),
+    ("XKX", "XK", "KV", "Kosovo"),
+    ("KWT", "KW", "KU", "Kuwait"),
+    ("KGZ", "KG", "KG", "Kyrgyzstan"),
+    ("LAO", "LA", "LA", "Laos"),
+    ("LVA", "LV", "LG", "Latvia"),
+    ("LBN", "LB", "LE", "Lebanon"),
+    ("LSO", "LS", "LT", "Lesotho"),
+    ("LBR", "LR", "LI", "Liberia"),
+    ("LBY", "LY", "LY", "Libya"),
+    ("LIE", "LI", "LS", "Liechtenstein"),
+    ("LTU", "LT", "LH", "Lithuania"),
+    ("LUX", "LU", "LU", "Luxembourg"),
+    ("MAC", "MO", "MC", "Macao"),
+    ("MDG", "MG", "MA", "Madagascar"),
+    ("MWI", "MW", "MI", "Malawi"),
+    ("MYS", "MY", "MY", "Malaysia"),
+    ("MDV", "MV", "MV", "Maldives"),
+    ("MLI", "ML", "ML", "Mali"),
+    ("MLT", "MT", "MT", "Malta"),
+    ("MHL", "MH", "RM", "Marshall Islands"),
+    ("MRT", "MR", "MR", "Mauritania"),
+    ("MUS", "MU", "MP", "Mauritius"),
+    ("MEX", "MX", "MX", "Mexico"),
+    ("FSM", "FM", "FM", "Micronesia"),
+    ("MDA", "MD", "MD", "Moldova"),
+    ("MCO", "MC", "MN", "Monaco"),
+    ("MNG", "MN", "MG", "Mongolia"),
+    ("MNE", "ME", "MJ", "Montenegro"),
+    ("MAR", "MA", "MO", "Morocco"),
+    ("MOZ", "MZ", "MZ", "Mozambique"),
+    ("MMR", "MM", "BM", "Myanmar"),
+    ("NAM", "NA", "WA", "Namibia"),
+    ("NRU", "NR", "NR", "Nauru"),
+    ("NPL", "NP", "NP", "Nepal"),
+    ("NLD", "NL", "NL", "Netherlands"),
+    ("NCL", "NC", "NC", "New Caledonia"),
+    ("NZL", "NZ", "NZ", "New Zealand"),
+    ("NIC", "NI", "NU", "Nicaragua"),
+    ("NER", "NE", "NG", "Niger"),
+    ("NGA", "NG", "NI", "Nigeria"),
+    ("PRK", "KP", "KN", "North Korea"),
+    ("MKD", "MK", "MK", "North Macedonia"),
+    ("NOR", "NO", "NO", "Norway"),
+    ("OMN", "OM", "MU", "Oman"),
+    ("PAK", "PK", "PK", "Pakistan"),
+    ("PLW", "PW", "PS", "Palau"),
+    ("PSE", "PS", "WE", "Palestine"),
+    ("PAN", "PA", "PM", "Panama"),
+    ("PNG", "PG", "PP", "Papua New Guinea"),
+    ("PRY", "PY", "PA", "Paraguay"),
+    ("PER", "PE", "PE", "Peru"),
+    ("PHL", "PH", "RP", "Philippines"),
+    ("POL", "PL", "PL", "Poland"),
+    ("PRT", "PT", "PO", "Portugal"),
+    ("PRI", "PR", "RQ", "Puerto Rico"),
+    ("QAT", "QA", "QA", "Qatar"),
+    ("ROU", "RO", "RO", "Romania"),
+    ("RUS", "RU", "RS", "Russia"),
+    ("RWA", "RW", "RW", "Rwanda"),
+    ("KNA", "KN", "SC", "Saint Kitts and Nevis"),
+    ("LCA", "LC", "ST", "Saint Lucia"),
+    ("VCT", "VC", "VC", "Saint Vincent and the Grenadines"),
+    ("WSM", "WS", "WS", "Samoa"),
+    ("SMR", "SM", "SM", "San Marino"),
+    ("STP", "ST", "TP", "Sao Tome and Principe"),
+    ("SAU", "SA", "SA", "Saudi Arabia"),
+    ("SEN", "SN", "SG", "Senegal"),
+    ("SRB", "RS", "RI", "Serbia"),
+    ("SYC", "SC", "SE", "Seychelles"),
+    ("SLE", "SL", "SL", "Sierra Leone"),
+    ("SGP", "SG", "SN", "Singapore"),
+    ("SVK", "SK", "LO", "Slovakia"),
+    ("SVN", "SI", "SI", "Slovenia"),
+    ("SLB", "SB", "BP", "Solomon Islands"),
+    ("SOM", "SO", "SO", "Somalia"),
+    ("ZAF", "ZA", "SF", "South Africa"),
+    ("KOR", "KR", "KS", "South Korea"),
+    ("SSD", "SS", "OD", "South Sudan"),
+    ("ESP", "ES", "SP", "Spain"),
+    ("LKA", "LK", "CE", "Sri Lanka"),
+    ("SDN", "SD", "SU", "Sudan"),
+    ("SUR", "SR", "NS", "Suriname"),
+    ("SWE", "SE", "SW", "Sweden"),
+    ("CHE", "CH", "SZ", "Switzerland"),
+    ("SYR", "SY", "SY", "Syria"),
+    ("TWN", "TW", "TW", "Taiwan"),
+    ("TJK", "TJ", "TI", "Tajikistan"),
+    ("TZA", "TZ", "TZ", "Tanzania"),
+    ("THA", "TH", "TH", "Thailand"),
+    ("TLS", "TL", "TT", "Timor-Leste"),
+    ("TGO", "TG", "TO", "Togo"),
+    ("TON", "TO", "TN", "Tonga"),
+    ("TTO", "TT", "TD", "Trinidad and Tobago"),
+    ("TUN", "TN", "TS", "Tunisia"),
+    ("TUR", "TR", "TU", "Turkey"),
+    ("TKM", "TM", "TX", "Turkmenistan"),
+    ("TUV", "TV", "TV", "Tuvalu"),
+    ("UGA", "UG", "UG", "Uganda"),
+    ("UKR", "UA", "UP", "Ukraine"),
+    ("ARE", "AE", "AE", "United Arab Emirates"),
+    ("GBR", "GB", "UK", "United Kingdom"),
+    ("USA", "US", "US", "United States"),
+    ("URY", "UY", "UY", "Uruguay"),
+    ("UZB", "UZ", "UZ", "Uzbekistan"),
+    ("VUT", "VU", "NH", "Vanuatu"),
+    ("VAT", "VA", "VT", "Vatican"),
+    ("VEN", "VE", "VE", "Venezuela"),
+    ("VNM", "VN", "VM", "Vietnam"),
+    ("YEM", "YE", "YM", "Yemen"),
+    ("ZMB", "ZM", "ZA", "Zambia"),
+    ("ZWE", "ZW", "ZI", "Zimbabwe"),
+]
+
+# Permanent country_id of each ISO3 code (see pausemap.countries). Stored
+# partitions, rollups and exports hold these ids, so an id is never changed
+# or reused: a new country takes the next unused number.
+COUNTRY_IDS = {
+    "ABW": 0,
+    "AFG": 1,
+    "AGO": 2,
+    "ALB": 3,
+    "AND": 4,
+    "ARE": 5,
+    "ARG": 6,
+    "ARM": 7,
+    "ATG": 8,
+    "AUS": 9,
+    "AUT": 10,
+    "AZE": 11,
+    "BDI": 12,
+    "BEL": 13,
+    "BEN": 14,
+    "BFA": 15,
+    "BGD": 16,
+    "BGR": 17,
+    "BHR": 18,
+    "BHS": 19,
+    "BIH": 20,
+    "BLR": 21,
+    "BLZ": 22,
+    "BMU": 23,
+    "BOL": 24,
+    "BRA": 25,
+    "BRB": 26,
+    "BRN": 27,
+    "BTN": 28,
+    "BWA": 29,
+    "CAF": 30,
+    "CAN": 31,
+    "CHE": 32,
+    "CHL": 33,
+    "CHN": 34,
+    "CIV": 35,
+    "CMR": 36,
+    "COD": 37,
+    "COG": 38,
+    "COL": 39,
+    "COM": 40,
+    "CPV": 41,
+    "CRI": 42,
+    "CUB": 43,
+    "CUW": 44,
+    "CYM": 45,
+    "CYP": 46,
+    "CZE": 47,
+    "DEU": 48,
+    "DJI": 49,
+    "DMA": 50,
+    "DNK": 51,
+    "DOM": 52,
+    "DZA": 53,
+    "ECU": 54,
+    "EGY": 55,
+    "ERI": 56,
+    "ESP": 57,
+    "EST": 58,
+    "ETH": 59,
+    "FIN": 60,
+    "FJI": 61,
+    "FRA": 62,
+    "FRO": 63,
+    "FSM": 64,
+    "GAB": 65,
+    "GBR": 66,
+    "GEO": 67,
+    "GGY": 68,
+    "GHA": 69,
+    "GIB": 70,
+    "GIN": 71,
+    "GMB": 72,
+    "GNB": 73,
+    "GNQ": 74,
+    "GRC": 75,
+    "GRD": 76,
+    "GRL": 77,
+    "GTM": 78,
+    "GUM": 79,
+    "GUY": 80,
+    "HKG": 81,
+    "HND": 82,
+    "HRV": 83,
+    "HTI": 84,
+    "HUN": 85,
+    "IDN": 86,
+    "IMN": 87,
+    "IND": 88,
+    "IRL": 89,
+    "IRN": 90,
+    "IRQ": 91,
+    "ISL": 92,
+    "ISR": 93,
+    "ITA": 94,
+    "JAM": 95,
+    "JEY": 96,
+    "JOR": 97,
+    "JPN": 98,
+    "KAZ": 99,
+    "KEN": 100,
+    "KGZ": 101,
+    "KHM": 102,
+    "KIR": 103,
+    "KNA": 104,
+    "KOR": 105,
+    "KWT": 106,
+    "LAO": 107,
+    "LBN": 108,
+    "LBR": 109,
+    "LBY": 110,
+    "LCA": 111,
+    "LIE": 112,
+    "LKA": 113,
+    "LSO": 114,
+    "LTU": 115,
+    "LUX": 116,
+    "LVA": 117,
+    "MAC": 118,
+    "MAR": 119,
+    "MCO": 120,
+    "MDA": 121,
+    "MDG": 122,
+    "MDV": 123,
+    "MEX": 124,
+    "MHL": 125,
+    "MKD": 126,
+    "MLI": 127,
+    "MLT": 128,
+    "MMR": 129,
+    "MNE": 130,
+    "MNG": 131,
+    "MOZ": 132,
+    "MRT": 133,
+    "MUS": 134,
+    "MWI": 135,
+    "MYS": 136,
+    "NAM": 137,
+    "NCL": 138,
+    "NER": 139,
+    "NGA": 140,
+    "NIC": 141,
+    "NLD": 142,
+    "NOR": 143,
+    "NPL": 144,
+    "NRU": 145,
+    "NZL": 146,
+    "OMN": 147,
+    "PAK": 148,
+    "PAN": 149,
+    "PER": 150,
+    "PHL": 151,
+    "PLW": 152,
+    "PNG": 153,
+    "POL": 154,
+    "PRI": 155,
+    "PRK": 156,
+    "PRT": 157,
+    "PRY": 158,
+    "PSE": 159,
+    "PYF": 160,
+    "QAT": 161,
+    "ROU": 162,
+    "RUS": 163,
+    "RWA": 164,
+    "SAU": 165,
+    "SDN": 166,
+    "SEN": 167,
+    "SGP": 168,
+    "SLB": 169,
+    "SLE": 170,
+    "SLV": 171,
+    "SMR": 172,
+    "SOM": 173,
+    "SRB": 174,
+    "SSD": 175,
+    "STP": 176,
+    "SUR": 177,
+    "SVK": 178,
+    "SVN": 179,
+    "SWE": 180,
+    "SWZ": 181,
+    "SYC": 182,
+    "SYR": 183,
+    "TCD": 184,
+    "TGO": 185,
+    "THA": 186,
+    "TJK": 187,
+    "TKM": 188,
+    "TLS": 189,
+    "TON": 190,
+    "TTO": 191,
+    "TUN": 192,
+    "TUR": 193,
+    "TUV": 194,
+    "TWN": 195,
+    "TZA": 196,
+    "UGA": 197,
+    "UKR": 198,
+    "URY": 199,
+    "USA": 200,
+    "UZB": 201,
+    "VAT": 202,
+    "VCT": 203,
+    "VEN": 204,
+    "VNM": 205,
+    "VUT": 206,
+    "WSM": 207,
+    "XKX": 208,
+    "YEM": 209,
+    "ZAF": 210,
+    "ZMB": 211,
+    "ZWE": 212,
+}
+
+# CAMEO codes that differ from ISO3, mapped to the ISO3 they stand for
+CAMEO_ALIASES = {
+    "KSV": "XKX",
+    "ROM": "ROU",
+    "TMP": "TLS",
+    "ZAR": "COD",
+}
+
+# OWID's own codes for countries without an ISO3
+OWID_ALIASES = {
+    "OWID_KOS": "XKX",
+}
+
+# CAMEO regional actor codes
+CAMEO_REGIONS = {
+    "AFR": "Africa",
+    "ASA": "Asia",
+    "BLK": "Balkans",
+    "CAS": "Central Asia",
+    "CAU": "Caucasus",
+    "CEU": "Central Europe",
+    "CFR": "Central Africa",
+    "CRB": "Caribbean",
+    "EAF": "Eastern Africa",
+    "EEU": "Eastern Europe",
+    "EIN": "East Indies",
+    "EUR": "Europe",
+    "LAM": "Latin America",
+    "MDT": "Mediterranean",
+    "MEA": "Middle East",
+    "NAF": "North Africa",
+    "NMR": "North America",
+    "PGS": "Persian Gulf",
+    "SAF": "Southern Africa",
+    "SAM": "South America",
+    "SAS": "South Asia",
+    "SCN": "Scandinavia",
+    "SEA": "Southeast Asia",
+    "WAF": "West Africa",
+    "WST": "The West",
+}
+
+_NAMES = {iso3: name for iso3, _, _, name in COUNTRIES}
+
+CAMEO_COUNTRIES = {
+    **_NAMES,
+    **{alias: _NAMES[iso3] for alias, iso3 in CAMEO_ALIASES.items()},
+    **CAMEO_REGIONS,
+}
@@ -0,0 +1,13 @@
+"""FIPS 10-4 country codes used by GDELT geolocations."""
+
+from .countries import COUNTRIES
+
+# FIPS codes with no row of their own, mapped to the ISO3 they fall under
+FIPS_ALIASES = {
+    "GZ": "PSE",  # Gaza Strip
+}
+
+FIPS_COUNTRIES = {
+    **{fips: name for _, _, fips, name in COUNTRIES},
+    "GZ": "Gaza Strip",
+}
@@ -0,0 +1,136 @@
+"""Incremental weekly rollups of GDELT events."""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional
+import logging
+import polars as pl
+
+from .config import PROCESSED_DIR, START_DATE, END_DATE, ensure_dir
+from .dates import days, weeks, week_start
+from .metrics import track
+
+logger = logging.getLogger(__name__)
+
+# Grain of both the daily partials and the weekly rollups
+ROLLUP_KEYS = ["country_id", "event_root"]
+
+
+class WeeklyRollup:
+    """Weekly event counts, tone and Goldstein impact by country and CAMEO root.
+
+    Each processed GDELT day is reduced to a small partial aggregate holding
+    sums rather than means, so weeks can be rebuilt from seven partials
+    without touching the event partitions again. A partial is only rebuilt
+    when its day partition is newer, and a week only when one of its partials
+    is newer, so adding a day recomputes a single week. Countries are the
+    ActionGeo country_id from pausemap.countries.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.daily_dir = PROCESSED_DIR / "gdelt_daily"
+        self.weekly_dir = PROCESSED_DIR / "gdelt_weekly"
+
+    def aggregate_day(self, day: date) -> Optional[Path]:
+        """Build the partial aggregate for one processed day."""
+        partition = self.source.processed_dir / f"{day:%Y%m%d}.parquet"
+        target = self.daily_dir / f"{day:%Y%m%d}.parquet"
+
+        if not partition.exists():
+            return None
+        if target.exists() and target.stat().st_mtime >= partition.stat().st_mtime:
+            return target
+
+        with track("gdelt.aggregate") as m:
+            partial = (
+                self.source.scan(day, day, columns=[
+                    "ActionGeo_CountryId", "EventRootCode", "AvgTone", "GoldsteinScale"
+                ])
+                .group_by(
+                    country_id=pl.col("ActionGeo_CountryId"),
+                    event_root=pl.col("EventRootCode")
+                )
+                .agg(
+                    event_count=pl.len().cast(pl.Int64),
+                    tone_sum=pl.col("AvgTone").sum(),
+                    goldstein_sum=pl.col("GoldsteinScale").cast(pl.Float64).sum()
+                )
+                .with_columns(day=pl.lit(day))
+                .sort(ROLLUP_KEYS)
+                .collect()
+            )
+            ensure_dir(self.daily_dir)
+            partial.write_parquet(target)
+            m.add(rows=partial.height)
+
+        return target
+
+    def rollup_week(self, start: date) -> Optional[Path]:
+        """Rebuild a week from its daily partials if any of them changed."""
+        target = self.weekly_dir / f"{start:%G-W%V}.parquet"
+        partials = [
+            self.daily_dir / f"{start + timedelta(days=i):%Y%m%d}.parquet"
+            for i in range(7)
+        ]
+        partials = [p for p in partials if p.exists()]
+
+        if not partials:
+            return None
+        newest = max(p.stat().st_mtime for p in partials)
+        if target.exists() and target.stat().st_mtime >= newest:
+            return target
+
+        logger.info(f"Rolling up GDELT week {start:%G-W%V}")
+        with track("gdelt.rollup") as m:
+            weekly = (
+                pl.scan_parquet(partials)
+                .group_by(ROLLUP_KEYS)
+                .agg(
+                    pl.col("event_count", "tone_sum", "goldstein_sum").sum(),
+                    days=pl.col("day").n_unique().cast(pl.Int8)
+                )
+                .with_columns(week=pl.lit(start))
+                .select("week", *ROLLUP_KEYS, "event_count", "tone_sum", "goldstein_sum", "days")
+                .sort(ROLLUP_KEYS)
+                .collect()
+            )
+            ensure_dir(self.weekly_dir)
+            weekly.write_parquet(target)
+            m.add(rows=weekly.height)
+
+        return target
+
+    def update(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Path]:
+        """Refresh partials for start..end and every week they touch."""
+        start = start or START_DATE
+        end = end or END_DATE
+
+        for day in days(start, end):
+            self.aggregate_day(day)
+
+        return [path for path in map(self.rollup_week, weeks(start, end)) if path]
+
+    def scan(self, start: Optional[date] = None, end: Optional[date] = None) -> pl.LazyFrame:
+        """Lazily scan materialised weeks overlapping start..end."""
+        start = week_start(start or START_DATE)
+        end = end or END_DATE
+
+        paths = []
+        while start <= end:
+            path = self.weekly_dir / f"{start:%G-W%V}.parquet"
+            if path.exists():
+                paths.append(path)
+            start += timedelta(weeks=1)
+
+        if not paths:
+            return pl.LazyFrame(schema={
+                "week": pl.Date,
+                "country_id": pl.UInt16,
+                "event_root": pl.Utf8,
+                "event_count": pl.Int64,
+                "tone_sum": pl.Float64,
+                "goldstein_sum": pl.Float64,
+                "days": pl.Int8
+            })
+        return pl.scan_parquet(paths)
@@ -0,0 +1,280 @@
+"""Local HTTP query service for the map frontend.
+
+Answers the slices the site asks for while the user scrubs through time
+straight from the memory-mapped Arrow store (see `pausemap.store`), in the
+same columnar layout as the static export:
+
+    /weekly/index.json      weeks, dictionaries and metric scales
+    /weekly/YYYY-Www.json   every country in one week
+    /countries/ISO3.json    one country over every week
+
+Encoded responses are kept in an LRU cache with their gzip copy and an
+ETag, so a repeated slice costs a dictionary lookup and a revalidating
+client gets an empty 304. Requests are handled on a thread each; the
+tables are reloaded, and the cache emptied, when the store rewrites them.
+"""
+
+from collections import OrderedDict
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, NamedTuple, Optional
+import logging
+import os
+import re
+import threading
+
+import polars as pl
+
+from .config import SERVER_CACHE_SIZE, SERVER_HOST, SERVER_PORT
+from .countries import country_index
+from .export import WeeklyExport, compress, encode
+from .metrics import track
+
+logger = logging.getLogger(__name__)
+
+# Store tables the service reads
+TABLES = ("merged_weekly", "gdelt_weekly")
+
+_WEEK = re.compile(r"/weekly/(\d{4}-W\d{2})\.json")
+_COUNTRY = re.compile(r"/countries/([A-Z]{3})\.json")
+
+
+class Response(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+    # Versions of the tables it was built from, see Tables
+    version: tuple = ()
+
+
+class Tables(NamedTuple):
+    """One load of the store tables, split for lookups. Never modified, so
+    a request holding it sees a consistent set however the service reloads.
+    """
+    version: tuple
+    weeks: Dict
+    week_events: Dict
+    countries: Dict
+    country_events: Dict
+    empty_events: pl.DataFrame
+    ids: Dict[str, int]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of encoded responses by path."""
+
+    def __init__(self, maxsize: int = SERVER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Response]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Response]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: Response) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class QueryService:
+    """Week and country slices of the merged table and GDELT rollups.
+
+    Tables are split by week and by country once per load, so a slice is
+    a dictionary lookup plus encoding the few rows it holds.
+    """
+
+    def __init__(self, store, cache_size: int = SERVER_CACHE_SIZE, export: Optional[WeeklyExport] = None):
+        self.store = store
+        self.cache = ResponseCache(cache_size)
+        self.export = export or WeeklyExport(encodings=[])
+        self._lock = threading.Lock()
+        self.tables = self._load()
+
+    def _versions(self) -> tuple:
+        return tuple(os.stat(self.store.path(name)).st_mtime_ns for name in TABLES)
+
+    def _load(self) -> Tables:
+        for name in TABLES:
+            self.store.refresh(name)
+        # Read before loading, so a rewrite during the load is noticed
+        version = self._versions()
+        merged = self.store.load("merged_weekly").filter(pl.col("country_id").is_not_null())
+        events = (
+            self.store.load("gdelt_weekly")
+            .filter(pl.col("country_id").is_not_null())
+            .select("week", "country_id", "event_root", "event_count")
+        )
+        tables = Tables(
+            version=version,
+            weeks={
+                f"{week:%G-W%V}": (week, rows)
+                for (week,), rows in sorted(merged.partition_by("week", as_dict=True).items())
+            },
+            week_events=events.partition_by("week", as_dict=True),
+            countries=merged.partition_by("country_id", as_dict=True),
+            country_events=events.partition_by("country_id", as_dict=True),
+            empty_events=events.clear(),
+            ids=dict(country_index().select("iso3", "country_id").rows())
+        )
+        logger.info(f"Serving {len(tables.weeks)} weeks of {merged.height} rows")
+        return tables
+
+    def refresh(self) -> Tables:
+        """The current tables, reloaded if the store rewrote them."""
+        if self._versions() != self.tables.version:
+            with self._lock:
+                if self._versions() != self.tables.version:
+                    # Swapped in one assignment, so requests see old or new
+                    self.tables = self._load()
+                    self.cache.clear()
+        return self.tables
+
+    def query(self, path: str, tables: Optional[Tables] = None) -> Optional[Dict]:
+        """The payload for a path, None if there is no such slice."""
+        tables = tables or self.tables
+        if path == "/weekly/index.json":
+            return self.export.index_payload([
+                {"week": week.isoformat(), "file": f"{name}.json"}
+                for name, (week, _) in tables.weeks.items()
+            ])
+        match = _WEEK.fullmatch(path)
+        if match and match.group(1) in tables.weeks:
+            week, rows = tables.weeks[match.group(1)]
+            events = tables.week_events.get((week,), tables.empty_events)
+            return self.export.week_payload(week, rows, events.drop("week"))
+        match = _COUNTRY.fullmatch(path)
+        if match and tables.ids.get(match.group(1)) is not None:
+            key = (tables.ids[match.group(1)],)
+            if key in tables.countries:
+                events = tables.country_events.get(key, tables.empty_events)
+                return self.export.country_payload(match.group(1), tables.countries[key], events)
+        return None
+
+    def get(self, path: str) -> Optional[Response]:
+        """The encoded response for a path, from the cache when possible.
+
+        Cached responses are only used if built from the current tables,
+        so one encoded by a request that overlapped a reload isn't served.
+        """
+        tables = self.refresh()
+        with track("serve.query") as m:
+            response = self.cache.get(path)
+            if response is not None and response.version != tables.version:
+                response = None
+            m.add(rows=1, cache_hit=response is not None)
+            if response is None:
+                payload = self.query(path, tables)
+                if payload is None:
+                    return None
+                body = encode(payload)
+                response = Response(
+                    body, compress(body, "gzip"), f'"{sha1(body).hexdigest()[:20]}"', tables.version
+                )
+                self.cache.put(path, response)
+            m.add(bytes=len(response.body))
+        return response
+
+
+def accepts_gzip(header: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip."""
+    for part in (header or "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            name, _, q = params.partition("=")
+            try:
+                return name.strip() != "q" or float(q) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def matches(header: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names etag (weak comparison)."""
+    tags = [tag.strip() for tag in (header or "").split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def make_server(service: QueryService, host: str = SERVER_HOST, port: int = SERVER_PORT) -> ThreadingHTTPServer:
+    """An HTTP server answering GET and HEAD requests from service."""
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so a scrubbing client reuses one connection, without
+        # Nagle's algorithm holding the body back until the headers are
+        # acknowledged (a delayed ACK adds 40 ms to every response)
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.respond(head=False)
+
+        def do_HEAD(self):
+            self.respond(head=True)
+
+        def respond(self, head: bool):
+            response = service.get(self.path.split("?", 1)[0])
+            if response is None:
+                self.send_error(404)
+                return
+
+            gzipped = accepts_gzip(self.headers.get("Accept-Encoding"))
+            etag = response.etag[:-1] + '-gz"' if gzipped else response.etag
+            if matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                self.send_headers(etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            body = response.gzipped if gzipped else response.body
+            self.send_response(200)
+            self.send_headers(etag)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def send_headers(self, etag: str):
+            self.send_header("ETag", etag)
+            # Cached by the browser, but revalidated on every use
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Access-Control-Allow-Origin", "*")
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        # Room for a browser's parallel connections and then some
+        request_queue_size = 64
+
+    return Server((host, port), Handler)
+
+
+def serve(service: QueryService, host: str = SERVER_HOST, port: int = SERVER_PORT) -> None:
+    """Serve until interrupted."""
+    server = make_server(service, host, port)
+    logger.info(f"Query service listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,5 +1,21 @@
-from .gdelt import GDELTSource
-from .owid import OWIDSource
-from .worldbank import WorldBankSource
+"""Data sources, imported on first use.
 
-__all__ = ['GDELTSource', 'OWIDSource', 'WorldBankSource']
\ No newline at end of file
+Each source pulls in its own heavy dependencies, so importing the package
+(or one source) doesn't pay for the others.
+"""
+
+from importlib import import_module
+
+_SOURCES = {
+    'GDELTSource': '.gdelt',
+    'OWIDSource': '.owid',
+    'WorldBankSource': '.worldbank',
+}
+
+__all__ = list(_SOURCES)
+
+
+def __getattr__(name):
+    if name not in _SOURCES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_SOURCES[name], __name__), name)
@@ -1,68 +1,503 @@
 """GDELT data handler with event codes and parsing."""
 
-import requests
+import os
+import queue
+import shutil
+import threading
 import zipfile
-import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import get_context
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Optional, List
 import logging
-from tqdm import tqdm
+import json
+import polars as pl
 
-from ..config import RAW_DIR, DATA_DIR, GDELT_URL, START_DATE, END_DATE
+from ..config import (
+    RAW_DIR, PROCESSED_DIR, DATA_DIR, GDELT_URL, GDELT_WORKERS, GDELT_PROCESSES, GDELT_QUEUE_SIZE,
+    CHUNK_SIZE, START_DATE, END_DATE, ensure_dir
+)
+from ..countries import attach_country_id
+from ..dates import days as date_range
+from ..http import make_session
+from ..metrics import track
+from ..references import translate_codes
+from ..rollup import WeeklyRollup
 
 logger = logging.getLogger(__name__)
 
+# Rows used for the structure sample
+SAMPLE_ROWS = 1000
+
+
+def _geo_fields(prefix: str) -> dict:
+    return {
+        f"{prefix}_Type": pl.Int8,
+        f"{prefix}_FullName": pl.Utf8,
+        f"{prefix}_CountryCode": pl.Utf8,
+        f"{prefix}_ADM1Code": pl.Utf8,
+        f"{prefix}_Lat": pl.Float64,
+        f"{prefix}_Long": pl.Float64,
+        f"{prefix}_FeatureID": pl.Utf8,
+    }
+
+
+def _actor_fields(prefix: str) -> dict:
+    return {
+        f"{prefix}Code": pl.Utf8,
+        f"{prefix}Name": pl.Utf8,
+        f"{prefix}CountryCode": pl.Utf8,
+        f"{prefix}KnownGroupCode": pl.Utf8,
+        f"{prefix}EthnicCode": pl.Utf8,
+        f"{prefix}Religion1Code": pl.Utf8,
+        f"{prefix}Religion2Code": pl.Utf8,
+        f"{prefix}Type1Code": pl.Utf8,
+        f"{prefix}Type2Code": pl.Utf8,
+        f"{prefix}Type3Code": pl.Utf8,
+    }
+
+
+# The 58 columns of a GDELT 1.0 daily export, in file order
+EVENT_FIELDS = {
+    "GLOBALEVENTID": pl.Int64,
+    "SQLDATE": pl.Date,
+    "MonthYear": pl.Int32,
+    "Year": pl.Int16,
+    "FractionDate": pl.Float64,
+    **_actor_fields("Actor1"),
+    **_actor_fields("Actor2"),
+    "IsRootEvent": pl.Boolean,
+    # CAMEO codes keep their leading zeros as strings
+    "EventCode": pl.Utf8,
+    "EventBaseCode": pl.Utf8,
+    "EventRootCode": pl.Utf8,
+    "QuadClass": pl.Int8,
+    "GoldsteinScale": pl.Float32,
+    "NumMentions": pl.Int32,
+    "NumSources": pl.Int32,
+    "NumArticles": pl.Int32,
+    "AvgTone": pl.Float64,
+    **_geo_fields("Actor1Geo"),
+    **_geo_fields("Actor2Geo"),
+    **_geo_fields("ActionGeo"),
+    "DATEADDED": pl.Date,
+    "SOURCEURL": pl.Utf8,
+}
+
+# Integer country keys added at ingest (see pausemap.countries)
+PARTITION_FIELDS = {
+    **EVENT_FIELDS,
+    "Actor1CountryId": pl.UInt16,
+    "Actor2CountryId": pl.UInt16,
+    "ActionGeo_CountryId": pl.UInt16,
+}
+
+# Dates arrive as YYYYMMDD and flags as 0/1, so read those raw and cast after
+_CSV_FIELDS = {
+    name: {pl.Date: pl.Utf8, pl.Boolean: pl.Int8}.get(dtype, dtype)
+    for name, dtype in EVENT_FIELDS.items()
+}
+
+def parse_day(csv_path: Path, processed_dir: Path) -> Path:
+    """Convert one export CSV to a typed, zstd Parquet partition.
+    
+    Module level so it can run in a worker process. Skips days whose
+    partition is newer than the CSV.
+    """
+    target = ensure_dir(processed_dir) / f"{csv_path.name[:8]}.parquet"
+    
+    if target.exists() and target.stat().st_mtime >= csv_path.stat().st_mtime:
+        return target
+        
+    part = target.with_name(target.name + ".part")
+    events = pl.scan_csv(
+        csv_path,
+        separator="\t",
+        has_header=False,
+        schema=_CSV_FIELDS,
+        quote_char=None
+    ).with_columns(
+        pl.col("SQLDATE", "DATEADDED").str.to_date("%Y%m%d"),
+        pl.col("IsRootEvent").cast(pl.Boolean)
+    )
+    events = attach_country_id(events, "Actor1CountryCode", "cameo", "Actor1CountryId")
+    events = attach_country_id(events, "Actor2CountryCode", "cameo", "Actor2CountryId")
+    events = attach_country_id(events, "ActionGeo_CountryCode", "fips", "ActionGeo_CountryId")
+    events.sink_parquet(part, compression="zstd")
+    part.replace(target)
+    
+    return target
+
+def partition_rows(path: Path) -> int:
+    """Row count of a Parquet partition, read from its footer."""
+    return pl.scan_parquet(path).select(pl.len()).collect().item()
+
 class GDELTSource:
-    def __init__(self):
+    def __init__(
+        self,
+        workers: int = GDELT_WORKERS,
+        processes: int = GDELT_PROCESSES,
+        start: date = START_DATE,
+        end: date = END_DATE
+    ):
         self.raw_dir = RAW_DIR / "gdelt"
-        self.raw_dir.mkdir(parents=True, exist_ok=True)
+        self.processed_dir = PROCESSED_DIR / "gdelt"
+        self.workers = max(1, workers)
+        self.processes = max(1, processes)
+        self.start = start
+        self.end = end
+        self._pool = None
+        # Days parsed at once by ingest_day, one per worker process
+        self._parsing = threading.Semaphore(self.processes)
+        
+        # One pooled session shared by all fetch threads
+        self.session = make_session(self.workers)
             
     def fetch_day(self, target_date=None) -> Optional[Path]:
         """Fetch a single day's GDELT export"""
         if target_date is None:
-            target_date = START_DATE
+            target_date = self.start
             
         date_str = target_date.strftime("%Y%m%d")
         url = GDELT_URL.format(date=date_str)
-        zip_path = self.raw_dir / f"{date_str}.export.CSV.zip"
+        zip_path = ensure_dir(self.raw_dir) / f"{date_str}.export.CSV.zip"
         csv_path = self.raw_dir / f"{date_str}.export.CSV"
         
-        if csv_path.exists():
-            return csv_path
-            
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            with open(zip_path, "wb") as f:
-                f.write(response.content)
+        with track("gdelt.fetch") as m:
+            if csv_path.exists():
+                m.add(cache_hit=True)
+                return csv_path
+            m.add(cache_hit=False)
                 
-            with zipfile.ZipFile(zip_path) as zf:
-                zf.extractall(self.raw_dir)
-                
-            zip_path.unlink()
-            return csv_path
+            # Write to .part files and rename when complete, so an interrupted
+            # download never looks like a cached day
+            zip_part = zip_path.with_name(zip_path.name + ".part")
+            csv_part = csv_path.with_name(csv_path.name + ".part")
             
-        except Exception as e:
-            logger.error(f"Failed to fetch {date_str}: {e}")
-            return None
+            try:
+                with self.session.get(url, stream=True) as response:
+                    response.raise_for_status()
+                    with open(zip_part, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+                            m.add(bytes=len(chunk))
+                zip_part.replace(zip_path)
+                    
+                # Inflate the export member chunk by chunk rather than extractall
+                with zipfile.ZipFile(zip_path) as zf:
+                    with zf.open(zf.namelist()[0]) as src, open(csv_part, "wb") as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                csv_part.replace(csv_path)
+                    
+                zip_path.unlink()
+                return csv_path
+                
+            except Exception as e:
+                logger.error(f"Failed to fetch {date_str}: {e}")
+                m.errors += 1
+                for partial in (zip_part, csv_part, zip_path):
+                    partial.unlink(missing_ok=True)
+                return None
     
-    def fetch_range(self) -> List[Path]:
-        """Fetch all GDELT exports between START_DATE and END_DATE."""
-        current = START_DATE
-        days = (END_DATE - START_DATE).days + 1
-        
-        csvs = []
-        with tqdm(total=days, desc="Fetching GDELT data") as pbar:
-            while current <= END_DATE:
-                csv = self.fetch_day(current)
-                if csv:
-                    csvs.append(csv)
-                current += timedelta(days=1)
-                pbar.update(1)
+    def fetch_range(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Path]:
+        """Fetch all GDELT exports between start and end (the source's window).
+        
+        Days are fetched concurrently on `self.workers` threads; the
+        returned CSV paths are always in date order.
+        """
+        days = date_range(start or self.start, end or self.end)
+        
+        from tqdm import tqdm
+        
+        results = {}
+        with tqdm(total=len(days), desc="Fetching GDELT data") as pbar:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(self.fetch_day, day): day for day in days}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    pbar.update(1)
+                    
+        return [results[day] for day in days if results[day]]
+
+    def process_day(self, csv_path: Path) -> Path:
+        """Convert a day's export CSV to a typed Parquet partition.
+        
+        Inside process_pool() the work is done by a worker process.
+        """
+        with track("gdelt.parse") as m:
+            if self._pool is not None:
+                target = self._pool.submit(parse_day, csv_path, self.processed_dir).result()
+            else:
+                target = parse_day(csv_path, self.processed_dir)
+            m.add(rows=partition_rows(target), bytes=csv_path.stat().st_size)
+        return target
+        
+    @contextmanager
+    def process_pool(self, processes: Optional[int] = None):
+        """Parse days on `processes` worker processes while open.
+        
+        Workers are spawned rather than forked (polars' thread pool does not
+        survive a fork) and each gets an equal share of the cores for its
+        own polars threads. Yields None when processes is 1.
+        """
+        processes = processes or self.processes
+        if processes <= 1:
+            yield None
+            return
+            
+        previous = os.environ.get("POLARS_MAX_THREADS")
+        os.environ["POLARS_MAX_THREADS"] = str(max(1, (os.cpu_count() or 1) // processes))
+        try:
+            with ProcessPoolExecutor(processes, mp_context=get_context("spawn")) as pool:
+                self._pool = pool
+                yield pool
+        finally:
+            self._pool = None
+            if previous is None:
+                os.environ.pop("POLARS_MAX_THREADS", None)
+            else:
+                os.environ["POLARS_MAX_THREADS"] = previous
+        
+    def process_range(self, csvs: List[Path], processes: Optional[int] = None) -> List[Path]:
+        """Convert fetched export CSVs to Parquet partitions, in order.
+        
+        With more than one process, days are fanned out over a process pool
+        with at most two days queued per worker, so memory stays bounded
+        however long the range. Each day is written independently, so the
+        output is the same as a serial run.
+        """
+        from tqdm import tqdm
+        
+        processes = processes or self.processes
+        with self.process_pool(processes) as pool, \
+                tqdm(total=len(csvs), desc="Converting GDELT data") as pbar:
+            if pool is None:
+                partitions = []
+                for csv in csvs:
+                    partitions.append(self.process_day(csv))
+                    pbar.update(1)
+                return partitions
                 
-        return csvs
+            # Workers can't report back, so time the whole fan-out here
+            with track("gdelt.parse") as m:
+                partitions, in_flight = [], deque()
+                for csv in csvs:
+                    if len(in_flight) >= 2 * processes:
+                        partitions.append(in_flight.popleft().result())
+                        pbar.update(1)
+                    in_flight.append(pool.submit(parse_day, csv, self.processed_dir))
+                while in_flight:
+                    partitions.append(in_flight.popleft().result())
+                    pbar.update(1)
+                m.add(
+                    rows=sum(map(partition_rows, partitions)),
+                    bytes=sum(csv.stat().st_size for csv in csvs)
+                )
+            return partitions
+
+    def discarded(self, day: date) -> Optional[Path]:
+        """A day's partition if it was parsed and its raw CSV since deleted."""
+        partition = self.processed_dir / f"{day:%Y%m%d}.parquet"
+        if partition.exists() and not (self.raw_dir / f"{day:%Y%m%d}.export.CSV").exists():
+            return partition
+        return None
+
+    def ingest_day(self, day: date, keep_raw: bool = True) -> Optional[Path]:
+        """Fetch and parse one day, returning its partition (None on failure).
+
+        Called from several threads, this overlaps downloads with parsing
+        the way fetch_and_process does: while some threads parse, at most
+        `processes` at a time, the rest download their next day. Days whose
+        CSV was discarded after parsing are not fetched again, and without
+        `keep_raw` the CSV is deleted once parsed.
+        """
+        partition = self.discarded(day)
+        if partition is not None:
+            return partition
+        csv = self.fetch_day(day)
+        if csv is None:
+            return None
+        with self._parsing:
+            partition = self.process_day(csv)
+        if not keep_raw:
+            csv.unlink(missing_ok=True)
+        return partition
+
+    def fetch_and_process(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        processes: Optional[int] = None,
+        queue_size: int = GDELT_QUEUE_SIZE,
+        keep_raw: bool = True
+    ) -> List[Path]:
+        """Fetch and parse start..end with downloads and parsing overlapped.
+
+        Fetch threads hand each downloaded day to the parsers through a
+        queue instead of waiting for the whole range, so a backfill takes
+        about as long as the slower of the two rather than their sum. At
+        most `queue_size` days are downloaded but not yet parsed at a time:
+        fetchers wait for a free slot before starting a day, which caps the
+        raw files on disk and the parse backlog. Without `keep_raw`, each
+        CSV is deleted once parsed and days that already have a partition
+        are not fetched again. Returns partitions in date order.
+        """
+        from tqdm import tqdm
+
+        days = date_range(start or self.start, end or self.end)
+        processes = processes or self.processes
+
+        results = {}
+        if not keep_raw:
+            for day in days:
+                partition = self.discarded(day)
+                if partition is not None:
+                    results[day] = partition
+            days = [day for day in days if day not in results]
+
+        slots = threading.Semaphore(max(1, queue_size))
+        fetched = queue.Queue()
+        stopping = threading.Event()
+
+        def fetch(day: date) -> None:
+            slots.acquire()
+            csv = None
+            try:
+                if not stopping.is_set():
+                    csv = self.fetch_day(day)
+            finally:
+                fetched.put((day, csv))
+
+        def parsed(csv: Path, ok: bool) -> None:
+            # Frees the day's slot, and its raw file unless parsing failed
+            if ok and not keep_raw:
+                csv.unlink(missing_ok=True)
+            slots.release()
+
+        with self.process_pool(processes) as pool, \
+                ThreadPoolExecutor(max_workers=self.workers) as fetchers, \
+                tqdm(total=len(days), desc="Fetching and converting GDELT data") as pbar:
+            for day in days:
+                fetchers.submit(fetch, day)
+            try:
+                if pool is None:
+                    for _ in days:
+                        day, csv = fetched.get()
+                        if csv is None:
+                            slots.release()
+                        else:
+                            ok = False
+                            try:
+                                results[day] = self.process_day(csv)
+                                ok = True
+                            finally:
+                                parsed(csv, ok)
+                        pbar.update(1)
+                else:
+                    # Workers can't report back, so time the whole fan-out here
+                    with track("gdelt.parse") as m:
+                        in_flight = {}
+                        for _ in days:
+                            day, csv = fetched.get()
+                            if csv is None:
+                                slots.release()
+                                pbar.update(1)
+                                continue
+                            m.add(bytes=csv.stat().st_size)
+                            future = pool.submit(parse_day, csv, self.processed_dir)
+                            future.add_done_callback(
+                                lambda f, csv=csv: (parsed(csv, f.exception() is None), pbar.update(1))
+                            )
+                            in_flight[day] = future
+                        for day, future in in_flight.items():
+                            results[day] = future.result()
+                        m.add(rows=sum(partition_rows(results[day]) for day in in_flight))
+            finally:
+                # Let any fetchers still waiting for a slot through, so the
+                # pools can shut down if parsing failed part way
+                stopping.set()
+                for _ in days:
+                    slots.release()
+
+        return [results[day] for day in sorted(results)]
+
+    def scan(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[List[str]] = None,
+        countries: Optional[List[str]] = None,
+        event_roots: Optional[List[str]] = None,
+        translate: bool = False
+    ) -> pl.LazyFrame:
+        """Lazily scan processed GDELT days between start and end.
+        
+        Only partitions inside the window are opened, only `columns` are
+        decoded, and the country (ActionGeo) and CAMEO root code filters
+        are pushed down into the Parquet reader. With `translate`, readable
+        names are joined on for the selected code columns.
+        """
+        start = start or self.start
+        end = end or self.end
+        
+        paths = [
+            self.processed_dir / f"{start + timedelta(days=i):%Y%m%d}.parquet"
+            for i in range((end - start).days + 1)
+        ]
+        paths = [p for p in paths if p.exists()]
+        
+        if not paths:
+            lf = pl.LazyFrame(schema=PARTITION_FIELDS)
+        else:
+            lf = pl.scan_parquet(paths)
+            
+        lf = lf.filter(pl.col("DATEADDED").is_between(start, end))
+        if countries:
+            lf = lf.filter(pl.col("ActionGeo_CountryCode").is_in(countries))
+        if event_roots:
+            lf = lf.filter(pl.col("EventRootCode").is_in(event_roots))
+        if columns:
+            lf = lf.select(columns)
+        if translate:
+            lf = translate_codes(lf)
+            
+        return lf
+
+    def get_weekly_data(self, start_date, end_date) -> pl.DataFrame:
+        """Weekly event count, Goldstein impact and tone across all countries.
+        
+        Dates may be `date` objects or ISO strings. Events repeated across
+        days are counted once (see pausemap.dedup). Rollups are refreshed
+        incrementally, so only weeks with new or changed days are recomputed.
+        """
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+            
+        from ..dedup import Deduplicator
+        
+        dedup = Deduplicator(self)
+        dedup.update(start_date, end_date)
+        rollup = WeeklyRollup(dedup.view())
+        rollup.update(start_date, end_date)
+        
+        return (
+            rollup.scan(start_date, end_date)
+            .group_by("week")
+            .agg(pl.col("event_count", "goldstein_sum", "tone_sum").sum())
+            .select(
+                "week",
+                "event_count",
+                impact=pl.col("goldstein_sum") / pl.col("event_count"),
+                tone=pl.col("tone_sum") / pl.col("event_count")
+            )
+            .sort("week")
+            .collect()
+        )
 
     def get_sample(self) -> None:
         """Get sample of GDELT data structure."""
@@ -70,52 +505,54 @@ class GDELTSource:
         if not raw_file:
             logger.error("Failed to get sample data")
             return
+        self.process_day(raw_file)
         
-        df = pl.read_csv(
-            raw_file,
-            separator="\t",
-            has_header=False,
-            n_rows=1000
-        )
+        from ..dedup import Deduplicator
         
-        event_counts = df["column_26"].value_counts()
-        event_codes = {
-            str(row['column_26']): int(row['count']) 
-            for row in event_counts.to_dicts()
-        }
+        # Repeats of earlier reports would skew the code counts
+        dedup = Deduplicator(self)
+        dedup.dedup_day(self.start)
+        sample_lf = dedup.view().scan(self.start, self.start).head(SAMPLE_ROWS)
         
-        country_counts = df["column_7"].value_counts()
-        countries = {
-            str(row['column_7']): int(row['count']) 
-            for row in country_counts.to_dicts()
-        }
+        def counts(column: str) -> dict:
+            df = sample_lf.group_by(column).len().sort("len", descending=True).collect()
+            return {str(code): int(n) for code, n in df.iter_rows()}
+        
+        tone = sample_lf.select(
+            count=pl.len(),
+            mean=pl.col("AvgTone").mean(),
+            std=pl.col("AvgTone").std()
+        ).collect().row(0, named=True)
         
         sample = {
             "metadata": {
                 "date": raw_file.stem[:8],
-                "total_columns": len(df.columns),
-                "sample_size": 1000
+                "total_columns": len(PARTITION_FIELDS),
+                "sample_size": SAMPLE_ROWS
             },
             "columns": {},
             "stats": {
-                "event_codes": event_codes,
-                "countries": countries,
+                "event_codes": counts("EventCode"),
+                "countries": counts("Actor1CountryCode"),
                 "tone": {
-                    "count": int(len(df)),
-                    "mean": float(df["column_34"].mean()),
-                    "std": float(df["column_34"].std())
+                    "count": int(tone["count"]),
+                    "mean": float(tone["mean"]),
+                    "std": float(tone["std"])
                 }
             }
         }
         
-        for i, col in enumerate(df.columns):
-            values = df[col].drop_nulls().head(3).to_list()
+        preview = sample_lf.collect()
+        for col in preview.columns:
+            values = preview[col].drop_nulls().head(3).to_list()
             if values:
-                sample["columns"][f"col_{i}"] = [str(v) for v in values]
+                sample["columns"][col] = [str(v) for v in values]
         
         samples_dir = DATA_DIR / "samples"
         samples_dir.mkdir(parents=True, exist_ok=True)
         
         output_path = samples_dir / "gdelt_sample.json"
         with open(output_path, "w") as f:
-            json.dump(sample, f, indent=2)
\ No newline at end of file
+            json.dump(sample, f, indent=2)
+            
+        logger.info(f"GDELT sample saved to {output_path}")
@@ -1,13 +1,16 @@
 """OWID Covid data handler."""
 
-from typing import Dict
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import polars as pl
 from pathlib import Path
-import requests
 import logging
 import json
 
-from ..config import RAW_DIR, DATA_DIR, OWID_URL, START_DATE, END_DATE
+from ..config import RAW_DIR, DATA_DIR, OWID_URL, CHUNK_SIZE, START_DATE, END_DATE, ensure_dir
+from ..countries import attach_country_id
+from ..metrics import track
+from ..http import make_session, fetch_cached
 
 logger = logging.getLogger(__name__)
 
@@ -85,84 +88,153 @@ METRIC_FIELDS = {
     "weekly_icu_admissions_per_million": pl.Float64
 }
 
+def iter_json_object(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Yield the (key, value) pairs of a top-level JSON object one at a time.
+    
+    The file is read in chunks and each value is decoded on its own, so only
+    one country's subtree is ever held in memory.
+    """
+    decoder = json.JSONDecoder()
+    
+    with open(path, encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+        
+        def refill() -> None:
+            nonlocal buf, pos, eof
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            
+        def skip(chars: str) -> str:
+            """Skip over chars and return the next significant character."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if eof:
+                    raise ValueError(f"Unexpected end of JSON in {path}")
+                refill()
+                
+        def decode() -> Any:
+            nonlocal pos
+            while True:
+                try:
+                    value, pos = decoder.raw_decode(buf, pos)
+                    return value
+                except json.JSONDecodeError:
+                    # Most likely the value straddles the chunk boundary
+                    if eof:
+                        raise
+                    refill()
+        
+        if skip(" \t\r\n") != "{":
+            raise ValueError(f"{path} does not contain a JSON object")
+        pos += 1
+        
+        while skip(" \t\r\n,") != "}":
+            key = decode()
+            if skip(" \t\r\n") != ":":
+                raise ValueError(f"Expected ':' after {key!r} in {path}")
+            pos += 1
+            skip(" \t\r\n")
+            yield key, decode()
+
 class OWIDSource:
-    def __init__(self):
+    def __init__(self, start: date = START_DATE, end: date = END_DATE):
         self.raw_dir = RAW_DIR / "owid"
-        self.raw_dir.mkdir(parents=True, exist_ok=True)
+        self.session = make_session()
+        self.start = start
+        self.end = end
             
     def fetch_data(self) -> Path:
-        """Get OWID dataset."""
+        """Get OWID dataset, revalidating the cached copy once it is stale."""
         target = self.raw_dir / "owid_covid.json"
+        return fetch_cached(self.session, OWID_URL, target, stage="owid.fetch")
         
-        if target.exists():
-            logger.info("Using cached OWID data")
-            return target
-            
-        logger.info("Fetching fresh OWID data")
-        response = requests.get(OWID_URL)
-        response.raise_for_status()
+    def process_data(
+        self,
+        input_path: Path,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        countries: Optional[List[str]] = None,
+        metrics: Optional[List[str]] = None
+    ) -> Dict[str, pl.DataFrame]:
+        """Convert JSON to DataFrames with consistent schema.
         
-        with open(target, "wb") as f:
-            f.write(response.content)
-            
-        return target
+        Countries are streamed from the file one at a time and their daily
+        records go straight into typed column frames, so neither the whole
+        JSON tree nor per-row dicts are ever materialised. The date window,
+        country allowlist and metric subset (from METRIC_FIELDS) are applied
+        before any frame is built.
+        """
+        if metrics is not None:
+            unknown = set(metrics) - set(METRIC_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown OWID metrics: {sorted(unknown)}")
+        wanted = set(countries) if countries is not None else None
+        first, last = (start or self.start).isoformat(), (end or self.end).isoformat()
         
-    def process_data(self, input_path: Path) -> Dict[str, pl.DataFrame]:
-        """Convert JSON to DataFrames with consistent schema."""
-        with open(input_path) as f:
-            data = json.load(f)
-            
-        # Extract country metadata
-        metadata_records = []
-        for country, details in data.items():
-            record = {"country_code": country}
-            for field in METADATA_FIELDS:
-                record[field] = details.get(field)
-            metadata_records.append(record)
-            
-        metadata_df = pl.DataFrame(
-            metadata_records,
-            schema={
-                "country_code": pl.Utf8,
-                **METADATA_FIELDS
-            }
-        )
-        
-        # Process daily metrics
-        metric_records = []
-        for country, details in data.items():
-            if details.get("data"):
-                for day in details["data"]:
-                    record = {"country_code": country}
-                    # Keep date as string for now
-                    record["date"] = day["date"]
-                    # Add all other metrics (will be null if not present)
-                    for field in METRIC_FIELDS:
-                        if field != "date":  # Skip date as we handled it
-                            record[field] = day.get(field)
-                    metric_records.append(record)
-        
-        # Create DataFrame and convert date after
-        metrics_df = pl.DataFrame(
-            metric_records,
-            schema={
-                "country_code": pl.Utf8,
+        with track("owid.parse") as m:
+            metadata_records = []
+            metric_frames = []
+            metric_schema = {
                 "date": pl.Utf8,
-                **{k:v for k,v in METRIC_FIELDS.items() if k != "date"}
+                **{
+                    k: v for k, v in METRIC_FIELDS.items()
+                    if k != "date" and (metrics is None or k in metrics)
+                }
             }
-        ).with_columns([
-            pl.col("date").str.strptime(pl.Date, "%Y-%m-%d")
-        ])
         
-        # Filter to our date range
-        metrics_df = metrics_df.filter(
-            (pl.col("date") >= START_DATE) &
-            (pl.col("date") <= END_DATE)
-        )
+            for country, details in iter_json_object(input_path):
+                if wanted is not None and country not in wanted:
+                    continue
+                
+                # Extract country metadata
+                record = {"country_code": country}
+                for field in METADATA_FIELDS:
+                    record[field] = details.get(field)
+                metadata_records.append(record)
+            
+                # Process daily metrics, ISO dates compare correctly as strings
+                days = [
+                    day for day in details.get("data") or []
+                    if first <= day["date"] <= last
+                ]
+                if days:
+                    metric_frames.append(
+                        pl.DataFrame(days, schema=metric_schema)
+                        .select(pl.lit(country).alias("country_code"), pl.all())
+                    )
+            
+            metadata_df = pl.DataFrame(
+                metadata_records,
+                schema={
+                    "country_code": pl.Utf8,
+                    **METADATA_FIELDS
+                }
+            )
+        
+            # Convert date once all countries are in
+            metrics_df = pl.concat(
+                metric_frames or [pl.DataFrame(schema={"country_code": pl.Utf8, **metric_schema})]
+            ).with_columns([
+                pl.col("date").str.strptime(pl.Date, "%Y-%m-%d")
+            ])
+        
+            # Integer country keys for cross-source joins
+            metadata_df = attach_country_id(metadata_df.lazy(), "country_code", "owid").collect()
+            metrics_df = attach_country_id(metrics_df.lazy(), "country_code", "owid").collect()
         
-        # Save both dataframes
-        metadata_df.write_parquet(self.raw_dir / "metadata.parquet")
-        metrics_df.write_parquet(self.raw_dir / "metrics.parquet")
+            # Save both dataframes
+            ensure_dir(self.raw_dir)
+            metadata_df.write_parquet(self.raw_dir / "metadata.parquet")
+            metrics_df.write_parquet(self.raw_dir / "metrics.parquet")
+            m.add(rows=metrics_df.height, bytes=input_path.stat().st_size)
         
         return {
             "metadata": metadata_df,
@@ -172,22 +244,26 @@ class OWIDSource:
     def get_sample(self) -> None:
         """Get sample of OWID data structure."""
         raw_file = self.fetch_data()
-        with open(raw_file) as f:
-            data = json.load(f)
-            
-        # Get first proper country (not OWID_* aggregate)
-        sample_country = next(k for k, v in data.items() 
-                            if not k.startswith("OWID_"))
-        country_data = data[sample_country]
+        
+        # Stream through once, keeping only the first proper country
+        # (not OWID_* aggregate) and the key counts
+        country_data = None
+        total_countries = 0
+        total_regions = 0
+        for code, details in iter_json_object(raw_file):
+            if code.startswith("OWID_"):
+                total_regions += 1
+                continue
+            total_countries += 1
+            if country_data is None:
+                country_data = details
         
         # Build sample
         sample = {
             "metadata": {
-                "date_range": [START_DATE.isoformat(), END_DATE.isoformat()],
-                "total_countries": len([k for k in data.keys() 
-                                     if not k.startswith("OWID_")]),
-                "total_regions": len([k for k in data.keys() 
-                                   if k.startswith("OWID_")])
+                "date_range": [self.start.isoformat(), self.end.isoformat()],
+                "total_countries": total_countries,
+                "total_regions": total_regions
             },
             "country_metadata": {
                 field: type(country_data.get(field)).__name__
@@ -1,23 +1,79 @@
 """World Bank data handler for economic impacts."""
 
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Tuple
 import polars as pl
 from pathlib import Path
-import requests
 import logging
 import json
-from datetime import datetime
+from datetime import date
 
-from ..config import RAW_DIR, DATA_DIR, WORLDBANK_URL, START_DATE, END_DATE
+from ..config import (
+    RAW_DIR, PROCESSED_DIR, DATA_DIR, WORLDBANK_URL, WORLDBANK_WORKERS, START_DATE, END_DATE,
+    ensure_dir
+)
+from ..countries import attach_country_id
+from ..metrics import track
+from ..http import make_session, fetch_cached, is_fresh, write_if_changed
 
 logger = logging.getLogger(__name__)
 
+# Long-format schema of the normalised indicator table
+INDICATOR_FIELDS = {
+    "country": pl.Categorical,       # ISO3, null for unlabelled aggregates
+    "country_iso2": pl.Categorical,  # World Bank country id
+    "country_id": pl.UInt16,         # see pausemap.countries
+    "indicator": pl.Categorical,
+    "year": pl.Int16,
+    "value": pl.Float64
+}
+
+# Fields read from each raw indicator API row. Spelled out because the
+# API's values mix ints, floats and nulls, which inference from the first
+# rows would truncate or reject.
+_ENTITY = pl.Struct({"id": pl.Utf8, "value": pl.Utf8})
+RAW_INDICATOR_FIELDS = {
+    "countryiso3code": pl.Utf8,
+    "country": _ENTITY,
+    "indicator": _ENTITY,
+    "date": pl.Utf8,
+    "value": pl.Float64
+}
+
+def normalise_indicators(rows: List[Dict]) -> pl.DataFrame:
+    """Flatten raw indicator API rows into the INDICATOR_FIELDS layout."""
+    if not rows:
+        return pl.DataFrame(schema=INDICATOR_FIELDS)
+        
+    flat = pl.LazyFrame(rows, schema=RAW_INDICATOR_FIELDS).select(
+        country=pl.col("countryiso3code").replace("", None),
+        country_iso2=pl.col("country").struct.field("id"),
+        indicator=pl.col("indicator").struct.field("id"),
+        year=pl.col("date"),
+        value=pl.col("value")
+    )
+    return (
+        attach_country_id(flat, "country", "iso3")
+        .select(list(INDICATOR_FIELDS))
+        .cast(INDICATOR_FIELDS)
+        .collect()
+    )
+
 class WorldBankSource:
     """Handles World Bank data related to COVID impact."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        workers: int = WORLDBANK_WORKERS,
+        start: date = START_DATE,
+        end: date = END_DATE
+    ):
         self.raw_dir = RAW_DIR / "worldbank"
-        self.raw_dir.mkdir(parents=True, exist_ok=True)
+        self.processed_dir = PROCESSED_DIR / "worldbank"
+        self.workers = max(1, workers)
+        self.session = make_session(self.workers)
+        self.start = start
+        self.end = end
         
         # Key metrics to track
         self.indicators = {
@@ -29,14 +85,14 @@ class WorldBankSource:
         # Base URL for indicators API
         self.indicators_url = "https://api.worldbank.org/v2/country/all/indicator"
             
+    def category_path(self, category: str) -> Path:
+        """Cached raw indicator rows for one category."""
+        return self.raw_dir / f"wb_{category}_{self.start.isoformat()}.json"
+        
     def fetch_documents(self, target_date: str) -> Path:
         """Get relevant World Bank reports for date."""
         target = self.raw_dir / f"wb_docs_{target_date}.json"
         
-        if target.exists():
-            logger.info(f"Using cached WB docs for {target_date}")
-            return target
-            
         # Parameters for document search
         params = {
             "format": "json",
@@ -52,82 +108,149 @@ class WorldBankSource:
             "rows": 1000
         }
         
-        logger.info(f"Fetching WB docs for {target_date}")
-        response = requests.get(WORLDBANK_URL, params=params)
-        response.raise_for_status()
-        
-        with open(target, "wb") as f:
-            f.write(response.content)
+        return fetch_cached(
+            self.session, WORLDBANK_URL, target, params=params, stage="worldbank.documents"
+        )
+
+    def _fetch_page(self, indicator: str, page: int) -> Tuple[int, List[Dict]]:
+        """Fetch one page of an indicator, returning (total pages, rows)."""
+        params = {
+            "format": "json",
+            "date": f"{self.start.year}:{self.end.year}",
+            "per_page": 1000,  # Max out the page size
+            "page": page
+        }
+        with track("worldbank.fetch") as m:
+            response = self.session.get(f"{self.indicators_url}/{indicator}", params=params)
+            response.raise_for_status()
+            data = response.json()
             
-        return target
+            # First element is metadata, second is data
+            if len(data) < 2:
+                return 0, []
+            m.add(rows=len(data[1] or []), bytes=len(response.content), cache_hit=False)
+            return data[0]["pages"], data[1] or []
+
+    def _fetch_all(self, indicators: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch every page of several indicators over one worker pool.
+        
+        First pages all go out together; as soon as one reports its page
+        count the remaining pages are queued on the same pool. Indicators
+        with a failed page are logged and left out of the result.
+        """
+        pages = {}
+        failed = set()
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._fetch_page, code, 1): (code, 1) for code in indicators}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    code, page = pending.pop(future)
+                    try:
+                        total, rows = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching {code} page {page}: {e}")
+                        failed.add(code)
+                        continue
+                    pages[(code, page)] = rows
+                    if page == 1:
+                        for later in range(2, total + 1):
+                            pending[pool.submit(self._fetch_page, code, later)] = (code, later)
+                            
+        # Reassemble in page order so output doesn't depend on timing
+        results = {code: [] for code in indicators if code not in failed}
+        for code, page in sorted(pages):
+            if code in results:
+                results[code].extend(pages[(code, page)])
+        return results
 
     def _fetch_indicator(self, indicator: str) -> List[Dict]:
         """Fetch data for a single indicator."""
-        url = f"{self.indicators_url}/{indicator}"
-        
-        results = []
-        page = 1
-        per_page = 1000  # Max out the page size
-        
-        while True:
-            params = {
-                "format": "json",
-                "date": f"{START_DATE.year}:{END_DATE.year}",
-                "per_page": per_page,
-                "page": page
-            }
-            
-            try:
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                # First element is metadata, second is data
-                if len(data) < 2:
-                    break
-                    
-                results.extend(data[1])
-                
-                # Check if we've got all pages
-                if page >= data[0]['pages']:
-                    break
-                    
-                page += 1
-                
-            except Exception as e:
-                logger.error(f"Error fetching {indicator}: {e}")
-                break
-                
-        return results
+        return self._fetch_all([indicator]).get(indicator, [])
 
     def fetch_indicators(self) -> Path:
         """Get World Bank indicators."""
         
         logger.info("Fetching World Bank indicators")
         
-        # Fetch each category of indicators
+        stale = {}
         for category, codes in self.indicators.items():
-            target = self.raw_dir / f"wb_{category}_{START_DATE.isoformat()}.json"
+            target = self.category_path(category)
             
-            if target.exists():
+            if is_fresh(target):
                 logger.info(f"Using cached WB {category} data")
+                with track("worldbank.fetch") as m:
+                    m.add(cache_hit=True)
+                continue
+            stale[category] = (target, codes)
+            
+        # Fetch all stale categories' indicators concurrently
+        fetched = self._fetch_all([code for _, codes in stale.values() for code in codes])
+        
+        for category, (target, codes) in stale.items():
+            if any(code not in fetched for code in codes):
+                logger.error(f"Keeping previous WB {category} data after failed fetch")
                 continue
                 
-            # Get data for each indicator in category
-            results = []
-            for code in codes:
-                data = self._fetch_indicator(code)
-                results.extend(data)
+            results = [row for code in codes for row in fetched[code]]
                 
-            with open(target, "w") as f:
-                json.dump(results, f)
+            # Pages are assembled locally so there is no ETag to revalidate
+            # against; skip the rewrite when the content hasn't changed
+            if not write_if_changed(target, json.dumps(results).encode(), codes=codes):
+                logger.info(f"WB {category} data unchanged")
                 
+        self.process_indicators()
         return self.raw_dir
         
+    def process_indicators(self) -> Path:
+        """Normalise the cached category files into one typed Parquet table.
+        
+        Each category is flattened and appended as its own row group, so
+        only one category's rows are in memory at a time. The table is only
+        rebuilt when a category file is newer than it.
+        """
+        import pyarrow.parquet as pq
+        
+        target = self.processed_dir / "indicators.parquet"
+        sources = [self.category_path(category) for category in self.indicators]
+        sources = [p for p in sources if p.exists()]
+        
+        if target.exists() and all(
+            p.stat().st_mtime <= target.stat().st_mtime for p in sources
+        ):
+            with track("worldbank.parse") as m:
+                m.add(cache_hit=True)
+            return target
+            
+        with track("worldbank.parse") as m:
+            ensure_dir(self.processed_dir)
+            m.add(cache_hit=False)
+            part = target.with_name(target.name + ".part")
+            writer = None
+            try:
+                for path in sources:
+                    with open(path) as f:
+                        table = normalise_indicators(json.load(f)).to_arrow()
+                    if writer is None:
+                        writer = pq.ParquetWriter(part, table.schema, compression="zstd")
+                    writer.write_table(table)
+                    m.add(rows=table.num_rows, bytes=path.stat().st_size)
+            finally:
+                if writer is not None:
+                    writer.close()
+                
+            if writer is None:
+                pl.DataFrame(schema=INDICATOR_FIELDS).write_parquet(part)
+            part.replace(target)
+        logger.info(f"Wrote World Bank indicators to {target}")
+        
+        return target
+        
     def get_sample(self) -> None:
         """Get sample of World Bank data structure."""
         # Get sample docs and indicators
-        docs_file = self.fetch_documents(START_DATE.isoformat())
+        docs_file = self.fetch_documents(self.start.isoformat())
         indicators_dir = self.fetch_indicators()
         
         # Build sample from first few results
@@ -136,7 +259,7 @@ class WorldBankSource:
             
         sample = {
             "metadata": {
-                "date": START_DATE.isoformat(),
+                "date": self.start.isoformat(),
                 "total_documents": len(docs.get("documents", [])),
                 "total_indicators": len(self.indicators)
             },
@@ -0,0 +1,201 @@
+"""Memory-mapped Arrow IPC copies of the analytical tables.
+
+Analysis scripts and exports otherwise rebuild their frames from Parquet
+(and the JSON behind it) on every run. The store keeps each table as an
+uncompressed Arrow IPC file that `load` memory-maps: numeric and date
+columns are used straight from the mapped pages, so processes loading the
+same table share one copy in the page cache. Only string and categorical
+columns are copied, into polars' own string layout. Each file has a JSON
+sidecar with the fingerprint of the processed files it is read from, and
+is rebuilt on load when that changes.
+
+    store = build_store()
+    merged = store.load("merged_weekly")
+"""
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Union
+import hashlib
+import json
+import logging
+import polars as pl
+
+from .config import PROCESSED_DIR, START_DATE, END_DATE, ensure_dir
+from .metrics import track
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+
+def fingerprint(paths: Iterable[Path]) -> str:
+    """Cheap fingerprint of a set of files from their names, sizes and mtimes.
+
+    Every stage either rewrites a file or leaves it untouched, so a changed
+    size or mtime is enough to tell that an input was rebuilt.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        if path.exists():
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        else:
+            digest.update(f"{path}:missing\n".encode())
+    return digest.hexdigest()
+
+
+class Table:
+    """A stored table.
+
+    build() returns the frame to store, sources() the files it is read
+    from, whose fingerprint decides when it is rebuilt.
+    The table is only built once `requires` (the processed file it is read
+    from) exists.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[], Frame],
+        sources: Callable[[], Iterable[Path]],
+        requires: Optional[Path] = None
+    ):
+        self.name = name
+        self.build = build
+        self.sources = sources
+        self.requires = requires
+
+
+class ArrowStore:
+    """Arrow IPC files of a set of tables under `processed/arrow/`."""
+
+    def __init__(self, tables: List[Table], store_dir: Optional[Path] = None):
+        self.tables = {table.name: table for table in tables}
+        self.store_dir = store_dir or PROCESSED_DIR / "arrow"
+
+    def path(self, name: str) -> Path:
+        return self.store_dir / f"{name}.arrow"
+
+    def _meta(self, name: str) -> Path:
+        return self.store_dir / f"{name}.json"
+
+    def is_fresh(self, name: str) -> bool:
+        """Whether a table's file was built from its current sources."""
+        path, meta = self.path(name), self._meta(name)
+        if not path.exists() or not meta.exists():
+            return False
+        with open(meta) as f:
+            return json.load(f)["fingerprint"] == fingerprint(self.tables[name].sources())
+
+    def refresh(self, name: str, force: bool = False) -> Path:
+        """Rebuild a table's file if its sources changed."""
+        table = self.tables[name]
+        target = self.path(name)
+        if not force and self.is_fresh(name):
+            return target
+
+        # Fingerprint before building, so sources changing mid-build are
+        # picked up by the next refresh
+        state = fingerprint(table.sources())
+        logger.info(f"Writing Arrow table {name}")
+        with track("store.write") as m:
+            frame = table.build()
+            part = ensure_dir(self.store_dir) / (target.name + ".part")
+            # Uncompressed, so columns can be mapped straight from the file,
+            # and in the oldest layout (large strings rather than string
+            # views), which every supported pyarrow can read
+            options = dict(compression="uncompressed", compat_level=pl.CompatLevel.oldest())
+            if isinstance(frame, pl.LazyFrame):
+                frame.sink_ipc(part, **options)
+            else:
+                frame.write_ipc(part, **options)
+            # A reader that has the old file mapped keeps it until it's done
+            part.replace(target)
+            m.add(
+                rows=pl.scan_ipc(target).select(pl.len()).collect().item(),
+                bytes=target.stat().st_size
+            )
+
+        meta = self._meta(name)
+        meta_part = meta.with_name(meta.name + ".part")
+        with open(meta_part, "w") as f:
+            json.dump({
+                "fingerprint": state,
+                "written_at": datetime.now(timezone.utc).isoformat()
+            }, f, indent=2)
+        meta_part.replace(meta)
+        return target
+
+    def refresh_all(self, force: bool = False) -> List[Path]:
+        """Refresh every table whose processed input exists."""
+        written = []
+        for name, table in self.tables.items():
+            if table.requires is not None and not table.requires.exists():
+                logger.info(f"Skipping Arrow table {name}, {table.requires} doesn't exist")
+                continue
+            written.append(self.refresh(name, force))
+        return written
+
+    def load(self, name: str) -> pl.DataFrame:
+        """Memory-map a table, refreshing it first if it is stale.
+
+        Numeric columns point into the mapped file rather than being
+        copied, so only the pages actually read are loaded; string columns
+        are converted to polars' layout as they are loaded.
+        """
+        import pyarrow as pa
+
+        path = self.refresh(name)
+        with track("store.load") as m:
+            with pa.memory_map(str(path)) as source:
+                table = pa.ipc.open_file(source).read_all()
+            frame = pl.from_arrow(table, rechunk=False)
+            m.add(rows=frame.height, bytes=path.stat().st_size)
+        return frame
+
+
+def build_store(start: date = START_DATE, end: date = END_DATE) -> ArrowStore:
+    """The merged country x week table and the per-source tables behind it.
+
+    Each table is keyed on the processed files it is copied from. Those
+    are rebuilt from the raw downloads by the pipeline, so the copy is
+    refreshed once they are, rather than re-copying a stale file when
+    only a raw input changed.
+    """
+    from .dedup import Deduplicator
+    from .rollup import WeeklyRollup
+    from .sources.gdelt import GDELTSource
+    from .sources.owid import OWIDSource
+    from .sources.worldbank import WorldBankSource
+
+    gdelt = GDELTSource(start=start, end=end)
+    owid = OWIDSource(start=start, end=end)
+    worldbank = WorldBankSource(start=start, end=end)
+    rollup = WeeklyRollup(Deduplicator(gdelt).view())
+
+    owid_metrics = owid.raw_dir / "metrics.parquet"
+    wb_indicators = worldbank.processed_dir / "indicators.parquet"
+    merged = PROCESSED_DIR / "merged_weekly.parquet"
+
+    def weekly_rollups() -> List[Path]:
+        return sorted(rollup.weekly_dir.glob("*.parquet"))
+
+    return ArrowStore([
+        Table(
+            "merged_weekly", lambda: pl.scan_parquet(merged),
+            sources=lambda: [merged],
+            requires=merged
+        ),
+        Table("gdelt_weekly", lambda: rollup.scan(start, end), sources=weekly_rollups),
+        Table(
+            "owid_metrics", lambda: pl.scan_parquet(owid_metrics),
+            sources=lambda: [owid_metrics],
+            requires=owid_metrics
+        ),
+        Table(
+            "worldbank_indicators", lambda: pl.scan_parquet(wb_indicators),
+            sources=lambda: [wb_indicators],
+            requires=wb_indicators
+        ),
+    ])
@@ -0,0 +1,141 @@
+"""Weekly event density tiles from GDELT ActionGeo coordinates."""
+
+from datetime import date, timedelta
+from math import pi
+from pathlib import Path
+from typing import List, Optional
+import logging
+import polars as pl
+
+from .config import OUTPUTS_DIR, PROCESSED_DIR, START_DATE, END_DATE, TILE_ZOOMS, ensure_dir
+from .export import WeeklyExport, encode, quantise
+from .dates import weeks
+from .metrics import track
+
+logger = logging.getLogger(__name__)
+
+# Web Mercator stops at ~85.05 degrees; points beyond are clamped onto the edge
+MAX_LATITUDE = 85.0511287798
+
+TILE_FIELDS = {
+    "zoom": pl.UInt8,
+    "x": pl.UInt32,
+    "y": pl.UInt32,
+    "event_count": pl.Int64,
+    "tone_sum": pl.Float64,
+    "tone": pl.Float64,
+}
+
+
+def tile_xy(zoom: int, lat: str = "ActionGeo_Lat", long: str = "ActionGeo_Long") -> List[pl.Expr]:
+    """Slippy map (x, y) tile of each point at zoom, as expressions.
+
+    The same scheme as OpenStreetMap and web map libraries, so a tile's
+    x/y/zoom can be used directly as a map tile address.
+    """
+    n = 2 ** zoom
+    lat_rad = pl.col(lat).clip(-MAX_LATITUDE, MAX_LATITUDE).radians()
+    x = ((pl.col(long) + 180) / 360 * n).floor()
+    y = ((1 - (lat_rad.tan() + 1 / lat_rad.cos()).log() / pi) / 2 * n).floor()
+    # Longitude 180 and the clamped poles land one past the last tile
+    return [
+        x.clip(0, n - 1).cast(pl.UInt32).alias("x"),
+        y.clip(0, n - 1).cast(pl.UInt32).alias("y"),
+    ]
+
+
+class TilePyramid:
+    """Event counts and mean tone per map tile, per week, at TILE_ZOOMS.
+
+    Points are binned with vectorised expressions over the week's processed
+    GDELT partitions, one group_by per zoom level. Weeks are materialised
+    in `processed/gdelt_tiles/z<zooms>/`, a directory per zoom set so tiles
+    binned at other zooms are never reused, and only rebuilt when one of
+    their day partitions is newer. Tone is kept as a sum alongside the mean so tiles
+    can be merged further (e.g. into coarser zooms or longer periods).
+    """
+
+    def __init__(self, source, zooms=TILE_ZOOMS):
+        self.source = source
+        self.zooms = sorted(set(zooms))
+        self.tiles_dir = PROCESSED_DIR / "gdelt_tiles" / ("z" + "-".join(map(str, self.zooms)))
+
+    def bin_points(self, points: pl.LazyFrame) -> pl.LazyFrame:
+        """Aggregate (lat, long, tone) points into tiles at every zoom."""
+        points = points.filter(
+            pl.col("ActionGeo_Lat").is_not_null() & pl.col("ActionGeo_Long").is_not_null()
+        )
+        levels = [
+            points
+            .group_by(*tile_xy(zoom))
+            .agg(
+                event_count=pl.len().cast(pl.Int64),
+                tone_sum=pl.col("AvgTone").sum()
+            )
+            .with_columns(zoom=pl.lit(zoom, dtype=pl.UInt8))
+            for zoom in self.zooms
+        ]
+        return (
+            pl.concat(levels)
+            .with_columns(tone=pl.col("tone_sum") / pl.col("event_count"))
+            .select(list(TILE_FIELDS))
+            .sort("zoom", "y", "x")
+        )
+
+    def build_week(self, start: date) -> Optional[Path]:
+        """Rebuild a week's tiles if any of its day partitions changed."""
+        target = self.tiles_dir / f"{start:%G-W%V}.parquet"
+        end = start + timedelta(days=6)
+        partitions = [
+            self.source.processed_dir / f"{start + timedelta(days=i):%Y%m%d}.parquet"
+            for i in range(7)
+        ]
+        partitions = [p for p in partitions if p.exists()]
+
+        if not partitions:
+            return None
+        newest = max(p.stat().st_mtime for p in partitions)
+        if target.exists() and target.stat().st_mtime >= newest:
+            return target
+
+        logger.info(f"Binning GDELT tiles for week {start:%G-W%V}")
+        with track("gdelt.tiles") as m:
+            points = self.source.scan(start, end, columns=[
+                "ActionGeo_Lat", "ActionGeo_Long", "AvgTone"
+            ])
+            tiles = self.bin_points(points).collect()
+            ensure_dir(self.tiles_dir)
+            tiles.write_parquet(target)
+            m.add(rows=tiles.height)
+
+        return target
+
+    def update(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Path]:
+        """Refresh tiles for every week touching start..end."""
+        mondays = weeks(start or START_DATE, end or END_DATE)
+        return [path for path in map(self.build_week, mondays) if path]
+
+    def export(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Path]:
+        """Write one frontend payload per week and zoom to outputs/tiles/.
+
+        Payloads are columnar like the weekly export: tile x, y, event
+        count and tone quantised to hundredths.
+        """
+        export = WeeklyExport(OUTPUTS_DIR / "tiles")
+        written = []
+        for path in self.update(start, end):
+            tiles = pl.read_parquet(path)
+            for (zoom,), level in tiles.partition_by("zoom", as_dict=True).items():
+                payload = {
+                    "week": path.stem,
+                    "zoom": zoom,
+                    "x": level["x"].to_list(),
+                    "y": level["y"].to_list(),
+                    "count": level["event_count"].to_list(),
+                    "tone": level.select(quantise("tone", 2))["tone"].to_list(),
+                }
+                name = f"{path.stem}-z{zoom}.json"
+                export.write(name, encode(payload))
+                written.append(export.output_dir / name)
+
+        return written
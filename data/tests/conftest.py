@@ -1,7 +1,31 @@
+import sys
 import pytest
 import polars as pl
 from datetime import datetime, timedelta
 
+@pytest.fixture(autouse=True)
+def storage(tmp_path_factory, monkeypatch):
+    """Point every loaded pausemap module's storage directories at a temp dir.
+
+    Modules bind the directories from config at import, so each module's
+    own copy is patched as well as config's.
+    """
+    data_dir = tmp_path_factory.mktemp('storage')
+    dirs = {
+        'DATA_DIR': data_dir,
+        'RAW_DIR': data_dir / 'raw',
+        'PROCESSED_DIR': data_dir / 'processed',
+        'OUTPUTS_DIR': data_dir / 'outputs',
+        'METRICS_DIR': data_dir / 'metrics',
+    }
+    import pausemap.config
+    for name, module in list(sys.modules.items()):
+        if name == 'pausemap' or name.startswith('pausemap.'):
+            for attr, path in dirs.items():
+                if hasattr(module, attr):
+                    monkeypatch.setattr(module, attr, path)
+    return data_dir
+
 @pytest.fixture
 def sample_gdelt_data():
     dates = [datetime(2020, 1, 1) + timedelta(weeks=i) for i in range(52)]
@@ -28,4 +52,32 @@ def sample_worldbank_data():
         'date': ['2020', '2020', '2021', '2021'],
         'country': ['GB', 'US', 'GB', 'US'],
         'value': [-9.3, -3.4, 7.5, 5.9]
-    })
\ No newline at end of file
+    })
+
+def gdelt_row(event_id, day='20200401', event_code='043', country='US',
+              tone=-2.5, goldstein=2.8, lat=38.0, long=-97.0, url='http://example.com/a'):
+    """One tab-separated line in the GDELT 1.0 export layout."""
+    actor1 = ['USA', 'UNITED STATES', 'USA'] + [''] * 7
+    actor2 = ['CHNGOV', 'CHINA', 'CHN'] + [''] * 4 + ['GOV', '', '']
+    geo = ['1', 'Somewhere', country, f'{country}01', str(lat), str(long), '-1']
+    fields = (
+        [str(event_id), day, day[:6], day[:4], f'{day[:4]}.2493']
+        + actor1 + actor2
+        + ['1', event_code, event_code[:3], event_code[:2], '1',
+           str(goldstein), '10', '1', '10', str(tone)]
+        + geo + geo + geo
+        + [day, url]
+    )
+    return '\t'.join(fields)
+
+@pytest.fixture
+def gdelt_export(tmp_path):
+    """Write a small export CSV for a day and return its path."""
+    def write(day='20200401', rows=None):
+        raw_dir = tmp_path / 'raw'
+        raw_dir.mkdir(exist_ok=True)
+        rows = rows or [gdelt_row(i, day) for i in range(10)]
+        path = raw_dir / f'{day}.export.CSV'
+        path.write_text('\n'.join(rows) + '\n')
+        return path
+    return write
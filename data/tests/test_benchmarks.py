@@ -0,0 +1,101 @@
+import zipfile
+from datetime import date
+
+import polars as pl
+import requests
+
+from benchmarks.generate import gdelt_day, worldbank_rows, write_gdelt, write_owid
+from benchmarks.run import compare, differences, machine
+from benchmarks.standin import StandIn
+from pausemap.dedup import Deduplicator
+from pausemap.sources.gdelt import EVENT_FIELDS, PARTITION_FIELDS, GDELTSource, parse_day
+from pausemap.sources.owid import OWIDSource
+from pausemap.sources.worldbank import normalise_indicators
+
+def test_gdelt_day_is_seeded():
+    day = date(2020, 4, 1)
+    assert gdelt_day(day, 50, seed=1).equals(gdelt_day(day, 50, seed=1))
+    assert not gdelt_day(day, 50, seed=1).equals(gdelt_day(day, 50, seed=2))
+
+def test_generated_gdelt_parses(tmp_path):
+    [path] = write_gdelt(tmp_path / 'inputs', date(2020, 4, 1), date(2020, 4, 1), rows=200)
+    with zipfile.ZipFile(path) as zf:
+        csv = tmp_path / zf.namelist()[0]
+        csv.write_bytes(zf.read(csv.name))
+
+    assert len(csv.read_text().splitlines()[0].split('\t')) == len(EVENT_FIELDS)
+    events = pl.read_parquet(parse_day(csv, tmp_path / 'processed'))
+
+    assert events.schema == pl.Schema(PARTITION_FIELDS)
+    assert events.height == 200
+    assert events['SQLDATE'].unique().to_list() == [date(2020, 4, 1)]
+    # Codes come from the reference tables, so every row gets a country
+    assert events['ActionGeo_CountryId'].null_count() == 0
+
+def test_generated_gdelt_repeats_earlier_events(tmp_path):
+    gdelt = GDELTSource()
+    gdelt.processed_dir = tmp_path / 'processed'
+    for path in write_gdelt(tmp_path / 'inputs', date(2020, 4, 1), date(2020, 4, 2), rows=200):
+        with zipfile.ZipFile(path) as zf:
+            zf.extractall(tmp_path)
+        parse_day(tmp_path / path.stem, gdelt.processed_dir)
+    dedup = Deduplicator(gdelt)
+    dedup.hashes_dir = tmp_path / 'hashes'
+    dedup.unique_dir = tmp_path / 'unique'
+
+    first, second = dedup.update(date(2020, 4, 1), date(2020, 4, 2))
+
+    assert pl.read_parquet(first).height == 200
+    assert pl.read_parquet(second).height == 170
+
+def test_generated_owid_parses(tmp_path):
+    path = write_owid(tmp_path / 'owid.json', date(2020, 4, 30), days=40, countries=5)
+    owid = OWIDSource(start=date(2020, 4, 1), end=date(2020, 4, 30))
+    owid.raw_dir = tmp_path / 'owid'
+
+    result = owid.process_data(path)
+
+    assert result['metadata'].height == 5
+    assert result['metrics'].height == 5 * 30
+
+def test_standin_pages_worldbank_rows(tmp_path):
+    rows = worldbank_rows(2019, 2020)
+    with StandIn(tmp_path, rows, page_size=100) as standin:
+        url = f'{standin.url}/wb/NY.GDP.MKTP.KD.ZG'
+        first = requests.get(url, params={'per_page': 1000, 'page': 1}).json()
+        last = requests.get(url, params={'per_page': 1000, 'page': first[0]['pages']}).json()
+        missing = requests.get(f'{standin.url}/gdelt/20200401.export.CSV.zip')
+
+    total = len(rows['NY.GDP.MKTP.KD.ZG'])
+    assert len(first[1]) == 100
+    assert (first[0]['pages'] - 1) * 100 + len(last[1]) == total
+    assert missing.status_code == 404
+    assert normalise_indicators(first[1]).height == 100
+
+def test_compare_flags_regressions_beyond_tolerance_and_noise():
+    baseline = {'stages': {
+        'gdelt.parse': {'seconds': 10.0, 'peak_rss_mb': 500},
+        'merge': {'seconds': 0.1, 'peak_rss_mb': 100},
+    }}
+    results = {'stages': {
+        'gdelt.parse': {'seconds': 13.0, 'peak_rss_mb': 520},
+        # Doubled, but by less than the noise floor
+        'merge': {'seconds': 0.2, 'peak_rss_mb': 110},
+        'owid.parse': {'seconds': 99.0, 'peak_rss_mb': 999},
+    }}
+
+    regressions = compare(results, baseline, tolerance=0.25)
+
+    assert list(regressions) == ['gdelt.parse']
+    assert regressions['gdelt.parse'][0].startswith('seconds 10.0 -> 13.0')
+    assert compare(results, baseline, tolerance=0.5) == {}
+
+def test_baseline_from_another_machine_or_setting_is_not_compared():
+    results = {'scale': {'days': 3}, 'machine': machine(workers=8, processes=2)}
+    
+    assert differences(results, results) == []
+    assert differences(results, {**results, 'scale': {'days': 14}}) == ['scale.days']
+    other = {**results, 'machine': {**results['machine'], 'cpus': -1, 'processes': 4}}
+    assert differences(results, other) == ['machine.cpus', 'machine.processes']
+    # Baselines saved before workers and cpus were recorded never match
+    assert 'machine.workers' in differences(results, {**results, 'machine': {'processes': 2}})
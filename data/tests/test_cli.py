@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+def imported_after(statement):
+    """Modules loaded by running statement in a fresh interpreter."""
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+def test_cli_import_skips_heavy_dependencies():
+    modules = imported_after('import pausemap.cli')
+    
+    assert not {'polars', 'pyarrow', 'requests', 'tqdm'} & modules
+    assert 'pausemap.sources.gdelt' not in modules
+
+def test_sources_load_on_first_use():
+    modules = imported_after('from pausemap.sources import WorldBankSource')
+    
+    assert 'pausemap.sources.worldbank' in modules
+    assert not {'pausemap.sources.gdelt', 'pausemap.sources.owid', 'pyarrow'} & modules
@@ -0,0 +1,42 @@
+import pytest
+import polars as pl
+from pausemap.countries import attach_country_id, build_index, code_table, country_codes
+from pausemap.references import countries
+
+def test_index_ids_are_fixed_and_unique():
+    index = build_index()
+    assert index['country_id'].is_unique().all()
+    assert index['iso3'].is_unique().all()
+    # Ids are stored in partitions on disk, so they must never move
+    ids = dict(index.select('iso3', 'country_id').rows())
+    assert (ids['AFG'], ids['GBR'], ids['USA'], ids['ZWE']) == (1, 66, 200, 212)
+
+def test_index_ignores_list_order(monkeypatch):
+    index = build_index()
+    monkeypatch.setattr('pausemap.countries.COUNTRIES', list(reversed(countries.COUNTRIES)))
+    assert build_index().equals(index)
+
+def test_country_without_id_is_rejected(monkeypatch):
+    monkeypatch.setattr('pausemap.countries.COUNTRIES', countries.COUNTRIES + [('ATA', 'AQ', 'AY', 'Antarctica')])
+    with pytest.raises(ValueError, match='ATA'):
+        build_index()
+
+def test_schemes_agree_on_country_id():
+    lf = pl.LazyFrame({
+        'fips': ['UK', 'GZ', 'WE', 'XX'],
+        'cameo': ['GBR', 'PSE', 'PSE', 'ROM'],
+        'owid': ['GBR', 'PSE', 'PSE', 'OWID_WRL'],
+    })
+    lf = attach_country_id(lf, 'fips', 'fips', 'fips_id')
+    lf = attach_country_id(lf, 'cameo', 'cameo', 'cameo_id')
+    lf = attach_country_id(lf, 'owid', 'owid', 'owid_id')
+    df = lf.collect()
+    
+    assert df['fips_id'][:3].to_list() == df['cameo_id'][:3].to_list() == df['owid_id'][:3].to_list()
+    assert df['fips_id'][3] is None and df['owid_id'][3] is None
+    assert df['cameo_id'][3] == code_table('iso3').filter(pl.col('code') == 'ROU')['country_id'][0]
+
+def test_country_codes_round_trips():
+    ids = code_table('iso3').filter(pl.col('code').is_in(['GBR', 'USA']))
+    df = country_codes(ids.lazy()).collect()
+    assert df['country'].to_list() == df['code'].to_list()
@@ -0,0 +1,34 @@
+import pytest
+from datetime import date
+from pausemap.dates import days, parse_shard, shard_range, weeks
+
+def test_weeks_cover_partial_edges():
+    assert weeks(date(2020, 4, 1), date(2020, 4, 13)) == [
+        date(2020, 3, 30), date(2020, 4, 6), date(2020, 4, 13)
+    ]
+
+@pytest.mark.parametrize('count', [1, 3, 7, 25])
+def test_shards_are_disjoint_whole_weeks_covering_the_window(count):
+    start, end = date(2019, 12, 1), date(2021, 12, 31)
+    shards = [shard_range(start, end, i, count) for i in range(count)]
+    
+    covered = [day for shard in shards for day in days(*shard)]
+    assert covered == days(start, end)
+    # Every boundary between shards falls on a Monday
+    assert all(shard[0].weekday() == 0 for shard in shards[1:])
+    sizes = [len(days(*shard)) for shard in shards[1:-1]]
+    assert not sizes or max(sizes) - min(sizes) <= 7
+
+def test_surplus_shards_are_empty():
+    start, end = date(2020, 4, 1), date(2020, 4, 8)
+    assert [shard_range(start, end, i, 3) for i in range(3)] == [
+        None, (date(2020, 4, 1), date(2020, 4, 5)), (date(2020, 4, 6), date(2020, 4, 8))
+    ]
+
+@pytest.mark.parametrize('spec', ['1', '4/4', '-1/2', 'a/b', '0/0'])
+def test_parse_shard_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+def test_parse_shard():
+    assert parse_shard('2/8') == (2, 8)
@@ -0,0 +1,67 @@
+import os
+import numpy as np
+import polars as pl
+import pytest
+from datetime import date
+from pausemap.dedup import Deduplicator, contains
+from pausemap.metrics import METRICS
+from pausemap.sources.gdelt import GDELTSource
+from tests.conftest import gdelt_row
+
+@pytest.fixture
+def dedup(tmp_path, gdelt_export):
+    gdelt = GDELTSource()
+    gdelt.processed_dir = tmp_path / 'gdelt'
+    
+    dedup = Deduplicator(gdelt, window=3)
+    dedup.hashes_dir = tmp_path / 'hashes'
+    dedup.unique_dir = tmp_path / 'unique'
+    
+    def add_day(day, urls):
+        rows = [gdelt_row(i, day, url=f'http://example.com/{url}') for i, url in enumerate(urls)]
+        return gdelt.process_day(gdelt_export(day, rows))
+    dedup.add_day = add_day
+    return dedup
+
+def urls(path):
+    return pl.read_parquet(path)['SOURCEURL'].str.replace('http://example.com/', '').to_list()
+
+def test_contains_uses_sorted_hashes():
+    seen = np.array([3, 8, 21], dtype=np.uint64)
+    
+    assert contains(seen, np.array([8, 9, 21, 30], dtype=np.uint64)).tolist() == [True, False, True, False]
+    assert not contains(seen[:0], np.array([8], dtype=np.uint64)).any()
+
+def test_repeats_within_the_window_are_dropped(dedup):
+    dedup.add_day('20200401', ['a', 'b', 'b'])
+    dedup.add_day('20200402', ['a', 'c'])
+    dedup.add_day('20200405', ['a', 'b', 'd'])
+    METRICS.reset()
+    
+    unique = dedup.update(date(2020, 4, 1), date(2020, 4, 5))
+    
+    assert [p.name for p in unique] == ['20200401.parquet', '20200402.parquet', '20200405.parquet']
+    assert urls(unique[0]) == ['a', 'b']
+    assert urls(unique[1]) == ['c']
+    # 'a' was last seen 3 days earlier, 'b' 4 days earlier: outside the window
+    assert urls(unique[2]) == ['b', 'd']
+    assert METRICS.stages['gdelt.duplicates'].rows == 3
+    assert dedup.view().scan(date(2020, 4, 1), date(2020, 4, 5)).collect().height == 5
+
+def test_day_is_rebuilt_when_its_window_changes(dedup):
+    dedup.add_day('20200401', ['a'])
+    dedup.add_day('20200402', ['a', 'b'])
+    [_, second] = dedup.update(date(2020, 4, 1), date(2020, 4, 2))
+    assert urls(second) == ['b']
+    
+    earlier = dedup.add_day('20200401', ['b'])
+    os.utime(earlier, (second.stat().st_mtime + 1,) * 2)
+    dedup.update(date(2020, 4, 1), date(2020, 4, 2))
+    
+    assert urls(second) == ['a']
+
+def test_changing_keys_uses_fresh_directories():
+    gdelt = GDELTSource()
+    
+    assert Deduplicator(gdelt).unique_dir != Deduplicator(gdelt, keys=['SOURCEURL']).unique_dir
+    assert Deduplicator(gdelt).view().processed_dir == Deduplicator(gdelt).unique_dir
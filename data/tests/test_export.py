@@ -0,0 +1,84 @@
+import gzip
+import json
+from datetime import date
+
+import polars as pl
+
+from pausemap.countries import code_table
+from pausemap.export import WeeklyExport
+
+
+def _ids():
+    return dict(code_table('iso3').rows())
+
+
+def _merged():
+    ids = _ids()
+    return pl.LazyFrame({
+        'week': [date(2020, 3, 30), date(2020, 3, 30), date(2020, 4, 6)],
+        'country_id': [ids['USA'], ids['GBR'], ids['GBR']],
+        'country': ['USA', 'GBR', 'GBR'],
+        'event_count': [4, 8, 2],
+        'impact': [0.5, -5.875, 1.0],
+        'tone': [1.0, -1.625, None],
+        'cases': [None, 3.0, 10.0],
+    }, schema_overrides={'country_id': pl.UInt16})
+
+
+def _events():
+    ids = _ids()
+    return pl.LazyFrame({
+        'week': [date(2020, 3, 30)] * 3,
+        'country_id': [ids['GBR'], ids['GBR'], ids['USA']],
+        'event_root': ['19', '04', '04'],
+        'event_count': [5, 3, 4],
+    }, schema_overrides={'country_id': pl.UInt16})
+
+
+def test_export_writes_one_quantised_file_per_week(tmp_path):
+    ids = _ids()
+    index_path = WeeklyExport(tmp_path, encodings=['gzip']).export(_merged(), _events())
+
+    index = json.loads(index_path.read_text())
+    assert [w['file'] for w in index['weeks']] == ['2020-W14.json', '2020-W15.json']
+    assert index['countries'][ids['GBR']][0] == 'GBR'
+    assert index['event_roots'][3] == ['04', 'Consult']
+    assert index['metrics']['tone'] == {'scale': 100}
+
+    week = json.loads((tmp_path / '2020-W14.json').read_text())
+    assert week['countries'] == sorted([ids['GBR'], ids['USA']])
+    gbr = week['countries'].index(ids['GBR'])
+    assert week['metrics']['impact'][gbr] == -588
+    assert week['metrics']['tone'][gbr] == -162
+    assert week['metrics']['cases'][1 - gbr] is None
+    assert week['events']['root'][:2] == [3, 18]
+    assert week['events']['count'][:2] == [3, 5]
+
+    later = json.loads((tmp_path / '2020-W15.json').read_text())
+    assert later['events'] == {'country': [], 'root': [], 'count': []}
+
+    # Pre-compressed copies decode to the same payload
+    assert gzip.decompress((tmp_path / '2020-W14.json.gz').read_bytes()) == \
+        (tmp_path / '2020-W14.json').read_bytes()
+
+
+def test_export_keeps_unchanged_files(tmp_path):
+    export = WeeklyExport(tmp_path, encodings=['gzip'])
+    export.export(_merged(), _events())
+    week = tmp_path / '2020-W14.json'
+    mtime = week.stat().st_mtime_ns
+
+    export.export(_merged(), _events())
+
+    assert week.stat().st_mtime_ns == mtime
+    assert not list(tmp_path.glob('*.meta.json')) and not list(tmp_path.glob('*.part'))
+
+
+def test_index_countries_are_indexed_by_id(mocker):
+    mocker.patch('pausemap.export.country_index', return_value=pl.DataFrame({
+        'country_id': [2, 0], 'iso3': ['USA', 'GBR'], 'name': ['United States', 'United Kingdom'],
+    }))
+
+    countries = WeeklyExport(encodings=[]).index_payload([])['countries']
+
+    assert countries == [['GBR', 'United Kingdom'], None, ['USA', 'United States']]
@@ -1,11 +1,183 @@
+import io
+import time
+import zipfile
 import pytest
-from pausemap.sources.gdelt import GDELTSource
+import polars as pl
+from datetime import date
+from pathlib import Path
+from pausemap.config import START_DATE, END_DATE
+from pausemap.sources.gdelt import GDELTSource, PARTITION_FIELDS
+from tests.conftest import gdelt_row
 
-def test_gdelt_weekly_processing():
+def test_gdelt_weekly_processing(gdelt_export):
+    # Storage is a temp dir (see conftest.storage)
     gdelt = GDELTSource()
-    # Using mock data for tests
-    df = gdelt.get_weekly_data('2020-01-01', '2020-12-31') 
+    events = {
+        '20200401': range(5),
+        '20200402': range(4, 8),   # re-reports event 4
+        '20200406': range(10, 13),
+    }
+    for day, ids in events.items():
+        rows = [gdelt_row(i, day, url=f'http://example.com/{i}') for i in ids]
+        gdelt.process_day(gdelt_export(day, rows))
     
-    assert len(df) > 0
-    assert 'week' in df.columns
-    assert 'event_count' in df.columns
\ No newline at end of file
+    df = gdelt.get_weekly_data('2020-03-30', '2020-04-12')
+    
+    assert df['week'].to_list() == [date(2020, 3, 30), date(2020, 4, 6)]
+    assert df['event_count'].to_list() == [8, 3]
+    assert df['impact'].to_list() == pytest.approx([2.8, 2.8])
+    assert df['tone'].to_list() == pytest.approx([-2.5, -2.5])
+
+def test_fetch_range_keeps_date_order(mocker):
+    def slow_early_days(day):
+        # Later days finish first so completion order differs from date order
+        time.sleep(0.001 * (31 - day.day))
+        return Path(f"{day:%Y%m%d}.export.CSV")
+    
+    gdelt = GDELTSource(workers=4)
+    mocker.patch.object(gdelt, "fetch_day", side_effect=slow_early_days)
+    
+    csvs = gdelt.fetch_range()
+    
+    assert csvs == sorted(csvs)
+    assert len(csvs) == (END_DATE - START_DATE).days + 1
+
+
+def test_fetch_day_streams_zip_to_csv(tmp_path, mocker):
+    payload = io.BytesIO()
+    with zipfile.ZipFile(payload, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("20200401.export.CSV", "1\t20200401\n" * 1000)
+    data = payload.getvalue()
+    
+    response = mocker.MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.return_value = [data[i:i + 512] for i in range(0, len(data), 512)]
+    
+    gdelt = GDELTSource()
+    gdelt.raw_dir = tmp_path
+    mocker.patch.object(gdelt.session, "get", return_value=response)
+    
+    csv = gdelt.fetch_day(date(2020, 4, 1))
+    
+    assert csv.read_text() == "1\t20200401\n" * 1000
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["20200401.export.CSV"]
+    # Cached days short-circuit without touching the network
+    gdelt.session.get.reset_mock()
+    assert gdelt.fetch_day(date(2020, 4, 1)) == csv
+    gdelt.session.get.assert_not_called()
+
+
+def test_process_day_writes_typed_parquet(tmp_path, gdelt_export):
+    csv = gdelt_export('20200401')
+    gdelt = GDELTSource()
+    gdelt.processed_dir = tmp_path
+    
+    partition = gdelt.process_day(csv)
+    df = pl.read_parquet(partition)
+    
+    assert partition.name == '20200401.parquet'
+    assert df.columns == list(PARTITION_FIELDS)
+    assert df['ActionGeo_CountryId'].to_list() == [df['Actor1CountryId'][0]] * 10
+    assert df.schema['DATEADDED'] == pl.Date
+    assert df['EventCode'].to_list() == ['043'] * 10
+    assert df['AvgTone'].mean() == -2.5
+    # Up-to-date partitions are not rewritten
+    mtime = partition.stat().st_mtime_ns
+    gdelt.process_day(csv)
+    assert partition.stat().st_mtime_ns == mtime
+
+
+def test_scan_prunes_days_and_pushes_filters(tmp_path, gdelt_export):
+    gdelt = GDELTSource()
+    gdelt.processed_dir = tmp_path
+    for day, country in [('20200401', 'US'), ('20200402', 'UK'), ('20200403', 'US')]:
+        rows = [gdelt_row(i, day, country=country) for i in range(5)]
+        gdelt.process_day(gdelt_export(day, rows))
+    
+    lf = gdelt.scan(date(2020, 4, 1), date(2020, 4, 2),
+                    columns=['DATEADDED', 'AvgTone'], countries=['US'])
+    df = lf.collect()
+    
+    assert df.columns == ['DATEADDED', 'AvgTone']
+    assert df['DATEADDED'].unique().to_list() == [date(2020, 4, 1)]
+    assert gdelt.scan(date(2021, 1, 1), date(2021, 1, 2)).collect().is_empty()
+
+
+def test_process_range_in_worker_processes_matches_serial(tmp_path, gdelt_export):
+    days = ['20200401', '20200402', '20200403', '20200404', '20200405']
+    csvs = [gdelt_export(day, [gdelt_row(i, day, tone=-i) for i in range(5)]) for day in days]
+    
+    gdelt = GDELTSource(processes=2)
+    gdelt.processed_dir = tmp_path / 'parallel'
+    gdelt.processed_dir.mkdir()
+    parallel = gdelt.process_range(csvs)
+    
+    gdelt.processed_dir = tmp_path / 'serial'
+    gdelt.processed_dir.mkdir()
+    serial = gdelt.process_range(csvs, processes=1)
+    
+    assert [p.name for p in parallel] == [f'{day}.parquet' for day in days]
+    for a, b in zip(parallel, serial):
+        assert pl.read_parquet(a).equals(pl.read_parquet(b))
+
+
+def test_fetch_and_process_caps_days_waiting_to_parse(tmp_path, gdelt_export, mocker):
+    raw_dir = tmp_path / 'raw'
+    on_disk = []
+    def fetch_day(day):
+        on_disk.append(len(list(raw_dir.glob('*.CSV'))) + 1)
+        if day == date(2020, 4, 3):
+            return None
+        return gdelt_export(f'{day:%Y%m%d}', [gdelt_row(1, f'{day:%Y%m%d}')])
+    
+    gdelt = GDELTSource(workers=4, processes=1, start=date(2020, 4, 1), end=date(2020, 4, 8))
+    gdelt.processed_dir = tmp_path / 'processed'
+    gdelt.raw_dir = raw_dir
+    mocker.patch.object(gdelt, 'fetch_day', side_effect=fetch_day)
+    
+    partitions = gdelt.fetch_and_process(queue_size=2, keep_raw=False)
+    
+    assert [p.name for p in partitions] == [
+        f'2020040{d}.parquet' for d in (1, 2, 4, 5, 6, 7, 8)
+    ]
+    assert max(on_disk) <= 2
+    assert not list(raw_dir.glob('*.CSV'))
+    
+    # Converted days whose raw file is gone aren't fetched again
+    gdelt.fetch_day.reset_mock()
+    assert gdelt.fetch_and_process(keep_raw=False) == partitions
+    assert [call.args[0] for call in gdelt.fetch_day.call_args_list] == [date(2020, 4, 3)]
+
+
+def test_ingest_day_does_not_refetch_discarded_days(tmp_path, gdelt_export, mocker):
+    gdelt = GDELTSource(processes=1)
+    gdelt.processed_dir = tmp_path / 'processed'
+    gdelt.raw_dir = tmp_path / 'raw'
+    mocker.patch.object(gdelt, 'fetch_day', side_effect=lambda day: gdelt_export(
+        f'{day:%Y%m%d}', [gdelt_row(1, f'{day:%Y%m%d}')]
+    ))
+    
+    partition = gdelt.ingest_day(date(2020, 4, 1), keep_raw=False)
+    assert partition == gdelt.processed_dir / '20200401.parquet'
+    assert not list(gdelt.raw_dir.glob('*.CSV'))
+    
+    assert gdelt.ingest_day(date(2020, 4, 1)) == partition
+    assert gdelt.fetch_day.call_count == 1
+
+
+def test_fetch_and_process_in_worker_processes_matches_serial(tmp_path, gdelt_export, mocker):
+    days = ['20200401', '20200402', '20200403']
+    csvs = {day: gdelt_export(day, [gdelt_row(i, day, tone=-i) for i in range(5)]) for day in days}
+    
+    gdelt = GDELTSource(processes=2, start=date(2020, 4, 1), end=date(2020, 4, 3))
+    mocker.patch.object(gdelt, 'fetch_day', side_effect=lambda day: csvs[f'{day:%Y%m%d}'])
+    gdelt.processed_dir = tmp_path / 'parallel'
+    parallel = gdelt.fetch_and_process(queue_size=1)
+    
+    gdelt.processed_dir = tmp_path / 'serial'
+    serial = gdelt.process_range(list(csvs.values()), processes=1)
+    
+    assert all(csv.exists() for csv in csvs.values())
+    assert [p.name for p in parallel] == [p.name for p in serial]
+    for a, b in zip(parallel, serial):
+        assert pl.read_parquet(a).equals(pl.read_parquet(b))
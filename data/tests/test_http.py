@@ -0,0 +1,96 @@
+import pytest
+import requests
+from datetime import timedelta
+from pausemap.http import fetch_cached, is_fresh, write_if_changed
+
+def make_response(mocker, status=200, body=b'', headers=None):
+    response = mocker.MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = status
+    response.headers = headers or {}
+    response.iter_content.return_value = [body]
+    return response
+
+def test_fetch_cached_stores_validators(tmp_path, mocker):
+    target = tmp_path / 'data.json'
+    session = mocker.MagicMock()
+    session.get.return_value = make_response(mocker, body=b'{}', headers={'ETag': '"v1"'})
+    
+    fetch_cached(session, 'http://example.com/data.json', target)
+    
+    assert target.read_bytes() == b'{}'
+    assert is_fresh(target, timedelta(hours=1))
+    # A fresh copy is served without any request
+    fetch_cached(session, 'http://example.com/data.json', target)
+    assert session.get.call_count == 1
+
+def test_fetch_cached_revalidates_stale_copy(tmp_path, mocker):
+    target = tmp_path / 'data.json'
+    session = mocker.MagicMock()
+    session.get.return_value = make_response(mocker, body=b'{}', headers={'ETag': '"v1"'})
+    fetch_cached(session, 'http://example.com/data.json', target)
+    mtime = target.stat().st_mtime_ns
+    
+    session.get.return_value = make_response(mocker, status=304)
+    fetch_cached(session, 'http://example.com/data.json', target, max_age=timedelta(0))
+    
+    assert session.get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert target.stat().st_mtime_ns == mtime
+    
+    # Servers without validators send the body again; same bytes, same file
+    session.get.return_value = make_response(mocker, body=b'{}')
+    fetch_cached(session, 'http://example.com/data.json', target, max_age=timedelta(0))
+    assert target.stat().st_mtime_ns == mtime
+
+def test_fetch_cached_keeps_stale_copy_during_outage(tmp_path, mocker):
+    target = tmp_path / 'data.json'
+    session = mocker.MagicMock()
+    session.get.return_value = make_response(mocker, body=b'{}')
+    fetch_cached(session, 'http://example.com/data.json', target)
+    
+    session.get.side_effect = requests.ConnectionError('down')
+    assert fetch_cached(session, 'http://example.com/data.json', target, max_age=timedelta(0)) == target
+    
+    session.get.side_effect = None
+    unavailable = make_response(mocker, status=503)
+    unavailable.raise_for_status.side_effect = requests.HTTPError(response=unavailable)
+    session.get.return_value = unavailable
+    assert fetch_cached(session, 'http://example.com/data.json', target, max_age=timedelta(0)) == target
+    
+    assert target.read_bytes() == b'{}'
+    # Still stale, so the next run asks again
+    assert not is_fresh(target, timedelta(0))
+    
+    missing = make_response(mocker, status=404)
+    missing.raise_for_status.side_effect = requests.HTTPError(response=missing)
+    session.get.return_value = missing
+    with pytest.raises(requests.HTTPError):
+        fetch_cached(session, 'http://example.com/data.json', target, max_age=timedelta(0))
+
+def test_fetch_cached_removes_partial_download(tmp_path, mocker):
+    target = tmp_path / 'data.json'
+    def broken_stream(chunk_size):
+        yield b'{"partial'
+        raise requests.exceptions.ChunkedEncodingError('connection reset')
+    response = make_response(mocker)
+    response.iter_content.side_effect = broken_stream
+    session = mocker.MagicMock()
+    session.get.return_value = response
+    
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        fetch_cached(session, 'http://example.com/data.json', target)
+    
+    assert list(tmp_path.iterdir()) == []
+
+def test_write_if_changed(tmp_path):
+    target = tmp_path / 'wb.json'
+    assert write_if_changed(target, b'[1]')
+    assert not write_if_changed(target, b'[1]')
+    assert write_if_changed(target, b'[2]')
+    assert target.read_bytes() == b'[2]'
+
+def test_write_if_changed_without_sidecar(tmp_path):
+    target = tmp_path / 'index.json'
+    assert write_if_changed(target, b'{}', sidecar=False)
+    assert not write_if_changed(target, b'{}', sidecar=False)
+    assert list(tmp_path.iterdir()) == [target]
@@ -0,0 +1,46 @@
+import json
+import threading
+import pytest
+from pausemap.metrics import Metrics
+
+def test_track_sums_calls_from_threads():
+    metrics = Metrics()
+    def work():
+        for _ in range(50):
+            with metrics.track('fetch') as m:
+                m.add(rows=2, bytes=10, cache_hit=False)
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with metrics.track('fetch') as m:
+        m.add(cache_hit=True)
+
+    stage = metrics.report()['stages']['fetch']
+    assert stage['calls'] == 201
+    assert (stage['rows'], stage['bytes']) == (400, 2000)
+    assert (stage['cache_hits'], stage['cache_misses']) == (1, 200)
+    assert stage['seconds'] >= 0
+
+def test_failed_calls_are_counted_and_reraised():
+    metrics = Metrics()
+    with pytest.raises(RuntimeError):
+        with metrics.track('parse'):
+            raise RuntimeError('boom')
+    with metrics.track('parse') as m:
+        m.errors += 1
+
+    assert metrics.report()['stages']['parse']['errors'] == 2
+
+def test_write_report(tmp_path):
+    metrics = Metrics()
+    with metrics.track('merge') as m:
+        m.add(rows=100)
+
+    path = metrics.write_report(tmp_path / 'run' / 'report.json', command='merge')
+    report = json.loads(path.read_text())
+
+    assert report['command'] == 'merge'
+    assert report['stages']['merge']['rows'] == 100
+    assert report['peak_rss_mb'] > 0
@@ -0,0 +1,79 @@
+import json
+from datetime import date
+import pytest
+import polars as pl
+from pausemap.sources.owid import OWIDSource, iter_json_object
+
+OWID_DATA = {
+    "GBR": {
+        "location": "United Kingdom",
+        "continent": "Europe",
+        "population": 67886004,
+        "data": [
+            {"date": "2020-03-31", "new_cases": 3009},
+            {"date": "2020-04-01", "new_cases": 4324, "stringency_index": 79.63},
+            {"date": "2020-04-02", "new_cases": 4244.0, "tests_units": "people tested"},
+        ]
+    },
+    "OWID_WRL": {
+        "location": "World",
+        "data": [{"date": "2020-04-01", "total_cases": 932605}]
+    },
+    "ATA": {"location": "Antarctica"}
+}
+
+@pytest.fixture
+def owid_json(tmp_path):
+    path = tmp_path / 'owid_covid.json'
+    # Indented so values straddle the tiny read chunks used below
+    path.write_text(json.dumps(OWID_DATA, indent=3))
+    return path
+
+def test_iter_json_object_streams_top_level_pairs(owid_json):
+    pairs = list(iter_json_object(owid_json, chunk_size=16))
+    assert pairs == list(OWID_DATA.items())
+
+def test_iter_json_object_handles_empty_object(tmp_path):
+    path = tmp_path / 'empty.json'
+    path.write_text(' {\n} ')
+    assert list(iter_json_object(path)) == []
+
+def test_process_data_builds_typed_frames(tmp_path, owid_json):
+    owid = OWIDSource()
+    owid.raw_dir = tmp_path
+    
+    frames = owid.process_data(owid_json)
+    metrics = frames['metrics']
+    
+    assert frames['metadata']['country_code'].to_list() == ['GBR', 'OWID_WRL', 'ATA']
+    assert frames['metadata']['population'].to_list() == [67886004.0, None, None]
+    assert metrics.columns[:2] == ['country_code', 'date']
+    assert metrics.schema['date'] == pl.Date
+    assert metrics.select('country_code', 'new_cases').rows() == [
+        ('GBR', 4324.0), ('GBR', 4244.0), ('OWID_WRL', None)
+    ]
+    assert pl.read_parquet(tmp_path / 'metrics.parquet').equals(metrics)
+
+def test_process_data_applies_window_countries_and_metrics(tmp_path, owid_json):
+    owid = OWIDSource()
+    owid.raw_dir = tmp_path
+    
+    frames = owid.process_data(
+        owid_json,
+        start=date(2020, 3, 31),
+        end=date(2020, 4, 1),
+        countries=['GBR'],
+        metrics=['new_cases']
+    )
+    
+    assert frames['metadata']['country_code'].to_list() == ['GBR']
+    assert frames['metrics'].drop('country_id').rows() == [
+        ('GBR', date(2020, 3, 31), 3009.0),
+        ('GBR', date(2020, 4, 1), 4324.0)
+    ]
+
+def test_process_data_rejects_unknown_metrics(tmp_path, owid_json):
+    owid = OWIDSource()
+    owid.raw_dir = tmp_path
+    with pytest.raises(ValueError):
+        owid.process_data(owid_json, metrics=['not_a_metric'])
@@ -0,0 +1,126 @@
+import threading
+from datetime import date
+import pytest
+from pausemap.pipeline import Pipeline, Stage, build_pipeline
+
+@pytest.fixture
+def files(tmp_path):
+    """A source file per partition and a log of the partitions that ran."""
+    src = tmp_path / 'src'
+    src.mkdir()
+    for name in 'abc':
+        (src / name).write_text(name)
+    return src
+
+def copy_stage(src, dst, calls, fail=()):
+    dst.mkdir(exist_ok=True)
+    def run(partition):
+        calls.append(partition)
+        if partition in fail:
+            raise RuntimeError('boom')
+        target = dst / partition
+        target.write_text((src / partition).read_text().upper())
+        return target
+    return Stage(
+        'copy', run,
+        partitions=lambda: sorted(p.name for p in src.iterdir()),
+        inputs=lambda p: [src / p]
+    )
+
+def test_completed_partitions_are_skipped(tmp_path, files):
+    calls = []
+    pipeline = Pipeline([copy_stage(files, tmp_path / 'out', calls)], tmp_path / 'state')
+    
+    assert pipeline.run() == {'copy': True}
+    assert pipeline.run() == {'copy': True}
+    
+    assert calls == ['a', 'b', 'c']
+
+def test_changed_input_or_missing_output_reruns_partition(tmp_path, files):
+    calls = []
+    pipeline = Pipeline([copy_stage(files, tmp_path / 'out', calls)], tmp_path / 'state')
+    pipeline.run()
+    calls.clear()
+    
+    (files / 'a').write_text('changed')
+    (tmp_path / 'out' / 'c').unlink()
+    pipeline.run()
+    
+    assert calls == ['a', 'c']
+    assert (tmp_path / 'out' / 'a').read_text() == 'CHANGED'
+
+def test_failed_run_resumes_from_failed_partition(tmp_path, files):
+    calls = []
+    stage = copy_stage(files, tmp_path / 'out', calls, fail={'b'})
+    # Runs on what copy produced, and again once its inputs change
+    downstream = Stage(
+        'after', lambda p: calls.append('after') or tmp_path, deps=['copy'],
+        inputs=lambda p: sorted((tmp_path / 'out').iterdir())
+    )
+    pipeline = Pipeline([stage, downstream], tmp_path / 'state')
+    
+    assert pipeline.run() == {'copy': False, 'after': True}
+    assert pipeline.failed == {'copy': ['b'], 'after': []}
+    
+    calls.clear()
+    pipeline.stages['copy'] = copy_stage(files, tmp_path / 'out', calls)
+    assert pipeline.run() == {'copy': True, 'after': True}
+    assert calls == ['b', 'after']
+
+def test_failed_partition_only_holds_back_its_own_downstream(tmp_path, files):
+    calls = []
+    upper = copy_stage(files, tmp_path / 'upper', calls, fail={'b'})
+    # Same partitions as copy, reading what it wrote
+    lower = Stage(
+        'lower', lambda p: calls.append(f'lower {p}') or (tmp_path / 'upper' / p),
+        deps=['copy'],
+        partitions=upper.partitions
+    )
+    pipeline = Pipeline([upper, lower], tmp_path / 'state')
+    
+    assert pipeline.run() == {'copy': False, 'lower': False}
+    assert pipeline.failed == {'copy': ['b'], 'lower': ['b']}
+    assert calls == ['a', 'b', 'c', 'lower a', 'lower c']
+
+def test_stage_without_successes_skips_dependents(tmp_path, files):
+    calls = []
+    stage = copy_stage(files, tmp_path / 'out', calls, fail={'a', 'b', 'c'})
+    downstream = Stage('after', lambda p: calls.append('after') or tmp_path, deps=['copy'])
+    pipeline = Pipeline([stage, downstream], tmp_path / 'state')
+    
+    assert pipeline.run() == {'copy': False, 'after': False}
+    assert 'after' not in calls
+    assert pipeline.failed['after'] == ['all']
+
+def test_independent_stages_run_in_parallel(tmp_path):
+    barrier = threading.Barrier(2, timeout=5)
+    def run(partition):
+        barrier.wait()
+        return tmp_path
+    pipeline = Pipeline([
+        Stage('one', run, checkpoint=False),
+        Stage('two', run, checkpoint=False),
+    ], tmp_path / 'state')
+    
+    assert pipeline.run() == {'one': True, 'two': True}
+
+def test_unknown_dependency_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Pipeline([Stage('one', lambda p: tmp_path, deps=['missing'])], tmp_path)
+
+def test_full_pipeline_graph():
+    pipeline = build_pipeline()
+    
+    assert pipeline.stages['merge'].deps == ['gdelt.rollup', 'owid.parse', 'worldbank.fetch']
+    assert pipeline.stages['gdelt.ingest'].partitions()[0] == '20200401'
+    assert pipeline.stages['gdelt.rollup'].deps == ['gdelt.dedup']
+    assert pipeline.stages['gdelt.dedup'].deps == ['gdelt.ingest']
+    assert pipeline.stages['export'].deps == ['store']
+
+def test_sharded_pipeline_leaves_out_combining_stages():
+    pipeline = build_pipeline(date(2020, 4, 6), date(2020, 4, 12), sources=['gdelt'], combine=False)
+    
+    assert sorted(pipeline.stages) == [
+        'gdelt.dedup', 'gdelt.ingest', 'gdelt.rollup', 'gdelt.tiles'
+    ]
+    assert pipeline.stages['gdelt.rollup'].partitions() == ['2020-04-06']
@@ -1,6 +1,6 @@
 import pytest
 import polars as pl
-from datetime import datetime
+from datetime import date, datetime
 from pausemap.processor import DataProcessor
 
 def test_merge_weekly_data(sample_gdelt_data, sample_owid_data):
@@ -20,4 +20,97 @@ def test_generate_summary():
         {'event_count': 1000, 'tone': -0.2}
     )
     assert isinstance(summary, dict)
-    assert 'date' in summary
\ No newline at end of file
+    assert 'date' in summary
+
+def test_merge_weekly_data_by_country_and_week():
+    gdelt = pl.DataFrame({
+        'week': [date(2020, 3, 30), date(2020, 3, 30), date(2020, 4, 6)],
+        'country': ['GBR', 'USA', 'GBR'],
+        'event_count': [10, 20, 30]
+    })
+    owid = pl.DataFrame({
+        'week': [date(2020, 4, 1), date(2020, 4, 8)],  # mid-week dates snap to Monday
+        'country': ['GBR', 'GBR'],
+        'cases': [100.0, 200.0]
+    })
+    
+    merged = DataProcessor().merge_weekly_data(gdelt, owid)
+    
+    assert merged.select('country', 'week', 'cases').rows() == [
+        ('GBR', date(2020, 3, 30), 100.0),
+        ('GBR', date(2020, 4, 6), 200.0),
+        ('USA', date(2020, 3, 30), None)
+    ]
+
+def test_owid_weekly_rolls_up_days():
+    metrics = pl.LazyFrame({
+        'country_code': ['GBR', 'GBR', 'GBR', 'OWID_WRL'],
+        'date': [date(2020, 3, 30), date(2020, 4, 5), date(2020, 4, 6), date(2020, 4, 1)],
+        'new_cases': [1.0, 2.0, 4.0, 100.0],
+        'new_deaths': [0.0, 1.0, 1.0, 10.0],
+        'stringency_index': [70.0, 80.0, 80.0, None]
+    })
+    
+    weekly = DataProcessor().owid_weekly(metrics).sort('week').collect()
+    
+    assert weekly.select('week', 'cases', 'stringency_index').rows() == [
+        (date(2020, 3, 30), 3.0, 75.0),
+        (date(2020, 4, 6), 4.0, 80.0)
+    ]
+
+def test_add_economic_data_carries_years_forward():
+    weekly = pl.DataFrame({
+        'week': [date(2020, 6, 1), date(2021, 1, 4), date(2021, 1, 4)],
+        'country': ['GBR', 'GBR', 'USA'],
+    })
+    indicators = pl.DataFrame({
+        'country': ['GBR', 'GBR', 'USA'],
+        'indicator': ['gdp', 'gdp', 'gdp'],
+        'year': [2020, 2021, 2020],
+        'value': [-9.3, 7.5, -3.4]
+    })
+    
+    merged = DataProcessor().add_economic_data(indicators, weekly)
+    
+    assert merged.select('country', 'week', 'gdp').rows() == [
+        ('GBR', date(2020, 6, 1), -9.3),
+        ('GBR', date(2021, 1, 4), 7.5),
+        ('USA', date(2021, 1, 4), -3.4)
+    ]
+
+def test_add_economic_data_gives_each_week_one_year():
+    indicators = pl.DataFrame({
+        'country': ['GBR', 'GBR'],
+        'year': [2020, 2021],
+        'value': [-9.3, 7.5]
+    })
+    
+    weeks = DataProcessor().add_economic_data(indicators)
+    
+    assert weeks['week'].is_unique().all()
+    assert weeks['week'][0] == date(2020, 1, 6)  # 2019-12-30 belongs to 2019
+    assert weeks.filter(pl.col('week') == date(2020, 12, 28))['value'].to_list() == [-9.3]
+    assert weeks.filter(pl.col('week') == date(2021, 1, 4))['value'].to_list() == [7.5]
+    assert weeks.height == 52 + 52
+
+def test_add_economic_data_needs_a_country_key():
+    indicators = pl.DataFrame({'iso': ['GBR'], 'year': [2020], 'value': [1.0]})
+    with pytest.raises(ValueError, match='country'):
+        DataProcessor().add_economic_data(indicators)
+
+def test_merge_keeps_the_week_of_a_mid_week_start(tmp_path):
+    rollups = pl.LazyFrame({
+        'week': [date(2020, 3, 23), date(2020, 3, 30), date(2020, 4, 6)],
+        'country_id': pl.Series([1, 1, 1], dtype=pl.UInt16),
+        'event_count': [1, 2, 3],
+        'goldstein_sum': [1.0, 2.0, 3.0],
+        'tone_sum': [-1.0, -2.0, -3.0],
+    })
+    
+    target = DataProcessor().merge(
+        rollups, date(2020, 4, 1), date(2020, 4, 8),
+        owid_metrics=tmp_path / 'none', worldbank_indicators=tmp_path / 'none',
+        target=tmp_path / 'merged.parquet'
+    )
+    
+    assert pl.read_parquet(target)['week'].to_list() == [date(2020, 3, 30), date(2020, 4, 6)]
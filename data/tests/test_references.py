@@ -0,0 +1,30 @@
+import pytest
+import polars as pl
+from pausemap.references import lookup_table, translate_codes
+from pausemap.references.events import describe_event
+
+def test_describe_event_falls_back_to_base_and_root():
+    assert describe_event('043') == 'Host a visit'
+    assert describe_event('0431') == 'Host a visit'
+    assert describe_event('199') == 'Fight'
+    assert describe_event('99') is None
+
+def test_event_lookup_is_fully_resolved():
+    events = lookup_table('events')
+    assert events.filter(pl.col('code') == '1384')['name'].to_list() == ['Threaten to use military force']
+    assert events['code'].is_unique().all()
+
+def test_translate_codes_joins_names_in_order():
+    lf = pl.LazyFrame({
+        'EventCode': ['190', '0431', '999'],
+        'Actor1CountryCode': ['USA', 'ROM', None],
+        'ActionGeo_CountryCode': ['UK', 'GZ', 'US'],
+    })
+    
+    df = translate_codes(lf).collect()
+    
+    assert df['EventName'].to_list() == ['Use conventional military force', 'Host a visit', None]
+    assert df['Actor1CountryName'].to_list() == ['United States', 'Romania', None]
+    assert df['ActionGeo_CountryName'].to_list() == ['United Kingdom', 'Gaza Strip', 'United States']
+    assert df.schema['EventName'] == pl.Categorical
+    assert 'Actor2CountryName' not in df.columns
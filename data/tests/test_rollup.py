@@ -0,0 +1,51 @@
+import pytest
+import polars as pl
+from datetime import date
+from pausemap.rollup import WeeklyRollup, week_start
+from pausemap.sources.gdelt import GDELTSource
+from tests.conftest import gdelt_row
+
+@pytest.fixture
+def rollup(tmp_path, gdelt_export):
+    gdelt = GDELTSource()
+    gdelt.processed_dir = tmp_path / 'gdelt'
+    gdelt.processed_dir.mkdir()
+    
+    rollup = WeeklyRollup(gdelt)
+    rollup.daily_dir = tmp_path / 'daily'
+    rollup.weekly_dir = tmp_path / 'weekly'
+    rollup.daily_dir.mkdir()
+    rollup.weekly_dir.mkdir()
+    
+    def add_day(day, rows):
+        gdelt.process_day(gdelt_export(day, rows))
+    rollup.add_day = add_day
+    return rollup
+
+def test_week_start_is_monday():
+    assert week_start(date(2020, 4, 1)) == date(2020, 3, 30)
+    assert week_start(date(2020, 3, 30)) == date(2020, 3, 30)
+
+def test_weekly_rollup_aggregates_by_country_and_root(rollup):
+    rollup.add_day('20200401', [gdelt_row(i, '20200401', '043', 'US', tone=-2.0) for i in range(3)])
+    rollup.add_day('20200402', [gdelt_row(i, '20200402', '190', 'US', tone=-6.0) for i in range(2)])
+    
+    rollup.update(date(2020, 4, 1), date(2020, 4, 2))
+    weekly = rollup.scan(date(2020, 4, 1), date(2020, 4, 2)).collect()
+    
+    assert weekly['week'].unique().to_list() == [date(2020, 3, 30)]
+    assert weekly.select('event_root', 'event_count').rows() == [('04', 3), ('19', 2)]
+    assert weekly['tone_sum'].to_list() == [-6.0, -12.0]
+
+def test_new_day_only_recomputes_its_week(rollup):
+    rollup.add_day('20200401', [gdelt_row(1, '20200401')])
+    rollup.add_day('20200408', [gdelt_row(2, '20200408')])
+    first, second = rollup.update(date(2020, 4, 1), date(2020, 4, 8))
+    mtimes = first.stat().st_mtime_ns, second.stat().st_mtime_ns
+    
+    rollup.add_day('20200409', [gdelt_row(3, '20200409')])
+    rollup.update(date(2020, 4, 1), date(2020, 4, 9))
+    
+    assert first.stat().st_mtime_ns == mtimes[0]
+    assert second.stat().st_mtime_ns > mtimes[1]
+    assert pl.read_parquet(second)['event_count'].sum() == 2
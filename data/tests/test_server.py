@@ -0,0 +1,125 @@
+import gzip
+import json
+import threading
+import time
+from datetime import date
+from http.client import HTTPConnection
+
+import polars as pl
+import pytest
+
+from pausemap.countries import code_table
+from pausemap.server import QueryService, ResponseCache, Response, accepts_gzip, make_server
+from pausemap.store import ArrowStore, Table
+
+W14, W15 = date(2020, 3, 30), date(2020, 4, 6)
+
+@pytest.fixture
+def ids():
+    return dict(code_table('iso3').rows())
+
+@pytest.fixture
+def store(tmp_path, ids):
+    merged, events = tmp_path / 'merged.parquet', tmp_path / 'events.parquet'
+    pl.DataFrame({
+        'week': [W14, W14, W15],
+        'country_id': [ids['USA'], ids['GBR'], ids['GBR']],
+        'event_count': [4, 8, 2],
+        'tone': [1.0, -1.625, None],
+    }, schema_overrides={'country_id': pl.UInt16}).write_parquet(merged)
+    pl.DataFrame({
+        'week': [W14, W14, W15],
+        'country_id': [ids['GBR'], ids['USA'], ids['GBR']],
+        'event_root': ['19', '04', '04'],
+        'event_count': [5, 4, 2],
+    }, schema_overrides={'country_id': pl.UInt16}).write_parquet(events)
+    return ArrowStore([
+        Table('merged_weekly', lambda: pl.scan_parquet(merged), sources=lambda: [merged]),
+        Table('gdelt_weekly', lambda: pl.scan_parquet(events), sources=lambda: [events]),
+    ], tmp_path / 'arrow')
+
+@pytest.fixture
+def server(store):
+    server = make_server(QueryService(store), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def get(server, path, **headers):
+    connection = HTTPConnection(*server.server_address[:2])
+    connection.request('GET', path, headers=headers)
+    response = connection.getresponse()
+    return response, response.read()
+
+def test_week_and_country_slices(server, ids):
+    response, body = get(server, '/weekly/2020-W14.json')
+    assert response.status == 200
+    week = json.loads(body)
+    assert week['countries'] == sorted([ids['GBR'], ids['USA']])
+    assert week['metrics']['tone'][week['countries'].index(ids['GBR'])] == -162
+
+    _, body = get(server, '/countries/GBR.json')
+    assert json.loads(body) == {
+        'country': 'GBR',
+        'weeks': ['2020-03-30', '2020-04-06'],
+        'metrics': {'event_count': [8, 2], 'tone': [-162, None]},
+        'events': {'week': [0, 1], 'root': [18, 3], 'count': [5, 2]},
+    }
+
+    _, body = get(server, '/weekly/index.json')
+    assert [w['file'] for w in json.loads(body)['weeks']] == ['2020-W14.json', '2020-W15.json']
+
+    for path in ['/weekly/2020-W20.json', '/countries/XXX.json', '/countries/FRA.json', '/other']:
+        assert get(server, path)[0].status == 404
+
+def test_gzip_and_etag_revalidation(server):
+    plain, body = get(server, '/weekly/2020-W14.json')
+    zipped, compressed = get(server, '/weekly/2020-W14.json', **{'Accept-Encoding': 'gzip, deflate'})
+
+    assert zipped.getheader('Content-Encoding') == 'gzip'
+    assert gzip.decompress(compressed) == body
+    assert plain.getheader('ETag') != zipped.getheader('ETag')
+
+    again, empty = get(server, '/weekly/2020-W14.json', **{'If-None-Match': plain.getheader('ETag')})
+    assert again.status == 304
+    assert empty == b''
+
+def test_responses_are_cached_until_the_store_changes(store, ids, tmp_path):
+    service = QueryService(store)
+    first = service.get('/countries/GBR.json')
+    assert service.get('/countries/GBR.json') is first
+
+    time.sleep(0.01)
+    pl.DataFrame({
+        'week': [W14], 'country_id': [ids['GBR']], 'event_count': [1], 'tone': [0.5],
+    }, schema_overrides={'country_id': pl.UInt16}).write_parquet(tmp_path / 'merged.parquet')
+    store.refresh('merged_weekly')
+
+    old = service.tables
+    changed = service.get('/countries/GBR.json')
+    assert json.loads(changed.body)['metrics']['tone'] == [50]
+    assert changed.etag != first.etag
+    
+    # A request that started before the reload answers from the old tables
+    # throughout, and what it caches isn't served from the new ones
+    assert service.query('/countries/GBR.json', old)['metrics']['tone'] == [-162, None]
+    service.cache.put('/countries/GBR.json', first)
+    assert service.get('/countries/GBR.json').etag == changed.etag
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(2)
+    for key in 'abc':
+        if key == 'c':
+            cache.get('a')
+        cache.put(key, Response(b'', b'', key))
+
+    assert cache.get('b') is None
+    assert cache.get('a').etag == 'a'
+    assert len(cache) == 2
+
+def test_accepts_gzip():
+    assert accepts_gzip('gzip, br')
+    assert accepts_gzip('*')
+    assert not accepts_gzip('gzip;q=0, br')
+    assert not accepts_gzip(None)
@@ -0,0 +1,62 @@
+import os
+import polars as pl
+import pytest
+from pausemap.metrics import METRICS
+from pausemap.store import ArrowStore, Table, fingerprint
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'table.parquet'
+    pl.DataFrame({'country': ['GBR', 'USA'], 'value': [1.5, 2.5]}).write_parquet(path)
+    return path
+
+@pytest.fixture
+def store(tmp_path, source):
+    raw = tmp_path / 'raw.json'
+    raw.write_text('{}')
+    return ArrowStore([
+        Table('table', lambda: pl.scan_parquet(source), sources=lambda: [raw, source], requires=source),
+        Table('missing', lambda: pl.scan_parquet(tmp_path / 'nope.parquet'),
+              sources=lambda: [], requires=tmp_path / 'nope.parquet'),
+    ], tmp_path / 'arrow')
+
+def test_load_maps_the_stored_table(store, source):
+    frame = store.load('table')
+    
+    assert frame.equals(pl.read_parquet(source))
+    assert store.path('table').read_bytes()[:6] == b'ARROW1'
+    assert store.is_fresh('table')
+
+def test_stored_table_avoids_string_views(store):
+    import pyarrow as pa
+    store.refresh('table')
+    
+    with pa.memory_map(str(store.path('table'))) as source:
+        schema = pa.ipc.open_file(source).schema
+    assert schema.field('country').type == pa.large_string()
+
+def test_table_is_only_rewritten_when_sources_change(store, tmp_path):
+    METRICS.reset()
+    store.load('table')
+    store.load('table')
+    assert METRICS.stages['store.write'].calls == 1
+    assert METRICS.stages['store.load'].calls == 2
+    
+    raw = tmp_path / 'raw.json'
+    raw.write_text('{"changed": true}')
+    assert not store.is_fresh('table')
+    store.load('table')
+    assert METRICS.stages['store.write'].calls == 2
+
+def test_refresh_all_skips_tables_without_input(store):
+    assert store.refresh_all() == [store.path('table')]
+    assert not store.path('missing').exists()
+
+def test_fingerprint_notices_missing_and_changed_files(tmp_path):
+    path = tmp_path / 'a'
+    before = fingerprint([path])
+    path.write_text('x')
+    
+    assert fingerprint([path]) != before
+    os.utime(path, ns=(1, 1))
+    assert fingerprint([path]) != fingerprint([tmp_path / 'a', tmp_path / 'b'])
@@ -0,0 +1,68 @@
+import pytest
+import polars as pl
+from datetime import date
+from pausemap.tiles import TilePyramid, tile_xy
+from pausemap.sources.gdelt import GDELTSource
+from tests.conftest import gdelt_row
+
+@pytest.fixture
+def pyramid(tmp_path, gdelt_export):
+    gdelt = GDELTSource()
+    gdelt.processed_dir = tmp_path / 'gdelt'
+    gdelt.processed_dir.mkdir()
+    
+    pyramid = TilePyramid(gdelt, zooms=[0, 1, 4])
+    pyramid.tiles_dir = tmp_path / 'tiles'
+    pyramid.tiles_dir.mkdir()
+    
+    def add_day(day, rows):
+        gdelt.process_day(gdelt_export(day, rows))
+    pyramid.add_day = add_day
+    return pyramid
+
+def test_tile_xy_matches_slippy_map_tiles():
+    points = pl.DataFrame({
+        'ActionGeo_Lat': [51.5, -33.9, 90.0, 0.0],
+        'ActionGeo_Long': [-0.13, 151.2, 0.0, 180.0],
+    })
+    tiles = points.select(tile_xy(4))
+    # London, Sydney, the (clamped) north pole and the antimeridian
+    assert tiles.rows() == [(7, 5), (14, 9), (8, 0), (15, 8)]
+
+def test_week_tiles_count_events_and_mean_tone(pyramid):
+    pyramid.add_day('20200401', [
+        gdelt_row(1, '20200401', tone=-2.0, lat=51.5, long=-0.1),
+        gdelt_row(2, '20200401', tone=-4.0, lat=52.5, long=-1.9),
+    ])
+    pyramid.add_day('20200402', [
+        gdelt_row(3, '20200402', tone=3.0, lat=-33.9, long=151.2),
+    ])
+    
+    path, = pyramid.update(date(2020, 4, 1), date(2020, 4, 2))
+    tiles = pl.read_parquet(path)
+    
+    assert path.name == '2020-W14.parquet'
+    assert tiles.filter(pl.col('zoom') == 0).select('event_count', 'tone_sum').rows() == [(3, -3.0)]
+    assert tiles.filter(pl.col('zoom') == 4).select('x', 'y', 'event_count', 'tone').rows() == [
+        (7, 5, 2, -3.0),
+        (14, 9, 1, 3.0),
+    ]
+
+def test_unchanged_week_is_not_rebuilt(pyramid):
+    pyramid.add_day('20200401', [gdelt_row(1, '20200401')])
+    path, = pyramid.update(date(2020, 4, 1), date(2020, 4, 1))
+    mtime = path.stat().st_mtime_ns
+    
+    pyramid.update(date(2020, 4, 1), date(2020, 4, 1))
+    
+    assert path.stat().st_mtime_ns == mtime
+
+def test_tiles_at_other_zooms_are_not_reused(pyramid):
+    pyramid.add_day('20200401', [gdelt_row(1, '20200401')])
+    coarse, fine = TilePyramid(pyramid.source, zooms=[2]), TilePyramid(pyramid.source, zooms=[2, 6])
+    
+    path, = coarse.update(date(2020, 4, 1), date(2020, 4, 1))
+    other, = fine.update(date(2020, 4, 1), date(2020, 4, 1))
+    
+    assert path != other
+    assert pl.read_parquet(other)['zoom'].unique().sort().to_list() == [2, 6]
@@ -0,0 +1,90 @@
+import json
+import pytest
+import polars as pl
+import pyarrow.parquet as pq
+from pausemap.sources.worldbank import WorldBankSource, INDICATOR_FIELDS, normalise_indicators
+
+def wb_row(indicator, iso2, iso3, year, value):
+    return {
+        'indicator': {'id': indicator, 'value': 'Some indicator'},
+        'country': {'id': iso2, 'value': 'Some country'},
+        'countryiso3code': iso3,
+        'date': year,
+        'value': value,
+        'unit': '',
+        'obs_status': '',
+        'decimal': 1
+    }
+
+def fake_pages(pages, failing=()):
+    """_fetch_page stand-in serving `pages` pages per indicator."""
+    def fetch_page(indicator, page):
+        if (indicator, page) in failing:
+            raise ConnectionError('boom')
+        return pages, [wb_row(indicator, 'GB', 'GBR', str(2018 + page), float(page))]
+    return fetch_page
+
+def test_fetch_all_keeps_page_order(mocker):
+    wb = WorldBankSource(workers=4)
+    mocker.patch.object(wb, '_fetch_page', side_effect=fake_pages(3))
+    
+    results = wb._fetch_all(['A', 'B'])
+    
+    assert [row['value'] for row in results['A']] == [1, 2, 3]
+    assert [row['value'] for row in results['B']] == [1, 2, 3]
+    assert wb._fetch_page.call_count == 6
+
+def test_failed_indicator_keeps_previous_cache(tmp_path, mocker):
+    wb = WorldBankSource()
+    wb.raw_dir = tmp_path
+    wb.processed_dir = tmp_path
+    wb.indicators = {'gdp': ['A'], 'trade': ['B']}
+    mocker.patch.object(wb, '_fetch_page', side_effect=fake_pages(2, failing={('B', 2)}))
+    
+    wb.fetch_indicators()
+    
+    assert sorted(p.name for p in tmp_path.glob('*.json') if 'meta' not in p.name) == [
+        'wb_gdp_2020-04-01.json'
+    ]
+    assert len(json.loads((tmp_path / 'wb_gdp_2020-04-01.json').read_text())) == 2
+
+def test_normalise_indicators_flattens_rows():
+    df = normalise_indicators([
+        wb_row('NY.GDP.MKTP.KD.ZG', 'GB', 'GBR', '2020', -9.3),
+        wb_row('NY.GDP.MKTP.KD.ZG', '1A', '', '2021', None)
+    ])
+    
+    assert df.columns == list(INDICATOR_FIELDS)
+    assert df.dtypes == list(INDICATOR_FIELDS.values())
+    assert df.drop('country_id').rows() == [
+        ('GBR', 'GB', 'NY.GDP.MKTP.KD.ZG', 2020, -9.3),
+        (None, '1A', 'NY.GDP.MKTP.KD.ZG', 2021, None)
+    ]
+    assert df['country_id'][1] is None
+
+def test_normalise_indicators_keeps_mixed_values():
+    # Ints and nulls first, as when a country reports whole numbers
+    rows = (
+        [wb_row('SL.UEM.TOTL.ZS', 'GB', 'GBR', '2020', None)] * 120
+        + [wb_row('SL.UEM.TOTL.ZS', 'GB', 'GBR', '2020', 3)] * 30
+        + [wb_row('SL.UEM.TOTL.ZS', 'GB', 'GBR', '2021', 2.5)]
+    )
+    
+    values = normalise_indicators(rows)['value']
+    
+    assert values.null_count() == 120
+    assert values.tail(2).to_list() == [3.0, 2.5]
+
+def test_process_indicators_appends_categories(tmp_path):
+    wb = WorldBankSource()
+    wb.raw_dir = tmp_path
+    wb.processed_dir = tmp_path
+    wb.indicators = {'gdp': ['A'], 'trade': ['B']}
+    for category, code in [('gdp', 'A'), ('trade', 'B')]:
+        rows = [wb_row(code, 'GB', 'GBR', '2020', 1.0)]
+        (tmp_path / f'wb_{category}_2020-04-01.json').write_text(json.dumps(rows))
+    
+    target = wb.process_indicators()
+    
+    assert pq.ParquetFile(target).num_row_groups == 2
+    assert pl.read_parquet(target)['indicator'].to_list() == ['A', 'B']